@@ -0,0 +1,45 @@
+"""
+Edit-and-save loop over an image-heavy document: python-docx `save` against
+`docx_zip.fastSave`, which copies the unchanged parts as raw compressed bytes.
+
+    python -m benchmarks.bench_fast_save --images 20 --saves 20
+"""
+
+import argparse
+import io
+import time
+
+from docx import Document
+
+import docx_tools
+from benchmarks.synthetic import build_bytes
+from docx_zip import fastSave, openDocument
+
+
+def loop(doc, saves, save):
+    start = time.perf_counter()
+    for i in range(saves):
+        docx_tools.insertStrIntoPara(doc.paragraphs[0], str(i), 0)
+        save(doc, io.BytesIO())
+    return (time.perf_counter() - start) / saves
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--paragraphs", type=int, default=500)
+    parser.add_argument("--saves", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    data = build_bytes(paragraphs=args.paragraphs, images=args.images)
+    slow = loop(Document(io.BytesIO(data)), args.saves, lambda doc, out: doc.save(out))
+    fast = loop(openDocument(io.BytesIO(data)), args.saves, fastSave)
+
+    print(f"document: {len(data) / 1e6:.1f} MB, {args.images} images")
+    print(f"Document.save:     {slow * 1000:8.1f} ms per save")
+    print(f"docx_zip.fastSave: {fast * 1000:8.1f} ms per save")
+    print(f"speedup: {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
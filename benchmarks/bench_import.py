@@ -0,0 +1,116 @@
+"""
+Import time of the text modules, measured with `python -X importtime` in fresh
+interpreters and checked against a budget.
+
+    python -m benchmarks.bench_import --repeat 5
+    python -m benchmarks.bench_import --budget docx_tools=50 --scale 2
+
+Budgets are for a module's own cost: the time its import of `lxml.etree` takes
+in the same interpreter is subtracted, so a slow machine or a slow lxml build
+does not fail the check by itself. `--budget MODULE=MS` replaces a budget and
+`--scale` multiplies all of them. The run also fails if a module pulls in
+python-docx, which the text helpers must only import once a function needs it.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# -- seconds of import time on top of BASELINE, about twice what a warm bytecode cache needs --
+BUDGETS = {"docx_xml": 0.02, "docx_tools": 0.05, "docxTools": 0.05}
+BASELINE = "lxml.etree"
+FORBIDDEN = ("docx",)
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def importTimes(module):
+    """
+    Import `module` in a fresh interpreter and return `{name: (self seconds,
+    cumulative seconds)}` for every module it loaded.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.pop("DOCX_TOOLS_PROFILE", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            times[m.group(4)] = (int(m.group(1)) / 1e6, int(m.group(2)) / 1e6)
+    return times
+
+
+def ownTime(times, module, baseline=BASELINE):
+    """
+    Cumulative import time of `module` in the trace `times` minus what `baseline`
+    and its parent packages took in the same trace.
+    """
+    parts = baseline.split(".") if baseline else []
+    base = sum(times.get(".".join(parts[:i]), (0, 0))[1] for i in range(1, len(parts) + 1))
+    return times[module][1] - base
+
+
+def measure(module, repeat=5, baseline=BASELINE):
+    """
+    Best import time of `module` in seconds, less the time its import of `baseline`
+    took, and the modules it imported.
+    """
+    importTimes(module)  # -- writes the bytecode cache --
+    runs = [importTimes(module) for _ in range(repeat)]
+    return min(ownTime(times, module, baseline) for times in runs), sorted(runs[0])
+
+
+def check(budgets=BUDGETS, repeat=5, log=None, baseline=BASELINE):
+    """
+    Return a message for every module whose import time beyond that of `baseline`
+    exceeds its budget, or that imports a forbidden package.
+    """
+    failures = []
+    above = f" above {baseline}" if baseline else ""
+    for module, budget in budgets.items():
+        seconds, modules = measure(module, repeat, baseline)
+        heavy = sorted({name.split(".")[0] for name in modules} & set(FORBIDDEN))
+        if log:
+            print(f"{module:12} {seconds * 1000:8.1f} ms{above} (budget {budget * 1000:.0f} ms)", file=log)
+        if seconds > budget:
+            failures.append(f"{module}: {seconds * 1000:.1f} ms{above} exceeds the {budget * 1000:.0f} ms budget")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget", action="append", default=[], metavar="MODULE=MS",
+        help="budget of MODULE in milliseconds above the baseline; can be repeated",
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply all budgets by this factor")
+    parser.add_argument("--baseline", default=BASELINE, help="module whose import time is subtracted ('' for none)")
+    args = parser.parse_args(argv)
+
+    budgets = dict(BUDGETS)
+    for option in args.budget:
+        module, sep, ms = option.partition("=")
+        if not sep:
+            parser.error(f"--budget expects MODULE=MS, got {option!r}")
+        budgets[module] = float(ms) / 1000
+    budgets = {module: budget * args.scale for module, budget in budgets.items()}
+
+    failures = check(budgets, repeat=args.repeat, log=sys.stdout, baseline=args.baseline)
+    for message in failures:
+        print("OVER BUDGET " + message, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Peak memory per document of text extraction: python-docx `Document` against
+`docx_lazy.openLazy` (and the lxml-only docx_xml path) on an image-heavy document.
+
+    python -m benchmarks.bench_lazy_open --images 40 --paragraphs 2000
+
+The traced peak counts Python allocations only; the peak RSS of a fresh child
+process per engine also includes libxml2's memory.
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import docx_tools
+import docx_xml
+from benchmarks.synthetic import build_bytes
+
+
+def full(path):
+    from docx import Document
+
+    doc = Document(path)
+    return docx_tools.extractOuterDocText(doc) + docx_tools.extractInnerDocText(doc)
+
+
+def lazy(path):
+    from docx_lazy import openLazy
+
+    with openLazy(path) as doc:
+        return docx_tools.extractOuterDocText(doc) + docx_tools.extractInnerDocText(doc)
+
+
+def xml(path):
+    body = docx_xml.loadBody(path)
+    return docx_xml.extractOuterDocText(body) + docx_xml.extractInnerDocText(body)
+
+
+ENGINES = {"Document": full, "openLazy": lazy, "docx_xml": xml}
+
+
+def traced(func, path):
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        text = func(path)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return text, elapsed, peak
+
+
+def peakRss():
+    """Peak RSS of this process in KiB; ru_maxrss can carry over the parent's peak on Linux."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def childRss(engine, path):
+    """Peak RSS in KiB of a fresh interpreter extracting `path` with `engine`."""
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_lazy_open", "--child", engine, path],
+        check=True, capture_output=True, text=True,
+    )
+    return int(out.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", type=int, default=40)
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--child", nargs=2, metavar=("ENGINE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        engine, path = args.child
+        ENGINES[engine](path)
+        print(peakRss())
+        return
+
+    data = build_bytes(paragraphs=args.paragraphs, images=args.images)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.docx")
+        with open(path, "wb") as f:
+            f.write(data)
+
+        print(f"document: {len(data) / 1e6:.1f} MB, {args.images} images, {args.paragraphs} paragraphs")
+        expected = None
+        for name, func in ENGINES.items():
+            text, elapsed, peak = traced(func, path)
+            if expected is None:
+                expected = text
+            elif text != expected:
+                raise SystemExit(f"{name} output differs from Document output")
+            rss = childRss(name, path)
+            print(f"{name:9} {elapsed:7.3f} s   peak traced {peak / 1e6:7.1f} MB   peak RSS {rss / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
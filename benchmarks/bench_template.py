@@ -0,0 +1,70 @@
+"""
+Throughput of compile-once template rendering compared with loading, filling and
+saving the template with python-docx for every record.
+
+    python -m benchmarks.bench_template --records 2000
+"""
+
+import argparse
+import io
+import time
+
+from docx import Document
+
+from docx_template import compileTemplate, fill_placeholders
+
+FIELDS = ["salutation", "name", "street", "city", "date", "subject", "order", "total", "sender"]
+
+
+def letter_template(paragraphs=30):
+    doc = Document()
+    doc.add_paragraph("{{sender}}")
+    doc.add_paragraph("{{salutation}} {{name}}")
+    doc.add_paragraph("{{street}}")
+    doc.add_paragraph("{{city}}, {{date}}")
+    doc.add_paragraph("Subject: {{subject}}").runs[0].bold = True
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Body paragraph {i} about order {{{{order}}}} with a total of {{{{total}}}}.")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Order"
+    table.cell(0, 1).text = "{{order}}"
+    table.cell(1, 0).text = "Total"
+    table.cell(1, 1).text = "{{total}}"
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def record(i):
+    return {field: f"{field}-{i}" for field in FIELDS}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--level", type=int, default=1, help="deflate level of the rendered document part")
+    args = parser.parse_args(argv)
+
+    data = letter_template()
+    compiled = compileTemplate(io.BytesIO(data), level=args.level)
+
+    start = time.perf_counter()
+    for i in range(args.records):
+        compiled.renderBytes(record(i))
+    compiled_rate = args.records / (time.perf_counter() - start)
+
+    baseline_records = max(args.records // 20, 1)
+    start = time.perf_counter()
+    for i in range(baseline_records):
+        doc = Document(io.BytesIO(data))
+        fill_placeholders(doc, record(i))
+        doc.save(io.BytesIO())
+    baseline_rate = baseline_records / (time.perf_counter() - start)
+
+    print(f"CompiledTemplate.render:          {compiled_rate:8.0f} documents/s")
+    print(f"load + fill_placeholders + save:  {baseline_rate:8.0f} documents/s")
+    print(f"speedup: {compiled_rate / baseline_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
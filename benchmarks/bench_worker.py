@@ -0,0 +1,69 @@
+"""
+Per-job latency of a fresh `python` process per job against jobs sent to one
+warm `docx_worker` process.
+
+    python -m benchmarks.bench_worker --jobs 20
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import build_bytes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ONE_SHOT = """
+import sys, docx_tools
+from docx_zip import fastSave, openDocument
+doc = openDocument(sys.argv[1])
+docx_tools.insertStrIntoPara(doc.paragraphs[0], "x", 0)
+fastSave(doc, sys.argv[2])
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "in.docx")
+        out = os.path.join(tmp, "out.docx")
+        with open(src, "wb") as f:
+            f.write(build_bytes(paragraphs=args.paragraphs))
+
+        start = time.perf_counter()
+        for _ in range(args.jobs):
+            subprocess.run([sys.executable, "-c", ONE_SHOT, src, out], cwd=ROOT, check=True)
+        oneShot = (time.perf_counter() - start) / args.jobs
+
+        job = json.dumps({"op": "insert", "path": src, "out": out, "para": 0, "pos": 0, "text": "x"}) + "\n"
+        worker = subprocess.Popen(
+            [sys.executable, "-m", "docx_worker"], cwd=ROOT, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+        )
+        # -- the first job loads the imports and the document --
+        worker.stdin.write(job)
+        worker.stdin.flush()
+        worker.stdout.readline()
+        start = time.perf_counter()
+        for _ in range(args.jobs):
+            worker.stdin.write(job)
+            worker.stdin.flush()
+            assert json.loads(worker.stdout.readline())["ok"]
+        warm = (time.perf_counter() - start) / args.jobs
+        worker.stdin.close()
+        worker.wait()
+
+    print(f"process per job: {oneShot * 1000:8.1f} ms per job")
+    print(f"warm worker:     {warm * 1000:8.1f} ms per job")
+    print(f"speedup: {oneShot / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
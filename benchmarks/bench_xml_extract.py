@@ -0,0 +1,53 @@
+"""
+Compare the python-docx based text extraction in docx_tools with the lxml-only
+path in docx_xml on a generated document.
+
+    python -m benchmarks.bench_xml_extract --paragraphs 20000 --tables 200
+"""
+
+import argparse
+import io
+import time
+
+from docx import Document
+
+import docx_tools
+import docx_xml
+from benchmarks.synthetic import build_bytes
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, default=20000)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    data = build_bytes(paragraphs=args.paragraphs, tables=args.tables, table_depth=2, table_width=4)
+    proxy_time, proxy_text = best_of(
+        args.repeat, lambda: docx_tools.combineDocText(Document(io.BytesIO(data)))
+    )
+    xml_time, xml_text = best_of(
+        args.repeat, lambda: docx_xml.combineDocText(io.BytesIO(data))
+    )
+    if proxy_text != xml_text:
+        raise SystemExit("docx_xml output differs from docx_tools output")
+
+    print(f"document: {len(data) / 1e6:.1f} MB, {len(proxy_text)} characters")
+    print(f"docx_tools.combineDocText: {proxy_time:.3f} s")
+    print(f"docx_xml.combineDocText:   {xml_time:.3f} s")
+    print(f"speedup: {proxy_time / xml_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
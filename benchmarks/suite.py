@@ -0,0 +1,547 @@
+"""
+Scaling benchmarks for every public function of docx_tools and docxTools.
+
+    python -m benchmarks.suite --sizes 100,200,400 --output bench.json
+    python -m benchmarks.suite --baseline bench.json --threshold 0.25
+
+Each case is timed (best of `--repeat`) and its peak traced memory recorded on
+synthetic documents of growing size N, giving time-vs-N curves as JSON. Read-only
+text cases also run on the fixture documents. With `--baseline` the run fails when
+a case got slower than the stored result by more than `--threshold`.
+"""
+
+import argparse
+import fnmatch
+import gc
+import inspect
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from docx import Document
+
+import docxTools
+import docx_tools
+import docx_xml
+from benchmarks.synthetic import build_bytes
+
+MODULES = (docx_tools, docxTools)
+FIXTURES = (os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nested_tables.docx"),)
+EDITS = 50
+
+CASES = {}
+FIXTURE_CASES = set()
+
+
+def case(name, fixture=False):
+    """Register `setup(fx)`, which prepares the state and returns the thunk to time."""
+
+    def register(setup):
+        CASES[name] = setup
+        if fixture:
+            FIXTURE_CASES.add(name)
+        return setup
+
+    return register
+
+
+class Fixture:
+    """A freshly loaded document plus the objects the cases work on."""
+
+    def __init__(self, data):
+        self.doc = Document(io.BytesIO(data))
+        self.data = data
+        self.paragraphs = self.doc.paragraphs
+        self.long = self.paragraphs[-1] if self.paragraphs else None
+        self.body = self.paragraphs[:-1]
+        self.n = max(len(self.body), 1)
+        self.table = self.doc.tables[0] if self.doc.tables else None
+        self._dest = None
+
+    @property
+    def dest(self):
+        if self._dest is None:
+            self._dest = self.doc.add_paragraph()
+        return self._dest
+
+    def positions(self, count=None):
+        length = docx_tools.getRunIndex(self.long).length
+        count = count or self.n
+        return [(i * 7919) % length for i in range(count)]
+
+
+def public_functions(module):
+    """Names of the public functions and classes defined in `module`."""
+    return sorted(
+        f"{module.__name__}.{name}"
+        for name, obj in vars(module).items()
+        if not name.startswith("_")
+        and (inspect.isfunction(obj) or inspect.isclass(obj))
+        and obj.__module__ == module.__name__
+    )
+
+
+def missing_cases():
+    return [name for module in MODULES for name in public_functions(module) if name not in CASES]
+
+
+def consume(iterator):
+    deque(iterator, maxlen=0)
+
+
+# -- text extraction ------------------------------------------------------------------
+
+
+@case("docx_tools.combineDocText", fixture=True)
+def _(fx):
+    return lambda: docx_tools.combineDocText(fx.doc)
+
+
+@case("docx_tools.extractOuterDocText", fixture=True)
+def _(fx):
+    return lambda: docx_tools.extractOuterDocText(fx.doc)
+
+
+@case("docx_tools.extractInnerDocText", fixture=True)
+def _(fx):
+    return lambda: docx_tools.extractInnerDocText(fx.doc)
+
+
+@case("docx_tools.concatTableTexts", fixture=True)
+def _(fx):
+    return lambda: docx_tools.concatTableTexts(fx.doc)
+
+
+@case("docx_tools.concatRowTexts", fixture=True)
+def _(fx):
+    return lambda: [docx_tools.concatRowTexts(table) for table in fx.doc.tables]
+
+
+@case("docx_tools.concatCellTexts", fixture=True)
+def _(fx):
+    return lambda: [docx_tools.concatCellTexts(row) for table in fx.doc.tables for row in table.rows]
+
+
+@case("docx_tools.iter_doc_text", fixture=True)
+def _(fx):
+    return lambda: consume(docx_tools.iter_doc_text(fx.doc))
+
+
+@case("docx_tools.iter_outer_doc_text", fixture=True)
+def _(fx):
+    return lambda: consume(docx_tools.iter_outer_doc_text(fx.doc))
+
+
+@case("docx_tools.iter_table_texts", fixture=True)
+def _(fx):
+    return lambda: consume(docx_tools.iter_table_texts(fx.doc))
+
+
+@case("docx_tools.iter_table_cells", fixture=True)
+def _(fx):
+    return lambda: consume(docx_tools.iter_table_cells(fx.doc, paths=True))
+
+
+@case("docx_tools.iter_row_texts", fixture=True)
+def _(fx):
+    return lambda: [consume(docx_tools.iter_row_texts(table)) for table in fx.doc.tables]
+
+
+@case("docx_tools.iter_cell_texts", fixture=True)
+def _(fx):
+    return lambda: [consume(docx_tools.iter_cell_texts(row)) for table in fx.doc.tables for row in table.rows]
+
+
+@case("docx_tools.write_doc_text", fixture=True)
+def _(fx):
+    return lambda: docx_tools.write_doc_text(fx.doc, io.StringIO())
+
+
+@case("docx_tools.extractTextBetween", fixture=True)
+def _(fx):
+    last = len(fx.paragraphs) - 1
+    return lambda: docx_tools.extractTextBetween(fx.doc, 0, last, 0, 5)
+
+
+@case("docx_tools.extractTextByOffsets", fixture=True)
+def _(fx):
+    view = docx_tools.DocumentView(fx.doc)
+    total = len(view.outerText())
+    offsets = [total * i // fx.n for i in range(fx.n)]
+    return lambda: [docx_tools.extractTextByOffsets(view, offset, offset + 5) for offset in offsets]
+
+
+@case("docxTools.doc_text", fixture=True)
+def _(fx):
+    return lambda: docxTools.doc_text(fx.doc)
+
+
+@case("docx_xml.combineDocText", fixture=True)
+def _(fx):
+    return lambda: docx_xml.combineDocText(io.BytesIO(fx.data))
+
+
+# -- paragraph structure --------------------------------------------------------------
+
+
+@case("docx_tools.duplicatePara")
+def _(fx):
+    return lambda: [docx_tools.duplicatePara(p) for p in fx.body]
+
+
+@case("docx_tools.appendPara")
+def _(fx):
+    return lambda: [docx_tools.appendPara(p, "new") for p in fx.body]
+
+
+@case("docx_tools.deletePara")
+def _(fx):
+    return lambda: [docx_tools.deletePara(p) for p in fx.body]
+
+
+@case("docxTools.duplicate")
+def _(fx):
+    return lambda: [docxTools.duplicate(p) for p in fx.body]
+
+
+@case("docxTools.append_paragraph")
+def _(fx):
+    return lambda: [docxTools.append_paragraph(p, "new") for p in fx.body]
+
+
+@case("docxTools.delete_paragraph")
+def _(fx):
+    return lambda: [docxTools.delete_paragraph(p) for p in fx.body]
+
+
+@case("docx_tools.paragraphsChanged")
+def _(fx):
+    docx_tools.DocumentView(fx.doc)
+    body = fx.doc.element.body
+    return lambda: [docx_tools.paragraphsChanged(body) for _ in range(fx.n)]
+
+
+@case("docx_tools.DocumentView")
+def _(fx):
+    def run():
+        view = docx_tools.DocumentView(fx.doc)
+        return [view.text(i) for i in range(len(view))]
+
+    return run
+
+
+@case("docx_tools.asView")
+def _(fx):
+    return lambda: len(docx_tools.asView(fx.doc))
+
+
+# -- run lookups ----------------------------------------------------------------------
+
+
+@case("docx_tools.RunIndex")
+def _(fx):
+    return lambda: docx_tools.RunIndex(fx.long._p)
+
+
+@case("docx_tools.getRunIndex")
+def _(fx):
+    return lambda: docx_tools.getRunIndex(fx.long)
+
+
+@case("docx_tools.runIndexCache")
+def _(fx):
+    def run():
+        with docx_tools.runIndexCache():
+            return [docx_tools.getRunIndex(fx.long) for _ in range(fx.n)]
+
+    return run
+
+
+@case("docx_tools.invalidateRunIndex")
+def _(fx):
+    def run():
+        with docx_tools.runIndexCache():
+            return [docx_tools.invalidateRunIndex(fx.long) for _ in range(fx.n)]
+
+    return run
+
+
+@case("docx_tools.paragraphChanged")
+def _(fx):
+    docx_tools.DocumentView(fx.doc)
+    return lambda: [docx_tools.paragraphChanged(fx.long) for _ in range(fx.n)]
+
+
+@case("docx_tools.findRunIndex")
+def _(fx):
+    positions = fx.positions()
+    return lambda: [docx_tools.findRunIndex(pos, fx.long) for pos in positions]
+
+
+@case("docx_tools.findPosInRun")
+def _(fx):
+    positions = fx.positions()
+    return lambda: [docx_tools.findPosInRun(pos, fx.long) for pos in positions]
+
+
+@case("docxTools.in_which_run_is")
+def _(fx):
+    positions = fx.positions()
+    return lambda: [docxTools.in_which_run_is(pos, fx.long) for pos in positions]
+
+
+@case("docxTools.at_which_position_in_its_run_is")
+def _(fx):
+    positions = fx.positions()
+    return lambda: [docxTools.at_which_position_in_its_run_is(pos, fx.long) for pos in positions]
+
+
+# -- run level edits ------------------------------------------------------------------
+
+
+@case("docx_tools.deleteTextRun")
+def _(fx):
+    runs = fx.long.runs
+    return lambda: [docx_tools.deleteTextRun(run, fx.long) for run in runs]
+
+
+@case("docxTools.remove_run")
+def _(fx):
+    runs = fx.long.runs
+    return lambda: [docxTools.remove_run(run, fx.long) for run in runs]
+
+
+@case("docx_tools.deleteTextRange")
+def _(fx):
+    length = docx_tools.getRunIndex(fx.long).length
+    return lambda: docx_tools.deleteTextRange(fx.long, length // 4, 3 * length // 4)
+
+
+@case("docx_tools.removeTextSegment")
+def _(fx):
+    positions = fx.positions(EDITS)
+    return lambda: [docx_tools.removeTextSegment(fx.long, pos // 2, pos // 2 + 2) for pos in positions]
+
+
+@case("docxTools.rm")
+def _(fx):
+    positions = fx.positions(EDITS)
+    return lambda: [docxTools.rm(pos // 2, pos // 2 + 2, fx.long) for pos in positions]
+
+
+@case("docx_tools.insertStrIntoPara")
+def _(fx):
+    positions = fx.positions(EDITS)
+    return lambda: [docx_tools.insertStrIntoPara(fx.long, "XYZ", pos) for pos in positions]
+
+
+@case("docxTools.ins_into_paragraph")
+def _(fx):
+    positions = fx.positions(EDITS)
+    return lambda: [docxTools.ins_into_paragraph("XYZ", pos, fx.long) for pos in positions]
+
+
+@case("docx_tools.copyTextSegment")
+def _(fx):
+    length = docx_tools.getRunIndex(fx.long).length
+    return lambda: docx_tools.copyTextSegment(fx.long, fx.dest, 0, length - 1)
+
+
+@case("docx_tools.cloneRunSlices")
+def _(fx):
+    length = docx_tools.getRunIndex(fx.long).length
+    return lambda: docx_tools.cloneRunSlices(fx.long, 0, length - 1)
+
+
+@case("docx_tools.insertRunElements")
+def _(fx):
+    length = docx_tools.getRunIndex(fx.long).length
+    runs = docx_tools.cloneRunSlices(fx.long, 0, length - 1)
+    return lambda: docx_tools.insertRunElements(fx.dest, runs, 0)
+
+
+@case("docx_tools.normalize_runs", fixture=True)
+def _(fx):
+    return lambda: docx_tools.normalize_runs(fx.doc, strip_rsid=True, strip_proof_errors=True)
+
+
+@case("docxTools.cp")
+def _(fx):
+    length = docx_tools.getRunIndex(fx.long).length
+    return lambda: docxTools.cp(0, length - 1, fx.long, fx.dest)
+
+
+@case("docx_tools.moveTextSegment")
+def _(fx):
+    length = docx_tools.getRunIndex(fx.long).length
+    return lambda: docx_tools.moveTextSegment(fx.long, fx.dest, 0, length // 2)
+
+
+@case("docxTools.mv")
+def _(fx):
+    length = docx_tools.getRunIndex(fx.long).length
+    return lambda: docxTools.mv(0, length // 2, fx.long, fx.dest)
+
+
+# -- document level edits -------------------------------------------------------------
+
+
+def _edits(fx):
+    step = max(len(fx.body) // EDITS, 2)
+    return [(i, i + 1, 2, 3, "edit") for i in range(0, len(fx.body) - 1, step)]
+
+
+@case("docx_tools.replaceDocTextSegment")
+def _(fx):
+    edits = _edits(fx)
+    return lambda: [docx_tools.replaceDocTextSegment(fx.doc, *edit) for edit in reversed(edits)]
+
+
+@case("docx_tools.replaceDocTextByOffsets")
+def _(fx):
+    view = docx_tools.DocumentView(fx.doc)
+    total = len(view.outerText())
+    offsets = [total * i // fx.n for i in range(fx.n)]
+    return lambda: [docx_tools.replaceDocTextByOffsets(view, offset, offset + 2, "x") for offset in reversed(offsets)]
+
+
+@case("docx_tools.replaceParagraphsSegment")
+def _(fx):
+    edits = _edits(fx)
+    return lambda: [docx_tools.replaceParagraphsSegment(fx.paragraphs, *edit) for edit in reversed(edits)]
+
+
+@case("docx_tools.EditBatch")
+def _(fx):
+    edits = [(i, i, 1, 2, "edit") for i in range(0, len(fx.body), 2)]
+    return lambda: docx_tools.EditBatch(edits).apply(fx.doc)
+
+
+def measure(setup, data, repeat):
+    """Return `(best seconds, peak traced bytes)` of the thunk returned by `setup`."""
+    best = None
+    for _ in range(repeat):
+        thunk = setup(Fixture(data))
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            thunk()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+
+    thunk = setup(Fixture(data))
+    tracemalloc.start()
+    try:
+        thunk()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run(sizes, repeat=3, pattern="*", runs=8, table_depth=3, table_width=3, fixtures=FIXTURES, log=None):
+    """Run the selected cases and return the JSON-serializable results."""
+    names = sorted(name for name in CASES if fnmatch.fnmatch(name, pattern))
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "repeat": repeat,
+            "params": {"runs": runs, "table_depth": table_depth, "table_width": table_width},
+        },
+        "cases": {name: [] for name in names},
+        "fixtures": {},
+    }
+
+    for n in sizes:
+        data = build_bytes(
+            paragraphs=n,
+            runs=runs,
+            tables=max(n // 50, 1),
+            table_depth=table_depth,
+            table_width=table_width,
+            long_runs=n,
+        )
+        for name in names:
+            seconds, peak = measure(CASES[name], data, repeat)
+            results["cases"][name].append({"n": n, "seconds": seconds, "peak_bytes": peak})
+            if log:
+                print(f"{name:50} N={n:<7} {seconds * 1000:10.3f} ms {peak / 1024:10.1f} KiB", file=log)
+
+    for path in fixtures:
+        with open(path, "rb") as f:
+            data = f.read()
+        key = os.path.basename(path)
+        results["fixtures"][key] = {}
+        for name in names:
+            if name in FIXTURE_CASES:
+                seconds, peak = measure(CASES[name], data, repeat)
+                results["fixtures"][key][name] = {"seconds": seconds, "peak_bytes": peak}
+
+    return results
+
+
+def compare(results, baseline, threshold=0.25, min_seconds=0.001):
+    """Return a message for every case that is more than `threshold` slower than in `baseline`."""
+    regressions = []
+    for name, points in results["cases"].items():
+        before = {p["n"]: p["seconds"] for p in baseline.get("cases", {}).get(name, [])}
+        for point in points:
+            old = before.get(point["n"])
+            if old is None or max(old, point["seconds"]) < min_seconds:
+                continue
+            if point["seconds"] > old * (1 + threshold):
+                regressions.append(
+                    f"{name} N={point['n']}: {point['seconds'] * 1000:.3f} ms "
+                    f"(baseline {old * 1000:.3f} ms, +{point['seconds'] / old - 1:.0%})"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,200,400", help="comma separated document sizes N")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", default="*", help="glob selecting case names")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--min-seconds", type=float, default=0.001, help="ignore cases faster than this")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    missing = missing_cases()
+    if missing:
+        print("no benchmark case for: " + ", ".join(missing), file=sys.stderr)
+        return 1
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run(sizes, args.repeat, args.cases, log=None if args.quiet else sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold, args.min_seconds)
+        for message in regressions:
+            print("REGRESSION " + message, file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Deterministic synthetic documents for the benchmarks.
+
+The same parameters always produce the same document, so timings of different
+runs and machines compare like with like.
+"""
+
+import io
+import random
+import struct
+import zlib
+
+from docx import Document
+from docx.shared import Inches
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua vertrag klausel anlage frist"
+).split()
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _fill_table(table, rng, depth, width):
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text = _words(rng, 3)
+    if depth > 1:
+        nested = table.cell(0, 0).add_table(rows=width, cols=width)
+        _fill_table(nested, rng, depth - 1, width)
+
+
+def png(rng, width=256, height=256):
+    """A noisy RGB PNG that deflate cannot shrink much, like a photo."""
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    raw = b"".join(b"\0" + rng.randbytes(width * 3) for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 1))
+        + chunk(b"IEND", b"")
+    )
+
+
+def build_document(paragraphs=100, runs=8, tables=1, table_depth=2, table_width=3, long_runs=0, images=0, seed=0):
+    """
+    Build a document with `paragraphs` paragraphs of `runs` alternately formatted runs
+    and `tables` tables of `table_width` x `table_width` cells, nested `table_depth`
+    levels deep through the first cell. `images` adds that many distinct pictures. With
+    `long_runs` a final paragraph with that many short runs is added for run-level
+    benchmarks.
+    """
+    rng = random.Random(seed)
+    doc = Document()
+    for _ in range(images):
+        doc.add_picture(io.BytesIO(png(rng)), width=Inches(1))
+    for _ in range(paragraphs):
+        p = doc.add_paragraph()
+        for i in range(runs):
+            run = p.add_run(_words(rng, 2) + " ")
+            run.bold = i % 3 == 1
+            run.italic = i % 3 == 2
+    for _ in range(tables):
+        table = doc.add_table(rows=table_width, cols=table_width)
+        _fill_table(table, rng, table_depth, table_width)
+    if long_runs:
+        p = doc.add_paragraph()
+        for i in range(long_runs):
+            p.add_run(rng.choice(WORDS)[:4].ljust(4) + " ").bold = i % 2 == 0
+    return doc
+
+
+def build_bytes(**params):
+    """`build_document` saved to .docx bytes."""
+    buf = io.BytesIO()
+    build_document(**params).save(buf)
+    return buf.getvalue()
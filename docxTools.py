@@ -1,6 +1,13 @@
 import copy
-from docx.text.paragraph import Paragraph
-from docx.oxml.shared import OxmlElement
+import os
+from docx_tools import (
+    cloneRunSlices,
+    deleteTextRange,
+    getRunIndex,
+    insertRunElements,
+    paragraphChanged,
+    paragraphsChanged,
+)
 
 
 def doc_text(doc):
@@ -13,20 +20,28 @@ def doc_text(doc):
 def duplicate(p):
     p_new = copy.deepcopy(p)
     p._p.addnext(p_new._p)
+    paragraphsChanged(p._p.getparent())
     return p_new
 
 
 def delete_paragraph(paragraph):
     p = paragraph._element
-    p.getparent().remove(p)
+    paragraphChanged(paragraph)
+    parent = p.getparent()
+    parent.remove(p)
+    paragraphsChanged(parent)
     paragraph._p = paragraph._element = None
 
 
 def append_paragraph(paragraph, text=None, style=None):
+    from docx.oxml import OxmlElement
+    from docx.text.paragraph import Paragraph
+
     try:
         """Insert a new paragraph after the given paragraph."""
         new_p = OxmlElement("w:p")
         paragraph._p.addnext(new_p)
+        paragraphsChanged(paragraph._p.getparent())
         new_para = Paragraph(new_p, paragraph._parent)
         if text:
             new_para.add_run(text)
@@ -39,113 +54,39 @@ def append_paragraph(paragraph, text=None, style=None):
 
 def delete_paragraph(paragraph):
     p = paragraph._element
-    p.getparent().remove(p)
+    paragraphChanged(paragraph)
+    parent = p.getparent()
+    parent.remove(p)
+    paragraphsChanged(parent)
     paragraph._p = paragraph._element = None
 
 
 def in_which_run_is(m, p):
-    # Check if 'm' is outside the bounds of the paragraph's text.
-    if m < 0 or m >= len(p.text):
-        return None
-
-    cumulative_length = 0
-    # Enumerate through runs to get both index and the run itself.
-    for index, run in enumerate(p.runs):
-        cumulative_length += len(run.text)
-        # If the cumulative length after adding this run includes 'm', return index.
-        if cumulative_length > m:
-            return index
-
-    # If 'm' is not found in any runs, though this should be caught by the initial check.
-    return None
+    # Resolve 'm' through the cached cumulative run offsets of the paragraph.
+    location = getRunIndex(p).locate(m)
+    return None if location is None else location[0]
 
 
 def at_which_position_in_its_run_is(m, p):
-    # Validate 'm' to ensure it is within the bounds of the paragraph.
-    if m < 0 or m >= len(p.text):
-        return None
-
-    cumulative_length = 0  # Holds the cumulative length of text up to the current run.
-    for _, run in enumerate(p.runs):
-        previous_cumulative_length = cumulative_length
-        cumulative_length += len(run.text)
-
-        # If the cumulative length now includes 'm', calculate its position in this run.
-        if cumulative_length > m:
-            # 'm' minus the cumulative length of all previous runs gives the position in the current run.
-            return m - previous_cumulative_length
-
-    # In case 'm' is somehow outside the total text length (which should be caught by the initial check).
-    return None
+    # 'm' minus the cumulative length of all previous runs gives the position in its run.
+    location = getRunIndex(p).locate(m)
+    return None if location is None else location[1]
 
 
 def cp(m, n, p_src, p_dest):
-    if m < 0 or n > len(p_src.text):
-        return None
-    r_start = in_which_run_is(m, p_src)
-    r_finish = in_which_run_is(n, p_src)
-
-    if r_start == None or r_finish == None:
-        return None
-
-    for i in range(r_start, r_finish + 1):
-        run = p_src.runs[i]
-        r_copy = copy.deepcopy(run)._r
-
-        a = 0
-        o = len(run.text)
-        if i == r_start:
-            a = at_which_position_in_its_run_is(m, p_src)
-        if i == r_finish:
-            o = at_which_position_in_its_run_is(n, p_src) + 1
-
-        r_copy.text = r_copy.text[a:o]
-        p_dest._p.append(r_copy)
+    insertRunElements(p_dest, cloneRunSlices(p_src, m, n))
 
 
 def remove_run(run, p):
-    i = len(p.runs) - 1
-    while i >= 0:
-        if p.runs[i]._r == run._r:
-            p._p.remove(p.runs[i]._r)
-            return run
-        i -= 1
-    return None
-
-
-def rm(m, n, p):
-    if m < 0 or n > len(p.text) - 1:
-        return
-
-    r_start = in_which_run_is(m, p)
-    r_finish = in_which_run_is(n, p)
-
-    if r_start == None or r_finish == None:
+    if run._r.getparent() is not p._p:
         return None
+    p._p.remove(run._r)
+    paragraphChanged(p)
+    return run
 
-    a = -1
-    o = -1
-    arr = []
-
-    for i in range(r_start, r_finish + 1):
-        run = p.runs[i]
-
-        if i == r_start:
-            a = at_which_position_in_its_run_is(m, p)
-        if i == r_finish:
-            o = at_which_position_in_its_run_is(n, p)
-        if i > r_start and i < r_finish:
-            arr.append(run)
 
-    if r_start == r_finish:
-        p.runs[r_start].text = p.runs[r_start].text[:a] + p.runs[r_finish].text[o + 1 :]
-    else:
-        p.runs[r_start].text = p.runs[r_start].text[:a]
-        p.runs[r_finish].text = p.runs[r_finish].text[o + 1 :]
-    for run in reversed(arr):
-        remove_run(run, p)
-
-    return p
+def rm(m, n, p):
+    return deleteTextRange(p, m, n)
 
 
 def mv(m, n, p_src, p_dest):
@@ -158,5 +99,12 @@ def ins_into_paragraph(str, m, p):
         l += len(r.text)
         if m <= l:
             r.text = r.text[:m] + str + r.text[m:]
+            paragraphChanged(p)
             break
-    return p
\ No newline at end of file
+    return p
+
+
+if os.environ.get("DOCX_TOOLS_PROFILE"):
+    import docx_profile
+
+    docx_profile.instrument(__name__)
@@ -0,0 +1,186 @@
+"""
+asyncio front-end for extraction, editing and saving.
+
+The blocking work runs in a thread or process pool owned by a `DocxRunner`; a
+semaphore bounds how many jobs one runner has in flight. A job holds its slot
+until the pool has really finished it, so timed out or cancelled calls cannot
+push the number of busy workers above the limit. Cancelling a call (or hitting
+its `timeout`) drops the job if it has not started yet; a job that is already
+running in a thread cannot be interrupted and finishes in the background.
+
+Process pools can only work on paths or bytes: python-docx documents and file
+objects cannot be shared with another process, so edits and saves of in-memory
+documents, and edits written to a file object, always run in the runner's
+thread pool.
+
+    async with DocxRunner(maxConcurrency=8, processes=True) as runner:
+        text = await runner.extract("in.docx", timeout=10)
+        await runner.apply_edits("in.docx", [(0, 0, 0, 4, "Dear")], out="out.docx")
+"""
+
+import asyncio
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import docx_xml
+
+
+def _source(src):
+    return io.BytesIO(src) if isinstance(src, (bytes, bytearray)) else src
+
+
+def _isDocument(doc):
+    return hasattr(doc, "paragraphs")
+
+
+def _portable(src):
+    """Whether `src` can be handed to another process."""
+    return isinstance(src, (str, bytes, bytearray, os.PathLike))
+
+
+def _isPath(out):
+    return isinstance(out, (str, os.PathLike))
+
+
+def extractText(src, engine="xml"):
+    """`combineDocText` of a path, bytes, file object or document; runs in the pool."""
+    import docx_tools
+
+    if _isDocument(src):
+        return docx_tools.combineDocText(src)
+    if engine == "xml":
+        return docx_xml.combineDocText(_source(src))
+    from docx_lazy import openLazy
+
+    with openLazy(_source(src)) as doc:
+        return docx_tools.combineDocText(doc)
+
+
+def saveDocument(doc, out, fast=False):
+    if fast:
+        from docx_zip import fastSave
+
+        fastSave(doc, out)
+    else:
+        doc.save(out)
+    return out
+
+
+def applyEdits(doc, edits, out=None, fast=False):
+    """
+    Apply `edits` (an `EditBatch` or `replaceDocTextSegment` argument tuples) to `doc`,
+    a document or a path/bytes to load, and save it to `out` if given.
+    """
+    from docx_tools import EditBatch
+
+    if not _isDocument(doc):
+        if out is None:
+            raise ValueError("editing a document loaded from a path needs `out`")
+        if fast:
+            from docx_zip import openDocument
+
+            doc = openDocument(_source(doc))
+        else:
+            from docx import Document
+
+            doc = Document(_source(doc))
+        result = out
+    else:
+        result = doc
+    batch = edits if isinstance(edits, EditBatch) else EditBatch(edits)
+    batch.apply(doc)
+    if out is not None:
+        saveDocument(doc, out, fast)
+    return result
+
+
+def _release(loop, semaphore):
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        pass  # the loop is closed, nobody waits for the slot any more
+
+
+class DocxRunner:
+    """
+    Runs docx work off the event loop with at most `maxConcurrency` jobs in flight.
+    With `processes` extraction and edits of paths or bytes saved to a path go to a
+    process pool of `workers` processes; everything else uses a thread pool of `maxConcurrency`
+    threads. `timeout` is the default per-call timeout in seconds.
+    """
+
+    def __init__(self, maxConcurrency=4, processes=False, workers=None, timeout=None):
+        self.maxConcurrency = maxConcurrency
+        self.timeout = timeout
+        self.threads = ThreadPoolExecutor(maxConcurrency, thread_name_prefix="docx")
+        self.processes = ProcessPoolExecutor(workers or os.cpu_count()) if processes else None
+        self._semaphore = None
+        self._loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self, wait=False):
+        """Shut the pools down; jobs that have not started are cancelled."""
+        self.threads.shutdown(wait=wait, cancel_futures=True)
+        if self.processes is not None:
+            self.processes.shutdown(wait=wait, cancel_futures=True)
+
+    async def run(self, func, *args, timeout=None, process=False):
+        """Run `func(*args)` in the pool within the concurrency limit and return its result."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.maxConcurrency)
+            self._loop = loop
+        semaphore = self._semaphore
+        executor = self.processes if process and self.processes is not None else self.threads
+
+        await semaphore.acquire()
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+        # -- the slot is freed when the pool is done with the job, not when the caller gives up --
+        future.add_done_callback(lambda _: _release(loop, semaphore))
+        timeout = self.timeout if timeout is None else timeout
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    async def extract(self, src, engine="xml", timeout=None):
+        return await self.run(extractText, src, engine, timeout=timeout, process=_portable(src))
+
+    async def apply_edits(self, doc, edits, out=None, fast=False, timeout=None):
+        return await self.run(applyEdits, doc, edits, out, fast, timeout=timeout, process=_portable(doc) and _isPath(out))
+
+    async def save(self, doc, out, fast=False, timeout=None):
+        return await self.run(saveDocument, doc, out, fast, timeout=timeout)
+
+
+_defaultRunner = None
+
+
+def defaultRunner():
+    """The thread-pool runner used by the module level functions, created on first use."""
+    global _defaultRunner
+    if _defaultRunner is None:
+        _defaultRunner = DocxRunner()
+    return _defaultRunner
+
+
+async def async_extract(src, engine="xml", timeout=None, runner=None):
+    """`combineDocText` of `src` (path, bytes, file object or document) without blocking the loop."""
+    return await (runner or defaultRunner()).extract(src, engine, timeout)
+
+
+async def async_apply_edits(doc, edits, out=None, fast=False, timeout=None, runner=None):
+    """Apply `edits` to `doc` off the loop; see `applyEdits`."""
+    return await (runner or defaultRunner()).apply_edits(doc, edits, out, fast, timeout)
+
+
+async def async_save(doc, out, fast=False, timeout=None, runner=None):
+    """Save `doc` to `out` off the loop, with `docx_zip.fastSave` if `fast`."""
+    return await (runner or defaultRunner()).save(doc, out, fast, timeout)
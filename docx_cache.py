@@ -0,0 +1,261 @@
+"""
+Persistent cache of extracted document text.
+
+Entries are keyed by the CRC32 and uncompressed size of the main document part
+as recorded in the zip central directory, so looking a document up reads only
+the directory, never `word/document.xml` itself (`_rels/.rels` is consulted only
+when the archive has no `word/document.xml`). The key
+depends on nothing but the text-bearing part: a copied or renamed file still
+hits, and a re-saved file whose body did not change hits as well.
+
+The cache is one SQLite database. Several processes may share it: lookups are
+plain reads, which WAL mode does not block, and writers serialize on SQLite's
+lock. Hits and misses are counted in memory, and a hit marks its entry as used
+only if it was last marked more than `touchAfter` seconds ago; these updates are
+written in one transaction at most every `flushAfter` seconds (a lookup skips
+the write while another process holds the lock, so reads never wait for it),
+with the next `store`, and by `stats` and `close`. Once the stored text exceeds `maxBytes`, the
+least recently used entries are evicted.
+
+    with ExtractionCache("texts.db") as cache:
+        text = cache.combineDocText("contract.docx")
+        print(cache.stats())
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zipfile
+
+import docx_xml
+from docx_zip import readDirectory
+
+# -- bump when the extracted text of a document could change, to drop old entries --
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS texts (
+    crc INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    outer_text TEXT NOT NULL,
+    inner_text TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    atime REAL NOT NULL,
+    PRIMARY KEY (crc, size)
+);
+CREATE INDEX IF NOT EXISTS texts_atime ON texts (atime);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO counters VALUES ('bytes', 0), ('hits', 0), ('misses', 0), ('evictions', 0);
+"""
+
+
+def fingerprint(src):
+    """`(crc32, size)` of the main document part of `src` (a path or binary file object) from the zip directory."""
+    entries = readDirectory(src)
+    entry = entries.get(docx_xml.DOCUMENT_PART)
+    if entry is None:
+        # -- an unusual main part name: resolve it through `_rels/.rels` --
+        if hasattr(src, "seek"):
+            src.seek(0)
+        with zipfile.ZipFile(src) as zf:
+            entry = entries[docx_xml.documentPartName(zf)]
+    return entry[0], entry[2]
+
+
+class ExtractionCache:
+    """Text of documents by `fingerprint`, stored in the SQLite database `path`."""
+
+    def __init__(self, path, maxBytes=512 << 20, timeout=30.0, touchAfter=60.0, flushAfter=5.0):
+        self.path = os.fspath(path)
+        self.maxBytes = maxBytes
+        self.timeout = timeout
+        self.touchAfter = touchAfter
+        self.flushAfter = flushAfter
+        self.hits = self.misses = 0
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._resetPending()
+
+    def _resetPending(self):
+        self._touches = {}
+        self._counts = {"hits": 0, "misses": 0}
+        self._flushed = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Write pending updates and close the connection."""
+        if self._conn is not None and self._pid == os.getpid():
+            self.flush()
+            self._conn.close()
+        self._conn = None
+
+    def _connection(self):
+        # -- a connection inherited through fork must not be used by the child --
+        if self._conn is None or self._pid != os.getpid():
+            if self._conn is not None:
+                self._resetPending()  # -- the parent writes its own pending updates --
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # -- only a database without the current schema needs the write lock --
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                        conn.execute("DROP TABLE IF EXISTS texts")
+                        conn.execute("DROP TABLE IF EXISTS counters")
+                        for statement in _SCHEMA.split(";"):
+                            if statement.strip():
+                                conn.execute(statement)
+                        conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def lookup(self, key):
+        """`(outer, inner)` text stored for the fingerprint `key`, or None; a hit marks the entry as used."""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT outer_text, inner_text, atime FROM texts WHERE crc = ? AND size = ?", key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                self._counts["misses"] += 1
+            else:
+                self.hits += 1
+                self._counts["hits"] += 1
+                now = time.time()
+                if now - row[2] >= self.touchAfter:
+                    self._touches[key] = now
+            if time.monotonic() - self._flushed >= self.flushAfter:
+                self._tryFlush(conn)
+            return None if row is None else row[:2]
+
+    def _tryFlush(self, conn):
+        """`_flush` without waiting for the write lock; a busy database keeps the updates pending."""
+        conn.execute("PRAGMA busy_timeout=0")
+        try:
+            self._flush(conn)
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            self._flushed = time.monotonic()
+        finally:
+            conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+
+    def flush(self):
+        """Write the pending hit and miss counts and access times."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._flush(self._conn)
+
+    def _flush(self, conn):
+        if self._touches or any(self._counts.values()):
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._writePending(conn)
+        self._resetPending()
+
+    def _writePending(self, conn):
+        conn.executemany(
+            "UPDATE texts SET atime = max(atime, ?) WHERE crc = ? AND size = ?",
+            [(atime, *key) for key, atime in self._touches.items()],
+        )
+        for name, n in self._counts.items():
+            if n:
+                self._add(conn, name, n)
+
+    def store(self, key, outer, inner):
+        """Store the texts for `key` and evict least recently used entries beyond `maxBytes`."""
+        size = len(outer.encode("utf-8")) + len(inner.encode("utf-8"))
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._writePending(conn)
+                old = conn.execute("SELECT bytes FROM texts WHERE crc = ? AND size = ?", key).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO texts VALUES (?, ?, ?, ?, ?, ?)", (*key, outer, inner, size, time.time())
+                )
+                total = self._add(conn, "bytes", size - (old[0] if old else 0))
+                freed = evicted = 0
+                while total - freed > self.maxBytes:
+                    rows = conn.execute(
+                        "SELECT crc, size, bytes FROM texts WHERE NOT (crc = ? AND size = ?) ORDER BY atime LIMIT 64",
+                        key,
+                    ).fetchall()
+                    if not rows:
+                        break  # -- the new entry alone is over the budget; keep it anyway --
+                    for crc, partSize, entryBytes in rows:
+                        if total - freed <= self.maxBytes:
+                            break
+                        conn.execute("DELETE FROM texts WHERE crc = ? AND size = ?", (crc, partSize))
+                        freed += entryBytes
+                        evicted += 1
+                if evicted:
+                    self._add(conn, "bytes", -freed)
+                    self._add(conn, "evictions", evicted)
+            self._resetPending()
+
+    @staticmethod
+    def _value(conn, name):
+        return conn.execute("SELECT value FROM counters WHERE name = ?", (name,)).fetchone()[0]
+
+    def _add(self, conn, name, n):
+        conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (n, name))
+        return self._value(conn, name)
+
+    def texts(self, src):
+        """`(outer, inner)` text of `src`, extracted with docx_xml and stored on a miss."""
+        if hasattr(src, "seek"):
+            src.seek(0)
+        key = fingerprint(src)
+        row = self.lookup(key)
+        if row is not None:
+            return row
+        if hasattr(src, "seek"):
+            src.seek(0)
+        body = docx_xml.loadBody(src)
+        outer, inner = docx_xml.extractOuterDocText(body), docx_xml.extractInnerDocText(body)
+        self.store(key, outer, inner)
+        return outer, inner
+
+    def combineDocText(self, src):
+        outer, inner = self.texts(src)
+        return outer + inner
+
+    def extractOuterDocText(self, src):
+        return self.texts(src)[0]
+
+    def extractInnerDocText(self, src):
+        return self.texts(src)[1]
+
+    def stats(self):
+        """Counters shared by all processes using the database, plus this object's own hits and misses."""
+        with self._lock:
+            conn = self._connection()
+            self._flush(conn)
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+            entries = conn.execute("SELECT count(*) FROM texts").fetchone()[0]
+        return {
+            "entries": entries, "bytes": counters["bytes"], "maxBytes": self.maxBytes,
+            "hits": counters["hits"], "misses": counters["misses"], "evictions": counters["evictions"],
+            "sessionHits": self.hits, "sessionMisses": self.misses,
+        }
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM texts")
+                conn.execute("UPDATE counters SET value = 0")
+            self._resetPending()
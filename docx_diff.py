@@ -0,0 +1,256 @@
+"""
+Paragraph-level diff between two documents.
+
+`diff_documents` maps every body paragraph and every table cell to an integer id
+(equal texts share an id) and diffs the id sequences with Myers' algorithm in
+linear space. Only paragraphs that changed are diffed again character by
+character, so two large revisions with a few edits cost little more than
+reading their text.
+
+The result is a list of `DiffOp` in the coordinates of the first document:
+`startParaIdx`/`endParaIdx` index its paragraphs (or, with `cell` set, the
+paragraphs of its `cell`-th cell in `DocumentView.cells` order) and
+`start`/`end` are inclusive character positions, exactly as taken by
+`replaceDocTextSegment`. `apply_patch` replays the ops on the first document,
+editing it in place, to reproduce the text of the second.
+"""
+
+from collections import namedtuple
+
+import docx_tools
+from docx_tools import asView
+
+DiffOp = namedtuple("DiffOp", "kind startParaIdx endParaIdx start end txt cell", defaults=(None,))
+DiffOp.__doc__ = """
+One edit of a diff. `kind` is
+
+- `"replace"`: replace the characters `start` to `end` (inclusive) of paragraph
+  `startParaIdx` by `txt`; `end == start - 1` inserts, an empty `txt` deletes.
+- `"insert"`: insert a new paragraph with the text `txt` before paragraph
+  `startParaIdx` (after the last one if it equals the paragraph count); several
+  inserts at the same index keep their order.
+- `"delete"`: delete the paragraphs `startParaIdx` to `endParaIdx`.
+- `"insert_cell"` / `"delete_cell"`: the tables gained or lost the cell `cell`
+  with the text `txt`. These report structural table changes and cannot be replayed.
+"""
+
+
+def _bisect(a, alo, ahi, b, blo, bhi):
+    """Split point `(x, y)` of a shortest edit script through the middle snake, or None."""
+    n, m = ahi - alo, bhi - blo
+    maxD = (n + m + 1) // 2
+    offset = maxD
+    v1 = [-1] * (2 * maxD + 2)
+    v2 = [-1] * (2 * maxD + 2)
+    v1[offset + 1] = v2[offset + 1] = 0
+    delta = n - m
+    front = delta % 2 != 0
+    k1start = k1end = k2start = k2end = 0
+    for d in range(maxD):
+        for k1 in range(-d + k1start, d + 1 - k1end, 2):
+            i = offset + k1
+            if k1 == -d or (k1 != d and v1[i - 1] < v1[i + 1]):
+                x1 = v1[i + 1]
+            else:
+                x1 = v1[i - 1] + 1
+            y1 = x1 - k1
+            while x1 < n and y1 < m and a[alo + x1] == b[blo + y1]:
+                x1 += 1
+                y1 += 1
+            v1[i] = x1
+            if x1 > n:
+                k1end += 2
+            elif y1 > m:
+                k1start += 2
+            elif front:
+                j = offset + delta - k1
+                if 0 <= j < len(v2) and v2[j] != -1 and x1 >= n - v2[j]:
+                    return x1, y1
+        for k2 in range(-d + k2start, d + 1 - k2end, 2):
+            i = offset + k2
+            if k2 == -d or (k2 != d and v2[i - 1] < v2[i + 1]):
+                x2 = v2[i + 1]
+            else:
+                x2 = v2[i - 1] + 1
+            y2 = x2 - k2
+            while x2 < n and y2 < m and a[ahi - x2 - 1] == b[bhi - y2 - 1]:
+                x2 += 1
+                y2 += 1
+            v2[i] = x2
+            if x2 > n:
+                k2end += 2
+            elif y2 > m:
+                k2start += 2
+            elif not front:
+                j = offset + delta - k2
+                if 0 <= j < len(v1) and v1[j] != -1:
+                    x1 = v1[j]
+                    if x1 >= n - x2:
+                        return x1, offset + x1 - j
+    return None
+
+
+def _matchingBlocks(a, b):
+    """`(i, j, size)` runs with `a[i:i + size] == b[j:j + size]` along a shortest edit script."""
+    blocks = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        item = stack.pop()
+        if len(item) == 3:
+            blocks.append(item)
+            continue
+        alo, ahi, blo, bhi = item
+        size = 0
+        while alo + size < ahi and blo + size < bhi and a[alo + size] == b[blo + size]:
+            size += 1
+        if size:
+            blocks.append((alo, blo, size))
+            alo += size
+            blo += size
+        suffix = 0
+        while alo < ahi - suffix and blo < bhi - suffix and a[ahi - suffix - 1] == b[bhi - suffix - 1]:
+            suffix += 1
+        if suffix:
+            ahi -= suffix
+            bhi -= suffix
+            stack.append((ahi, bhi, suffix))
+        if alo == ahi or blo == bhi:
+            continue
+        split = _bisect(a, alo, ahi, b, blo, bhi)
+        if split is None or split in ((0, 0), (ahi - alo, bhi - blo)):
+            continue  # -- nothing in common --
+        x, y = alo + split[0], blo + split[1]
+        # -- the left half is popped, and so emitted, first --
+        stack.append((x, ahi, y, bhi))
+        stack.append((alo, x, blo, y))
+    return blocks
+
+
+def diff_sequences(a, b):
+    """
+    difflib-style opcodes `(tag, i1, i2, j1, j2)` turning the sequence `a` into `b`,
+    computed with Myers' linear-space algorithm. Tags are `"equal"`, `"replace"`,
+    `"delete"` and `"insert"`.
+    """
+    opcodes = []
+    i = j = 0
+    # -- without a single common item Myers would explore every diagonal for nothing --
+    blocks = _matchingBlocks(a, b) if not set(a).isdisjoint(b) else []
+    for bi, bj, size in blocks + [(len(a), len(b), 0)]:
+        if i < bi or j < bj:
+            tag = "replace" if i < bi and j < bj else "delete" if i < bi else "insert"
+            opcodes.append((tag, i, bi, j, bj))
+        if size:
+            opcodes.append(("equal", bi, bi + size, bj, bj + size))
+        i, j = bi + size, bj + size
+    return opcodes
+
+
+def _ids(*sequences):
+    """Replace equal texts by equal small integers, so the diff compares ints instead of strings."""
+    ids = {}
+    return [[ids.setdefault(text, len(ids)) for text in texts] for texts in sequences]
+
+
+def _textOps(old, new, paraIdx, cell):
+    ops = []
+    for tag, i1, i2, j1, j2 in diff_sequences(old, new):
+        if tag != "equal":
+            ops.append(DiffOp("replace", paraIdx, paraIdx, i1, i2 - 1, new[j1:j2], cell))
+    return ops
+
+
+def _paragraphOps(old, new, cell=None):
+    """Ops turning the paragraph texts `old` into `new`."""
+    ops = []
+    oldIds, newIds = _ids(old, new)
+    for tag, i1, i2, j1, j2 in diff_sequences(oldIds, newIds):
+        if tag == "equal":
+            continue
+        # -- changed paragraphs are paired up in order and diffed by character --
+        paired = min(i2 - i1, j2 - j1)
+        for k in range(paired):
+            ops += _textOps(old[i1 + k], new[j1 + k], i1 + k, cell)
+        if i1 + paired < i2:
+            ops.append(DiffOp("delete", i1 + paired, i2 - 1, 0, len(old[i2 - 1]) - 1, "", cell))
+        for k in range(j1 + paired, j2):
+            ops.append(DiffOp("insert", i2, i2, 0, -1, new[k], cell))
+    return ops
+
+
+def _cellParagraphs(view, i):
+    return [p.text for p in view.cells[i].paragraphs]
+
+
+def diff_documents(a, b):
+    """
+    Return the `DiffOp` list turning the text of document `a` into that of `b`:
+    body paragraph ops first, then the ops of changed table cells. `a` and `b` may
+    be documents or `DocumentView`s; views reuse their cached paragraph texts.
+    """
+    a, b = asView(a), asView(b)
+    old = [a._paragraphText(p) for p in a.paragraphs]
+    new = [b._paragraphText(p) for p in b.paragraphs]
+    ops = _paragraphOps(old, new)
+
+    oldCells = [a._cellText(cell) for cell in a.cells]
+    newCells = [b._cellText(cell) for cell in b.cells]
+    oldIds, newIds = _ids(oldCells, newCells)
+    for tag, i1, i2, j1, j2 in diff_sequences(oldIds, newIds):
+        if tag == "equal":
+            continue
+        paired = min(i2 - i1, j2 - j1)
+        for k in range(paired):
+            ops += _paragraphOps(_cellParagraphs(a, i1 + k), _cellParagraphs(b, j1 + k), i1 + k)
+        for k in range(i1 + paired, i2):
+            ops.append(DiffOp("delete_cell", k, k, 0, -1, oldCells[k], k))
+        for k in range(j1 + paired, j2):
+            ops.append(DiffOp("insert_cell", i2, i2, 0, -1, newCells[k], i2))
+    return ops
+
+
+def _applyOps(paragraphs, ops):
+    """Apply ops of one paragraph list right to left, so the positions of earlier ops stay valid."""
+    inserts = {}
+    for op in ops:
+        if op.kind == "insert":
+            inserts.setdefault(op.startParaIdx, []).append(op.txt)
+    for op in reversed(ops):
+        if op.kind == "replace":
+            docx_tools.replaceParagraphsSegment(paragraphs, op.startParaIdx, op.endParaIdx, op.start, op.end, op.txt)
+        elif op.kind == "delete":
+            for i in range(op.startParaIdx, op.endParaIdx + 1):
+                docx_tools.deletePara(paragraphs[i])
+    for index, texts in inserts.items():
+        if index < len(paragraphs):
+            anchor = paragraphs[index]
+            for text in texts:
+                anchor.insert_paragraph_before(text)
+            docx_tools.paragraphsChanged(anchor._p.getparent())
+        elif paragraphs:
+            anchor = paragraphs[-1]
+            for text in texts:
+                anchor = docx_tools.appendPara(anchor, text)
+        else:
+            raise ValueError("cannot insert paragraphs into an empty paragraph list")
+
+
+def apply_patch(doc, ops):
+    """
+    Apply the ops of `diff_documents(doc, other)` to `doc` in place and return it, so
+    its text becomes that of `other`. Inserted paragraphs get the text only, without
+    the formatting they have in `other`. Raises ValueError for ops that change the
+    table structure.
+    """
+    view = asView(doc)
+    if any(op.kind in ("insert_cell", "delete_cell") for op in ops):
+        raise ValueError("the table structure changed; cell insertions and deletions cannot be replayed")
+    groups = {}
+    for op in ops:
+        groups.setdefault(op.cell, []).append(op)
+    cells = view.cells if any(cell is not None for cell in groups) else None
+    # -- materialize every paragraph list before the first edit, so indices refer to the original document --
+    targets = [(view.paragraphs if cell is None else cells[cell].paragraphs, cellOps) for cell, cellOps in groups.items()]
+    for paragraphs, cellOps in targets:
+        _applyOps(paragraphs, cellOps)
+    return doc
@@ -0,0 +1,190 @@
+"""
+Corpus text extraction, usable as `python -m docx_tools extract PATH...`.
+
+Documents are spread over a process pool. At most `--max-in-flight` files are
+submitted at a time, so memory stays bounded no matter how large the corpus is.
+One JSONL record is written per document; failures are recorded in the `error`
+field instead of aborting the run.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+ENGINES = ("xml", "docx")
+
+
+def iterPaths(inputs, suffix=".docx"):
+    """Yield the documents named by `inputs`: files, directories (walked recursively) or glob patterns."""
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(suffix) and not name.startswith("~$"):
+                        yield os.path.join(root, name)
+        elif os.path.exists(item):
+            yield item
+        else:
+            yield from sorted(glob.iglob(item, recursive=True))
+
+
+_caches = {}
+
+
+def _cache(path):
+    # -- keyed by process too: a forked worker must not reuse its parent's cache and exit hook --
+    key = (path, os.getpid())
+    cache = _caches.get(key)
+    if cache is None:
+        from multiprocessing.util import Finalize
+
+        from docx_cache import ExtractionCache
+
+        cache = _caches[key] = ExtractionCache(path)
+        # -- pool workers leave through os._exit; this also writes their pending cache updates --
+        Finalize(None, cache.close, exitpriority=10)
+    return cache
+
+
+def extractFile(path, engine="xml", cache=None):
+    """
+    Extract one document into a JSON-serializable record; never raises. With
+    `cache`, the path of a `docx_cache.ExtractionCache` database, unchanged
+    documents are answered from the cache and misses are extracted with docx_xml.
+    """
+    start = time.perf_counter()
+    record = {"path": path, "outer": None, "inner": None, "seconds": None, "error": None}
+    try:
+        if cache is not None:
+            texts = _cache(cache)
+            hits = texts.hits
+            record["outer"], record["inner"] = texts.texts(path)
+            record["cached"] = texts.hits > hits
+        elif engine == "xml":
+            import docx_xml
+
+            body = docx_xml.loadBody(path)
+            record["outer"] = docx_xml.extractOuterDocText(body)
+            record["inner"] = docx_xml.extractInnerDocText(body)
+        else:
+            import docx_tools
+            from docx_lazy import openLazy
+
+            with openLazy(path) as doc:
+                record["outer"] = docx_tools.extractOuterDocText(doc)
+                record["inner"] = docx_tools.extractInnerDocText(doc)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def iterRecords(paths, engine="xml", workers=None, maxInFlight=None, cache=None):
+    """
+    Yield extraction records for `paths` in completion order. With `workers=0` the
+    documents are processed in the calling process.
+    """
+    if workers == 0:
+        for path in paths:
+            yield extractFile(path, engine, cache)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    maxInFlight = maxInFlight or 2 * workers
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = {}
+        for path in paths:
+            if len(pending) >= maxInFlight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _result(future, pending.pop(future))
+            try:
+                future = pool.submit(extractFile, path, engine, cache)
+            except BrokenProcessPool:
+                # -- a worker died; its jobs fail with an error record and the rest go to a new pool --
+                pool.shutdown(wait=False)
+                pool = ProcessPoolExecutor(max_workers=workers)
+                future = pool.submit(extractFile, path, engine, cache)
+            pending[future] = path
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _result(future, pending.pop(future))
+    finally:
+        pool.shutdown()
+
+
+def _result(future, path):
+    """The record of a finished job, or an error record if its worker died."""
+    try:
+        return future.result()
+    except Exception as e:
+        return {"path": path, "outer": None, "inner": None, "seconds": None, "error": f"{type(e).__name__}: {e}"}
+
+
+def extract(inputs, out, engine="xml", workers=None, maxInFlight=None, cache=None, counts=None):
+    """
+    Write one JSONL record per document to the file object `out`; returns `(documents, failures)`.
+    With `cache`, the dict `counts` (if given) receives this run's cache `hits` and `misses`.
+    """
+    documents = failures = 0
+    if counts is not None:
+        counts.update(hits=0, misses=0)
+    for record in iterRecords(iterPaths(inputs), engine, workers, maxInFlight, cache):
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        documents += 1
+        if record["error"] is not None:
+            failures += 1
+        elif counts is not None and "cached" in record:
+            counts["hits" if record["cached"] else "misses"] += 1
+    return documents, failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m docx_tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cmd = commands.add_parser("extract", help="extract the text of many documents as JSONL")
+    cmd.add_argument("inputs", nargs="+", help="files, directories or glob patterns")
+    cmd.add_argument("-o", "--output", help="JSONL output file (default: stdout)")
+    cmd.add_argument("--engine", choices=ENGINES, default="xml")
+    cmd.add_argument("-j", "--workers", type=int, default=None,
+                     help="worker processes (default: CPU count, 0: no pool)")
+    cmd.add_argument("--max-in-flight", type=int, default=None,
+                     help="maximum number of submitted documents (default: 2 x workers)")
+    cmd.add_argument("--cache", help="SQLite extraction cache; unchanged documents are not extracted again")
+
+    cmd = commands.add_parser("serve", help="run a warm worker for JSONL jobs on stdin or a Unix socket")
+    cmd.add_argument("--socket", help="listen on this Unix socket instead of reading stdin")
+    cmd.add_argument("--cache-mb", type=int, default=256,
+                     help="memory budget of the parsed document cache in MiB (default: 256)")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        from docx_worker import serve
+
+        serve(args.socket, args.cache_mb << 20)
+        return 0
+    counts = {}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            documents, failures = extract(
+                args.inputs, out, args.engine, args.workers, args.max_in_flight, args.cache, counts
+            )
+    else:
+        documents, failures = extract(
+            args.inputs, sys.stdout, args.engine, args.workers, args.max_in_flight, args.cache, counts
+        )
+
+    print(f"{documents} documents, {failures} failed", file=sys.stderr)
+    if args.cache:
+        entries = _cache(args.cache).stats()["entries"]
+        print(f"cache: {entries} entries, {counts['hits']} hits, {counts['misses']} misses", file=sys.stderr)
+    return 0
@@ -0,0 +1,104 @@
+"""
+Lazy, extraction-only opening of .docx files.
+
+`openLazy` reads only the zip directory up front. The main document part is
+parsed the first time `paragraphs`, `tables` or another accessor needs it, and
+media, fonts, glossary or customXml parts are never read at all. The result is a
+python-docx `Document`, so the text functions of docx_tools work on it
+unchanged. Accessors that need the rest of the package (`styles`, `part`,
+`save`, ...) load it on first use and keep the already parsed, possibly edited
+body.
+"""
+
+import zipfile
+
+import docx.document
+from docx.oxml import parse_xml
+
+from docx_xml import documentPartName
+
+# -- the state `Document.__init__` sets up; LazyDocument provides it without calling it --
+_DOCUMENT_STATE = {"_element", "_part", "_parent", "_Document__body"}
+
+
+def checkDocumentInternals():
+    """
+    Raise ImportError unless python-docx' `Document` keeps its state in exactly the
+    attributes `LazyDocument` replaces, so a python-docx release that changes them
+    fails here instead of producing half-initialized documents.
+    """
+    element, part = object(), object()
+    probe = docx.document.Document.__new__(docx.document.Document)
+    probe.__init__(element, part)
+    state = vars(probe)
+    if (
+        set(state) != _DOCUMENT_STATE
+        or state["_element"] is not element
+        or state["_part"] is not part
+        or not isinstance(getattr(docx.document.Document, "_body", None), property)
+    ):
+        raise ImportError(
+            f"LazyDocument does not support this python-docx version: Document.__init__ sets {sorted(state)}"
+        )
+
+
+checkDocumentInternals()
+
+
+class LazyDocument(docx.document.Document):
+    """A python-docx `Document` whose parts are read from the zip only when first needed."""
+
+    def __init__(self, src):
+        self._parent = None
+        self._Document__body = None
+        self._src = src
+        self._zip = zipfile.ZipFile(src)
+        self.index = {info.filename: info for info in self._zip.infolist()}
+        self.partName = documentPartName(self._zip)
+        self.loaded = set()
+        self._root = None
+        self._mainPart = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the archive; parts that are already loaded stay usable."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def read(self, name):
+        """Uncompressed bytes of the zip entry `name`."""
+        if self._zip is None:
+            raise ValueError("lazy document is closed")
+        data = self._zip.read(name)
+        self.loaded.add(name)
+        return data
+
+    @property
+    def _element(self):
+        if self._root is None:
+            self._root = parse_xml(self.read(self.partName))
+        return self._root
+
+    @property
+    def _part(self):
+        if self._mainPart is None:
+            from docx.package import Package
+
+            if hasattr(self._src, "seek"):
+                self._src.seek(0)
+            part = Package.open(self._src).main_document_part
+            part._element = self._element
+            self.loaded.update(self.index)
+            self._mainPart = part
+        return self._mainPart
+
+
+def openLazy(src):
+    """Open `src` (a path or binary file object) as a `LazyDocument`."""
+    return LazyDocument(src)
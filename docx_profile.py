@@ -0,0 +1,291 @@
+"""
+Opt-in instrumentation of docx_tools and docxTools.
+
+Inside `with profiling() as profile:` every public function and public method of
+the two modules is wrapped to count calls and inclusive wall time, and the hot
+python-docx accessors are wrapped to count paragraph list materializations,
+`para.text` rebuilds, runs scanned and table cells visited. The wrappers are
+installed on entry and removed on exit, so nothing is measured - and nothing
+costs anything - while profiling is off.
+
+Setting the environment variable `DOCX_TOOLS_PROFILE` enables profiling for the
+whole process when docx_tools is imported. With the value `1` the statistics are
+printed as JSON to stderr at exit; any other value is a file to write them to,
+in Prometheus text format if it ends in `.prom` and as JSON otherwise.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+ENV = "DOCX_TOOLS_PROFILE"
+MODULES = ("docx_tools", "docxTools")
+
+COUNTERS = {
+    "paragraph_lists": "Paragraph lists materialized through `.paragraphs`.",
+    "paragraphs_materialized": "Paragraph proxies created by those lists.",
+    "paragraph_text_builds": "`Paragraph.text` values rebuilt from the runs.",
+    "run_lists": "Run lists materialized through `Paragraph.runs`.",
+    "runs_scanned": "Runs visited by `Paragraph.runs` and `RunIndex` builds.",
+    "run_index_builds": "`RunIndex` objects built.",
+    "table_cells": "Table cells visited through `row.cells` and the table walker.",
+}
+
+
+class Profile:
+    """Call counts, inclusive wall time per function and the hot path counters."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.counters = Counter({name: 0 for name in COUNTERS})
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            self.calls[name] += 1
+            self.seconds[name] += seconds
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+            self.seconds.clear()
+            self.counters = Counter({name: 0 for name in COUNTERS})
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "functions": {
+                    name: {"calls": self.calls[name], "seconds": round(self.seconds[name], 9)}
+                    for name in sorted(self.calls)
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def toJson(self, indent=None):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def toPrometheus(self, prefix="docx_tools"):
+        """The statistics in the Prometheus text exposition format."""
+        data = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_calls_total Calls of docx_tools functions.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        lines += [f'{prefix}_calls_total{{function="{name}"}} {f["calls"]}' for name, f in data["functions"].items()]
+        lines += [
+            f"# HELP {prefix}_seconds_total Inclusive wall time of docx_tools functions.",
+            f"# TYPE {prefix}_seconds_total counter",
+        ]
+        lines += [f'{prefix}_seconds_total{{function="{name}"}} {f["seconds"]}' for name, f in data["functions"].items()]
+        for name, value in data["counters"].items():
+            lines += [
+                f"# HELP {prefix}_{name}_total {COUNTERS.get(name, name)}",
+                f"# TYPE {prefix}_{name}_total counter",
+                f"{prefix}_{name}_total {value}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+_lock = threading.RLock()
+_active = None
+_patches = []
+_instrumented = set()
+
+
+def current():
+    """The active `Profile`, or None when profiling is off."""
+    return _active
+
+
+def _timed(name, func, profile):
+    if inspect.isgeneratorfunction(func):
+
+        @functools.wraps(func)
+        def generator(*args, **kwargs):
+            # -- only the time spent producing items is measured, not the consumer's --
+            start = time.perf_counter()
+            it = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            try:
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = next(it)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += time.perf_counter() - start
+                    yield item
+            finally:
+                profile.record(name, elapsed)
+
+        return generator
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.record(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def _patch(owner, name, value):
+    _patches.append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, value)
+
+
+def _instrumentModule(module, profile):
+    wrappers = {}
+    for name, obj in list(vars(module).items()):
+        if name.startswith("_") or getattr(obj, "__module__", None) != module.__name__:
+            continue
+        qualified = f"{module.__name__}.{name}"
+        if inspect.isfunction(obj):
+            wrappers[obj] = _timed(qualified, obj, profile)
+        elif inspect.isclass(obj):
+            for attr, member in list(vars(obj).items()):
+                if attr.startswith("_") and attr != "__init__":
+                    continue
+                label = qualified if attr == "__init__" else f"{qualified}.{attr}"
+                if inspect.isfunction(member):
+                    _patch(obj, attr, _timed(label, member, profile))
+                elif isinstance(member, property) and member.fget is not None:
+                    _patch(obj, attr, property(_timed(label, member.fget, profile), member.fset, member.fdel))
+
+    # -- rebind every global that refers to a wrapped function, so internal calls are counted too --
+    for target in (sys.modules.get(name) for name in MODULES):
+        if target is None:
+            continue
+        for name, obj in list(vars(target).items()):
+            if inspect.isfunction(obj) and obj in wrappers:
+                _patch(target, name, wrappers[obj])
+
+    if module.__name__ == "docx_tools":
+        _instrumentHotPaths(module, profile)
+    _instrumented.add(module.__name__)
+
+
+def _counting(fget, profile, counter, sizeCounter=None):
+    def getter(self):
+        value = fget(self)
+        if counter is not None:
+            profile.count(counter)
+        if sizeCounter is not None:
+            profile.count(sizeCounter, len(value))
+        return value
+
+    return functools.wraps(fget)(getter)
+
+
+def _instrumentHotPaths(docx_tools, profile):
+    from docx.blkcntnr import BlockItemContainer
+    from docx.table import _Row
+    from docx.text.paragraph import Paragraph
+
+    def wrapProperty(cls, attr, counter, sizeCounter=None):
+        prop = cls.__dict__[attr]
+        _patch(cls, attr, property(_counting(prop.fget, profile, counter, sizeCounter), prop.fset, prop.fdel))
+
+    wrapProperty(BlockItemContainer, "paragraphs", "paragraph_lists", "paragraphs_materialized")
+    wrapProperty(Paragraph, "text", "paragraph_text_builds")
+    wrapProperty(Paragraph, "runs", "run_lists", "runs_scanned")
+    wrapProperty(_Row, "cells", None, "table_cells")
+
+    runIndexInit = docx_tools.RunIndex.__init__
+
+    def countingRunIndexInit(self, p):
+        runIndexInit(self, p)
+        profile.count("run_index_builds")
+        profile.count("runs_scanned", len(self.runs))
+
+    _patch(docx_tools.RunIndex, "__init__", functools.wraps(runIndexInit)(countingRunIndexInit))
+
+    rowCells = docx_tools._rowCells
+
+    def countingRowCells(row):
+        for item in rowCells(row):
+            profile.count("table_cells")
+            yield item
+
+    _patch(docx_tools, "_rowCells", countingRowCells)
+
+
+def enable(profile=None):
+    """Start profiling into `profile` (a new `Profile` by default) and return it."""
+    global _active
+    with _lock:
+        if _active is not None:
+            raise RuntimeError("profiling is already enabled")
+        _active = profile if profile is not None else Profile()
+        for name in MODULES:
+            module = sys.modules.get(name)
+            if module is not None:
+                _instrumentModule(module, _active)
+        return _active
+
+
+def disable():
+    """Stop profiling, remove all wrappers and return the finished `Profile`."""
+    global _active
+    with _lock:
+        profile = _active
+        while _patches:
+            owner, name, original = _patches.pop()
+            setattr(owner, name, original)
+        _instrumented.clear()
+        _active = None
+        return profile
+
+
+def instrument(moduleName):
+    """Called by docx_tools and docxTools on import when `DOCX_TOOLS_PROFILE` is set."""
+    with _lock:
+        if _active is None:
+            enable()
+            atexit.register(_report, os.environ.get(ENV, "1"))
+        elif moduleName not in _instrumented:
+            _instrumentModule(sys.modules[moduleName], _active)
+
+
+def _report(target):
+    profile = _active
+    if profile is None:
+        return
+    if target == "1":
+        sys.stderr.write(profile.toJson(indent=2) + "\n")
+        return
+    with open(target, "w", encoding="utf-8") as f:
+        f.write(profile.toPrometheus() if target.endswith(".prom") else profile.toJson(indent=2))
+
+
+@contextmanager
+def profiling(profile=None):
+    """
+    Profile the enclosed block and yield the `Profile`. If profiling is already on
+    (nested use or `DOCX_TOOLS_PROFILE`), the active profile is yielded and left on.
+    """
+    with _lock:
+        active = _active
+    if active is not None:
+        yield active
+        return
+    profile = enable(profile)
+    try:
+        yield profile
+    finally:
+        disable()
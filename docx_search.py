@@ -0,0 +1,163 @@
+"""
+Regular expression search and replace over whole documents.
+
+Every paragraph of the body, including paragraphs in (nested) table cells, is
+flattened once into its text and a run offset map. Matches may span run
+boundaries; a replacement is written into the run where the match starts, so it
+keeps that run's formatting, and runs emptied by a match are removed.
+"""
+
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+from docx.text.paragraph import Paragraph
+
+from docx_tools import DocumentView, paragraphChanged
+from docx_xml import paragraphText, qn, runText
+
+_P = qn("p")
+_R = qn("r")
+_HYPERLINK = qn("hyperlink")
+
+SearchHit = namedtuple("SearchHit", "paraIdx start end text element")
+SearchHit.__doc__ = """
+A match inside one paragraph. `paraIdx` is the index in `doc.paragraphs` for body
+paragraphs and None for paragraphs in tables; `start`/`end` are offsets into the
+paragraph text and `element` is the `w:p` element.
+"""
+
+
+class FlatParagraph:
+    """Text of a paragraph together with its runs and their cumulative end offsets."""
+
+    __slots__ = ("element", "runs", "texts", "ends", "text")
+
+    def __init__(self, p):
+        self.element = p
+        self.runs = []
+        for child in p:
+            if child.tag == _R:
+                self.runs.append(child)
+            elif child.tag == _HYPERLINK:
+                self.runs.extend(child.iterchildren(_R))
+        self.texts = [runText(r) for r in self.runs]
+        self.ends = []
+        total = 0
+        for text in self.texts:
+            total += len(text)
+            self.ends.append(total)
+        self.text = "".join(self.texts)
+
+    def runAt(self, pos):
+        """Index of the run holding `pos`; the end of the text belongs to the last run."""
+        return min(bisect_right(self.ends, pos), len(self.runs) - 1)
+
+    def replace(self, spans):
+        """
+        Replace the sorted, non-overlapping `(start, end, text)` spans in one pass and
+        return the number of runs removed.
+        """
+        if not self.runs:
+            if any(text for _, _, text in spans):
+                r = self.element.add_r()
+                r.text = "".join(text for _, _, text in spans)
+                self.runs.append(r)
+            return 0
+
+        pieces = [[] for _ in self.runs]
+        pos = 0
+        for start, end, text in spans:
+            self._copy(pieces, pos, start)
+            if text:
+                pieces[self.runAt(start)].append(text)
+            pos = end
+        self._copy(pieces, pos, len(self.text))
+
+        removed = 0
+        for r, old, new in zip(self.runs, self.texts, map("".join, pieces)):
+            if new == old:
+                continue
+            if new == "":
+                r.getparent().remove(r)
+                removed += 1
+            else:
+                r.text = new
+        return removed
+
+    def _copy(self, pieces, start, end):
+        i = bisect_right(self.ends, start)
+        while start < end:
+            run_end = self.ends[i]
+            stop = min(end, run_end)
+            offset = run_end - len(self.texts[i])
+            pieces[i].append(self.texts[i][start - offset : stop - offset])
+            start = stop
+            i += 1
+
+
+def _document(doc):
+    return doc.doc if isinstance(doc, DocumentView) else doc
+
+
+def iter_paragraphs(doc):
+    """Yield `(paraIdx, w:p element)` for all body and table paragraphs in document order."""
+    body = _document(doc).element.body
+    paraIdx = 0
+    for p in body.iter(_P):
+        if p.getparent() is body:
+            yield paraIdx, p
+            paraIdx += 1
+        else:
+            yield None, p
+
+
+def _compile(pattern, flags):
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return re.compile(pattern, flags)
+
+
+def iter_matches(doc, pattern, flags=0):
+    regex = _compile(pattern, flags)
+    for paraIdx, p in iter_paragraphs(doc):
+        for m in regex.finditer(paragraphText(p)):
+            yield SearchHit(paraIdx, m.start(), m.end(), m.group(), p)
+
+
+def find_all(doc, pattern, flags=0):
+    """Return a `SearchHit` for every match of `pattern` in the paragraphs and table cells of `doc`."""
+    return list(iter_matches(doc, pattern, flags))
+
+
+def _expander(repl):
+    if callable(repl):
+        return repl
+    if "\\" in repl:
+        return lambda m: m.expand(repl)
+    return lambda m: repl
+
+
+def replace_all(doc, pattern, repl, count=0, flags=0):
+    """
+    Replace every match of `pattern` (at most `count` if given) with `repl`, a string
+    with the usual `re` backreferences or a function of the match. Returns the number
+    of replacements.
+    """
+    regex = _compile(pattern, flags)
+    expand = _expander(repl)
+    replaced = 0
+    for _, p in iter_paragraphs(doc):
+        if count and replaced >= count:
+            break
+        flat = FlatParagraph(p)
+        spans = []
+        for m in regex.finditer(flat.text):
+            spans.append((m.start(), m.end(), expand(m)))
+            if count and replaced + len(spans) >= count:
+                break
+        if spans:
+            flat.replace(spans)
+            paragraphChanged(Paragraph(p, None))
+            replaced += len(spans)
+    return replaced
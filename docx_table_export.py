@@ -0,0 +1,183 @@
+"""
+Columnar export of table cells for analytics.
+
+`iter_cell_batches` walks the tables of many documents with the lxml-only walker
+of docx_xml and packs the cells into `CellBatch` objects of
+`(doc_id, table_path, row, col, depth, text)` columns. Numbers are kept in
+`array` buffers and text as one UTF-8 buffer plus offsets (the Arrow string
+layout), so a batch of a million cells holds a handful of Python objects instead
+of one per cell. `CellBatch.toNumpy` and `CellBatch.toArrow` convert a batch
+without copying when NumPy or pyarrow are installed.
+
+`table_path` locates a table: the document-order index of a top level table, and
+for nested tables the parent table's path, the `row:col` of the enclosing cell
+and the table's own index, e.g. `"0/1:1/1"`.
+"""
+
+import os
+from array import array
+
+from docx_tools import DocumentView
+from docx_xml import cellText, iter_table_cells, loadBody
+
+COLUMNS = ("doc_id", "table_path", "row", "col", "depth", "text")
+
+
+class CellBatch:
+    """
+    Cells of one batch in columns. `doc_id` and `table_path` are dictionary encoded:
+    `docs`/`paths` hold the distinct values and `doc`/`path` the per-cell indices.
+    """
+
+    def __init__(self):
+        self.docs = []
+        self.paths = []
+        self.doc = array("q")
+        self.path = array("q")
+        self.row = array("q")
+        self.col = array("q")
+        self.depth = array("q")
+        self.offsets = array("q", [0])
+        self.data = bytearray()
+
+    def __len__(self):
+        return len(self.row)
+
+    def text(self, i):
+        return self.data[self.offsets[i] : self.offsets[i + 1]].decode("utf-8")
+
+    def records(self):
+        """Yield the cells as `(doc_id, table_path, row, col, depth, text)` tuples."""
+        for i in range(len(self)):
+            yield (
+                self.docs[self.doc[i]], self.paths[self.path[i]],
+                self.row[i], self.col[i], self.depth[i], self.text(i),
+            )
+
+    def toNumpy(self):
+        """
+        Return a dict of NumPy arrays: the index columns `doc` and `path` with the
+        `docs`/`paths` values, the integer columns, and the text as `offsets` plus
+        the UTF-8 bytes in `data`.
+        """
+        import numpy as np
+
+        return {
+            "docs": np.array(self.docs, dtype=object),
+            "paths": np.array(self.paths, dtype=object),
+            "doc": np.frombuffer(self.doc, dtype=np.int64),
+            "path": np.frombuffer(self.path, dtype=np.int64),
+            "row": np.frombuffer(self.row, dtype=np.int64),
+            "col": np.frombuffer(self.col, dtype=np.int64),
+            "depth": np.frombuffer(self.depth, dtype=np.int64),
+            "offsets": np.frombuffer(self.offsets, dtype=np.int64),
+            "data": np.frombuffer(self.data, dtype=np.uint8),
+        }
+
+    def toArrow(self):
+        """Return a `pyarrow.RecordBatch` with dictionary encoded `doc_id`/`table_path`."""
+        import pyarrow as pa
+
+        def ints(values):
+            return pa.Array.from_buffers(pa.int64(), len(values), [None, pa.py_buffer(values)])
+
+        def dictionary(indices, values):
+            return pa.DictionaryArray.from_arrays(ints(indices), pa.array(values, pa.string()))
+
+        text = pa.Array.from_buffers(
+            pa.large_string(), len(self), [None, pa.py_buffer(self.offsets), pa.py_buffer(self.data)]
+        )
+        return pa.RecordBatch.from_arrays(
+            [
+                dictionary(self.doc, self.docs), dictionary(self.path, self.paths),
+                ints(self.row), ints(self.col), ints(self.depth), text,
+            ],
+            names=list(COLUMNS),
+        )
+
+
+def _sources(sources):
+    for item in sources:
+        if isinstance(item, tuple):
+            yield item
+        elif isinstance(item, DocumentView) or hasattr(item, "element"):
+            yield None, item
+        elif isinstance(item, (str, os.PathLike)):
+            yield os.fspath(item), item
+        else:
+            yield getattr(item, "name", None), item
+
+
+def _loadBody(src):
+    """The `w:body` element of a document, `DocumentView`, element, path or binary file object."""
+    if isinstance(src, DocumentView):
+        src = src.doc
+    if hasattr(src, "element"):
+        return src.element.body
+    return loadBody(src)
+
+
+def iter_document_cells(src):
+    """Yield `(table_path, row, col, depth, text)` for every physical cell of `src`."""
+    tablePaths = {}
+    parents = []
+    for tc, cell in iter_table_cells(_loadBody(src), paths=True):
+        path = tablePaths.get(cell.table)
+        if path is None:
+            if cell.depth == 0:
+                path = str(cell.table)
+            else:
+                parentPath, row, col = parents[cell.depth - 1]
+                path = f"{parentPath}/{row}:{col}/{cell.table}"
+            tablePaths[cell.table] = path
+        del parents[cell.depth :]
+        parents.append((path, cell.row, cell.col))
+        yield path, cell.row, cell.col, cell.depth, cellText(tc)
+
+
+def iter_cell_batches(sources, batchSize=65536):
+    """
+    Yield `CellBatch` objects of at most `batchSize` cells for the tables of all
+    `sources`. A source is a path, a binary file object, a `w:body` element, a
+    python-docx document or a `(doc_id, source)` pair; the doc_id defaults to the
+    path. Batches span document boundaries and a document may span batches.
+    """
+    batch = CellBatch()
+    for docId, src in _sources(sources):
+        docIndex = None
+        pathIndex = {}
+        for tablePath, row, col, depth, text in iter_document_cells(src):
+            if docIndex is None:
+                docIndex = len(batch.docs)
+                batch.docs.append(docId)
+            index = pathIndex.get(tablePath)
+            if index is None:
+                index = pathIndex[tablePath] = len(batch.paths)
+                batch.paths.append(tablePath)
+            batch.doc.append(docIndex)
+            batch.path.append(index)
+            batch.row.append(row)
+            batch.col.append(col)
+            batch.depth.append(depth)
+            batch.data += text.encode("utf-8")
+            batch.offsets.append(len(batch.data))
+            if len(batch) >= batchSize:
+                yield batch
+                batch = CellBatch()
+                docIndex = None
+                pathIndex = {}
+    if len(batch):
+        yield batch
+
+
+def export_tables(sources, batchSize=65536, format="arrays"):
+    """
+    Like `iter_cell_batches`, but convert every batch: `"arrays"` yields the
+    `CellBatch` itself, `"numpy"` the dict of `CellBatch.toNumpy` and `"arrow"` a
+    `pyarrow.RecordBatch`.
+    """
+    convert = {"arrays": lambda batch: batch, "numpy": CellBatch.toNumpy, "arrow": CellBatch.toArrow}.get(format)
+    if convert is None:
+        raise ValueError(f"unknown format {format!r}")
+    for batch in iter_cell_batches(sources, batchSize):
+        yield convert(batch)
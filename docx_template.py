@@ -0,0 +1,252 @@
+"""
+Placeholder filling for document templates.
+
+All placeholder keys are compiled into one Aho-Corasick automaton, so every
+paragraph (including nested table cells) is scanned once no matter how many keys
+the mapping has. Placeholders split across runs are found because matching runs
+on the flattened paragraph text.
+
+For high-volume generation `CompiledTemplate` parses a template once and renders
+each output by splicing the values into the pre-serialized main document part;
+all other zip entries are copied as raw compressed bytes.
+"""
+
+import io
+import re
+import zipfile
+from collections import deque, namedtuple
+from xml.sax.saxutils import escape
+
+from docx.oxml import parse_xml
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+from docx_search import FlatParagraph, iter_paragraphs
+from docx_tools import paragraphChanged
+from docx_xml import documentPartName, qn
+from docx_zip import RawEntry, RawZipWriter, iterRawEntries
+
+FillResult = namedtuple("FillResult", "replaced unresolved unused")
+FillResult.__doc__ = """
+Outcome of `fill_placeholders`: number of substitutions, sorted placeholder names
+left in the document without a value, and sorted mapping keys never found.
+"""
+
+
+class Automaton:
+    """Aho-Corasick automaton reporting leftmost-longest, non-overlapping matches."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.out = [-1]
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("empty pattern")
+            node = 0
+            for char in pattern:
+                nxt = self.goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][char] = nxt
+                    self.goto.append({})
+                    self.out.append(-1)
+                node = nxt
+            self.out[node] = index
+
+        # -- fail links, and for each node the nearest proper suffix node that ends a pattern --
+        self.fail = [0] * len(self.goto)
+        self.dictLink = [-1] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                state = self.fail[node]
+                while char not in self.goto[state] and state:
+                    state = self.fail[state]
+                fail = self.goto[state].get(char, 0)
+                self.fail[child] = fail if fail != child else 0
+                f = self.fail[child]
+                self.dictLink[child] = f if self.out[f] >= 0 else self.dictLink[f]
+                queue.append(child)
+
+    def iter_all(self, text):
+        """Yield `(start, end, pattern index)` for every occurrence, overlapping ones included."""
+        goto, fail, out, dictLink, patterns = self.goto, self.fail, self.out, self.dictLink, self.patterns
+        node = 0
+        for pos, char in enumerate(text):
+            while char not in goto[node] and node:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = node if out[node] >= 0 else dictLink[node]
+            while match >= 0:
+                index = out[match]
+                yield pos + 1 - len(patterns[index]), pos + 1, index
+                match = dictLink[match]
+
+    def finditer(self, text):
+        """Yield the leftmost-longest, non-overlapping `(start, end, pattern index)` matches."""
+        last_end = 0
+        for start, end, index in sorted(self.iter_all(text), key=lambda m: (m[0], -m[1])):
+            if start >= last_end:
+                yield start, end, index
+                last_end = end
+
+
+def _placeholderPattern(open="{{", close="}}", repeat="+"):
+    """Regex of `open + name + close` placeholders; a name cannot contain a delimiter character."""
+    name = "[^" + re.escape("".join(sorted(set(open + close)))) + "]" + repeat
+    return re.compile(re.escape(open) + "(" + name + ")" + re.escape(close))
+
+
+class PlaceholderSet:
+    """The keys of a mapping compiled into one automaton for `open + key + close` placeholders."""
+
+    def __init__(self, keys, open="{{", close="}}"):
+        self.keys = list(keys)
+        self.open = open
+        self.close = close
+        self.automaton = Automaton(open + key + close for key in self.keys)
+        self.leftover = _placeholderPattern(open, close, "*")
+
+    def scan(self, text):
+        """Return `(matches, unresolved names)` for `text`; matches are `(start, end, key)`."""
+        if self.open not in text:
+            return [], []
+        matches = [(s, e, self.keys[i]) for s, e, i in self.automaton.finditer(text)]
+        covered = {s for s, _, _ in matches}
+        unresolved = [m.group(1) for m in self.leftover.finditer(text) if m.start() not in covered]
+        return matches, unresolved
+
+
+def fill_placeholders(doc, mapping, open="{{", close="}}", placeholders=None):
+    """
+    Replace every `{{key}}` placeholder in the paragraphs and table cells of `doc`
+    with `str(mapping[key])` in a single sweep and return a `FillResult`. A
+    `PlaceholderSet` compiled once for the keys can be passed to skip compiling
+    the automaton for every document.
+    """
+    if placeholders is None:
+        placeholders = PlaceholderSet(mapping.keys(), open, close)
+
+    replaced = 0
+    found = set()
+    unresolved = set()
+    for _, p in iter_paragraphs(doc):
+        flat = FlatParagraph(p)
+        matches, leftover = placeholders.scan(flat.text)
+        unresolved.update(leftover)
+        if not matches:
+            continue
+        flat.replace([(s, e, str(mapping[key])) for s, e, key in matches])
+        paragraphChanged(Paragraph(p, None))
+        found.update(key for _, _, key in matches)
+        replaced += len(matches)
+
+    unused = sorted(key for key in placeholders.keys if key not in found)
+    return FillResult(replaced, sorted(unresolved), unused)
+
+
+# -- marks a placeholder in the serialized XML; private use characters never occur in templates --
+_SLOT_START = "\ue000"
+_SLOT_END = "\ue001"
+_SLOT = re.compile(re.escape(_SLOT_START.encode()) + rb"(\d+)" + re.escape(_SLOT_END.encode()))
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+_TAB = b'</w:t><w:tab/><w:t xml:space="preserve">'
+_BR = b'</w:t><w:br/><w:t xml:space="preserve">'
+
+
+# -- characters XML 1.0 cannot hold; lxml refuses them as well --
+_XML_INVALID = re.compile("[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+
+
+def _xmlValue(text):
+    """`text` as escaped run content, with tabs and line breaks mapped like python-docx' run text setter."""
+    if _XML_INVALID.search(text):
+        raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+    data = escape(text).encode("utf-8")
+    if b"\t" in data:
+        data = data.replace(b"\t", _TAB)
+    if b"\r" in data:
+        data = data.replace(b"\r", b"\n")
+    if b"\n" in data:
+        data = data.replace(b"\n", _BR)
+    return data
+
+
+class CompiledTemplate:
+    """
+    A .docx template whose `{{key}}` placeholders in the main document part were
+    located once. `render` patches the values into the pre-serialized XML byte
+    stream and copies every other zip entry without recompressing it.
+    """
+
+    def __init__(self, src, open="{{", close="}}", level=6):
+        if hasattr(src, "seek"):
+            src.seek(0)
+        with zipfile.ZipFile(src) as zf:
+            self.partName = documentPartName(zf)
+        if hasattr(src, "seek"):
+            src.seek(0)
+        self.entries = list(iterRawEntries(src))
+        self.level = level
+        self.slots = []
+
+        self.part = next((e for e in self.entries if e.name == self.partName), None)
+        if self.part is None:
+            raise ValueError(f"template has no {self.partName}")
+        xml = self.part.inflate()
+        if _SLOT_START.encode() in xml:
+            raise ValueError("template contains reserved private use characters")
+
+        root = parse_xml(xml)
+        pattern = _placeholderPattern(open, close)
+        for p in root.iter(qn("p")):
+            flat = FlatParagraph(p)
+            spans = []
+            for m in pattern.finditer(flat.text):
+                spans.append((m.start(), m.end(), f"{_SLOT_START}{len(self.slots)}{_SLOT_END}"))
+                self.slots.append((m.group(1), _xmlValue(m.group())))
+            if spans:
+                flat.replace(spans)
+        for t in root.iter(qn("t")):
+            if t.text and _SLOT_START in t.text:
+                t.set(_XML_SPACE, "preserve")
+
+        pieces = _SLOT.split(etree.tostring(root, encoding="UTF-8", standalone=True))
+        self.segments = pieces[0::2]
+        if [int(i) for i in pieces[1::2]] != list(range(len(self.slots))):
+            raise ValueError("placeholders could not be located in the serialized document")
+
+    @property
+    def keys(self):
+        return sorted({key for key, _ in self.slots})
+
+    def renderXml(self, mapping):
+        """The main document part for `mapping`; placeholders without a value are kept."""
+        out = [self.segments[0]]
+        for (key, original), segment in zip(self.slots, self.segments[1:]):
+            value = mapping.get(key)
+            out.append(original if value is None else _xmlValue(str(value)))
+            out.append(segment)
+        return b"".join(out)
+
+    def render(self, mapping, out):
+        """Write the filled document to `out`, a path or binary file object."""
+        part = self.part
+        with RawZipWriter(out) as writer:
+            for entry in self.entries:
+                if entry is part:
+                    entry = RawEntry.fromBytes(
+                        part.name, self.renderXml(mapping), self.level, part.dateTime, part.externalAttr
+                    )
+                writer.write(entry)
+
+    def renderBytes(self, mapping):
+        buf = io.BytesIO()
+        self.render(mapping, buf)
+        return buf.getvalue()
+
+
+def compileTemplate(src, open="{{", close="}}", level=6):
+    return CompiledTemplate(src, open, close, level)
@@ -1,57 +1,185 @@
+"""
+Text extraction and editing helpers for python-docx documents.
+
+python-docx itself is imported only inside the functions that create its
+objects, so `import docx_tools` stays cheap for scripts that only need the
+text helpers. Passed a path or binary file object instead of a document,
+`combineDocText`, `extractOuterDocText` and `extractInnerDocText` read it
+with the lxml-only docx_xml and never import python-docx at all.
+"""
+
 import copy
-from docx.oxml import OxmlElement
-from docx.text.paragraph import Paragraph
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right
+import itertools
+from lxml import etree
+
+import docx_xml
+from docx_xml import CellPath
+
+
+def _qn(tag):
+    """Clark notation of a `w:`-prefixed tag, without python-docx' namespace map."""
+    return docx_xml.qn(tag.partition(":")[2])
+
+
+_BODY = _qn("w:body")
+_TC = _qn("w:tc")
+_RUN_CONTENT = {_qn(tag) for tag in ("w:rPr", "w:t", "w:tab", "w:ptab", "w:br", "w:cr", "w:noBreakHyphen")}
+_P = _qn("w:p")
+_R = _qn("w:r")
+_T = _qn("w:t")
+_RPR = _qn("w:rPr")
+_PROOF_ERR = _qn("w:proofErr")
+_RSID = _qn("w:rsid")
+_XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+_withRsid = etree.XPath("descendant-or-self::*[@*[starts-with(local-name(), 'rsid')]]")
+# -- runs holding only this content can be merged without changing the document --
+_MERGEABLE = _RUN_CONTENT | {_qn(tag) for tag in ("w:softHyphen", "w:lastRenderedPageBreak")}
+
+
+def _isSource(doc):
+    """Whether `doc` is a path or binary file object rather than a document."""
+    return isinstance(doc, (str, os.PathLike)) or (hasattr(doc, "read") and not hasattr(doc, "paragraphs"))
 
 
 def combineDocText(doc):
-    return extractOuterDocText(doc) + extractInnerDocText(doc)
+    if isinstance(doc, DocumentView):
+        return doc.outerText() + doc.innerText()
+    if _isSource(doc):
+        return docx_xml.combineDocText(doc)
+    return "".join(iter_doc_text(doc))
 
 
 def extractOuterDocText(doc):
-    fullText = ""
-    for p in doc.paragraphs:
-        fullText += p.text
-    return fullText
+    if isinstance(doc, DocumentView):
+        return doc.outerText()
+    if _isSource(doc):
+        return docx_xml.extractOuterDocText(doc)
+    return "".join(iter_outer_doc_text(doc))
 
 
 def extractInnerDocText(doc):
+    if isinstance(doc, DocumentView):
+        return doc.innerText()
+    if _isSource(doc):
+        return docx_xml.extractInnerDocText(doc)
     return concatTableTexts(doc)
 
 
 def concatCellTexts(row, func=lambda cell: cell.text):
-    full_text = ""
-    for cell in row.cells:
-        full_text += func(cell) + "\n"
-        if len(cell.tables) > 0:
-            full_text += concatTableTexts(cell, func)
-    return full_text
+    return "".join(iter_cell_texts(row, func))
 
 
 def concatRowTexts(table, func=lambda cell: cell.text):
-    full_text = ""
-    for row in table.rows:
-        full_text += concatCellTexts(row, func)
-    return full_text
+    return "".join(iter_row_texts(table, func))
 
 
 def concatTableTexts(node, func=lambda cell: cell.text):
-    full_text = ""
-    if len(node.tables) > 0:
-        for table in node.tables:
-            full_text += concatRowTexts(table, func)
-    return full_text
+    return "".join(iter_table_texts(node, func))
+
+
+def iter_doc_text(doc, func=lambda cell: cell.text):
+    """
+    Yield the text of `doc` chunk by chunk: first the paragraphs, then the cells of all
+    (nested) tables. `"".join(iter_doc_text(doc))` equals `combineDocText(doc)`.
+    """
+    yield from iter_outer_doc_text(doc)
+    yield from iter_table_texts(doc, func)
+
+
+def iter_outer_doc_text(doc):
+    for p in doc.paragraphs:
+        yield p.text
+
+
+def iter_cell_texts(row, func=lambda cell: cell.text):
+    for cell, _ in _rowCells(row):
+        yield func(cell)
+        yield "\n"
+        yield from iter_table_texts(cell, func)
+
+
+def iter_row_texts(table, func=lambda cell: cell.text):
+    for row in table.rows:
+        yield from iter_cell_texts(row, func)
+
+
+def iter_table_texts(node, func=lambda cell: cell.text):
+    for cell in iter_table_cells(node):
+        yield func(cell)
+        yield "\n"
+
+
+def _rowCells(row):
+    """`(cell, grid column)` for the physical cells of `row`; merged cells are reported once."""
+    tr = getattr(row, "_tr", None)
+    if tr is None:
+        yield from ((cell, col) for col, cell in enumerate(row.cells))
+        return
+    from docx.table import _Cell
+
+    col = tr.grid_before
+    for tc in tr.tc_lst:
+        if tc.vMerge != "continue":
+            yield _Cell(tc, row._parent), col
+        col += tc.grid_span
+
+
+def iter_table_cells(node, paths=False):
+    """
+    Yield every physical cell of the (nested) tables in `node` (a document, view or
+    cell) once, each cell followed by the tables nested in it. Unlike `row.cells`,
+    merged cells are not repeated. With `paths` the items are `(cell, CellPath)`
+    pairs. The walk uses an explicit stack instead of recursion.
+    """
+    tables = itertools.count()
+
+    def cellsOf(parent, depth):
+        for table in parent.tables:
+            index = next(tables)
+            for r, row in enumerate(table.rows):
+                for cell, col in _rowCells(row):
+                    yield cell, CellPath(index, r, col, depth)
+
+    stack = [cellsOf(node, 0)]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+        cell, path = item
+        yield item if paths else cell
+        stack.append(cellsOf(cell, path.depth + 1))
+
+
+def write_doc_text(doc, fp, func=lambda cell: cell.text):
+    """Stream the text of `doc` into the file object `fp`; returns the number of characters written."""
+    written = 0
+    for chunk in iter_doc_text(doc, func):
+        fp.write(chunk)
+        written += len(chunk)
+    return written
 
 
 def duplicatePara(para):
     p_new = copy.deepcopy(para)
     para._p.addnext(p_new._p)
+    paragraphsChanged(para._p.getparent())
     return p_new
 
 
 def appendPara(para, txt=None, style=None):
+    from docx.oxml import OxmlElement
+    from docx.text.paragraph import Paragraph
+
     try:
         new_p = OxmlElement("w:p")
         para._p.addnext(new_p)
+        paragraphsChanged(para._p.getparent())
         new_para = Paragraph(new_p, para._parent)
         if txt:
             new_para.add_run(txt)
@@ -78,21 +206,24 @@ def deletePara(para):
     - raises AttributeError: Wenn das übergebene Absatzobjekt nicht die erforderlichen Attribute `_element` oder `_p` besitzt.
     - raises RemoveError: Wenn das Entfernen des Absatzes aus dem Dokumentenbaum fehlschlägt, z.B. weil das Elternelement nicht gefunden werden kann.
     """
+    paragraphChanged(para)
     p = para._element
-    p.getparent().remove(p)
+    parent = p.getparent()
+    parent.remove(p)
+    paragraphsChanged(parent)
     para._p = para._element = None
 
 
 def deleteTextRun(run, para):
     """
-    Entfernt einen spezifischen Textlauf (`run`) aus einem Absatz (`p`). Diese Funktion durchläuft die Textläufe des Absatzes rückwärts,
-    um den zu entfernenden Textlauf zu finden und ihn dann aus dem Absatz zu entfernen.
+    Entfernt einen spezifischen Textlauf (`run`) aus einem Absatz (`p`). Diese Funktion prüft anhand des Elternelements, ob der Textlauf
+    ein direktes Kindelement des Absatzes ist, und entfernt ihn dann aus dem Absatz, ohne `p.runs` neu aufzubauen.
 
     Parameters:
     - param run: Das Textlauf-Objekt, das aus dem Absatz entfernt werden soll. Es wird erwartet, dass dieses Objekt ein Attribut `_r` hat,
       welches das zugrundeliegende XML-Element des Textlaufs repräsentiert.
-    - param p: Das Absatzobjekt, aus dem der Textlauf entfernt werden soll. Das Objekt sollte eine Liste von Textläufen in `p.runs` und
-      ein Attribut `_p` haben, welches das zugrundeliegende XML-Element des Absatzes repräsentiert.
+    - param p: Das Absatzobjekt, aus dem der Textlauf entfernt werden soll. Das Objekt sollte ein Attribut `_p` haben,
+      welches das zugrundeliegende XML-Element des Absatzes repräsentiert.
 
     Return:
     - return: Das Textlauf-Objekt `run`, wenn es gefunden und erfolgreich entfernt wurde. Gibt `None` zurück, wenn der Textlauf im Absatz nicht gefunden wurde.
@@ -101,143 +232,566 @@ def deleteTextRun(run, para):
     - Es werden keine Exceptions direkt von dieser Funktion ausgelöst, aber durch die Verwendung von Attributen wie `_r` und `_p` besteht eine implizite
       Abhängigkeit von der Struktur des Absatz- und Textlaufobjekts, die bei Nichteinhaltung zu Fehlern führen kann.
     """
-    i = len(para.runs) - 1
-    while i >= 0:
-        if para.runs[i]._r == run._r:
-            para._p.remove(para.runs[i]._r)
-            return run
-        i -= 1
-    return None
+    if run._r.getparent() is not para._p:
+        return None
+    para._p.remove(run._r)
+    paragraphChanged(para)
+    return run
 
 
-def findRunIndex(pos, para):
-    if pos < 0 or pos >= len(para.text):
+def deleteTextRange(para, start, end):
+    """
+    Remove the characters `start` to `end` (inclusive) from `para`. The boundary runs
+    are trimmed and every run in between is detached in a single pass, so the cost is
+    linear in the paragraph size. An empty range (`end == start - 1`) deletes nothing,
+    so a replacement of it inserts. Returns None if a position is out of bounds or
+    the range is otherwise reversed.
+    """
+    if _deleteRange(para, getRunIndex(para), start, end) is None:
         return None
+    if end >= start:
+        paragraphChanged(para)
+    return para
 
-    cumulative_length = 0
-    for index, run in enumerate(para.runs):
-        cumulative_length += len(run.text)
-        if cumulative_length > pos:
-            return index
-
-    return None
 
+def _deleteRange(para, index, start, end):
+    """
+    `deleteTextRange` against `index`, without dropping any cache. The runs and
+    offsets of `index` left of `start` stay valid afterwards.
+    """
+    if end < start:
+        return para if end == start - 1 and 0 <= start <= index.length else None
+    start_location = index.locate(start)
+    end_location = index.locate(end)
 
-def findPosInRun(pos, para):
-    if pos < 0 or pos >= len(para.text):
+    if start_location is None or end_location is None:
         return None
 
-    cumulative_length = 0
-    for _, run in enumerate(para.runs):
-        previous_cumulative_length = cumulative_length
-        cumulative_length += len(run.text)
+    r_start, a = start_location
+    r_finish, o = end_location
+
+    from docx.text.run import Run
+
+    first = Run(index.runs[r_start], para)
+    last = Run(index.runs[r_finish], para)
+    if r_start == r_finish:
+        first.text = first.text[:a] + last.text[o + 1 :]
+    else:
+        first.text = first.text[:a]
+        last.text = last.text[o + 1 :]
+
+    p = para._p
+    for r in index.runs[r_start + 1 : r_finish]:
+        p.remove(r)
+    return para
 
-        if cumulative_length > pos:
-            return pos - previous_cumulative_length
 
-    return None
+class RunIndex:
+    """
+    Cumulative run offsets of a paragraph. Positions are resolved with bisect instead
+    of a linear scan over `para.runs`.
+    """
 
+    def __init__(self, p):
+        self.runs = list(p.r_lst)
+        self.ends = []
+        total = 0
+        for r in self.runs:
+            total += len(r.text)
+            self.ends.append(total)
 
-def insertStrIntoPara(para, str, pos):
-    l = 0
+    @property
+    def length(self):
+        return self.ends[-1] if self.ends else 0
 
-    if len(para.runs) == 0:
-        para.text = para.text[:pos] + str + para.text[pos:]
-        return para
+    def locate(self, pos):
+        """Return `(run index, position in run)` for `pos` or None if out of bounds."""
+        if pos < 0 or pos >= self.length:
+            return None
+        i = bisect_right(self.ends, pos)
+        return i, pos - self.start(i)
+
+    def locateInsert(self, pos):
+        """Like `locate`, but a position at a run boundary belongs to the preceding run."""
+        i = bisect_left(self.ends, pos)
+        if pos < 0 or i == len(self.ends):
+            return None
+        return i, pos - self.start(i)
+
+    def start(self, i):
+        return self.ends[i - 1] if i > 0 else 0
 
-    for r in para.runs:
-        l += len(r.text)
-        if pos <= l:
-            insert_position = pos - (l - len(r.text))
-            r.text = r.text[:insert_position] + str + r.text[insert_position:]
-            break
 
+# -- run indexes are cached only inside `runIndexCache` blocks, per thread --
+_runIndexScope = threading.local()
+
+
+@contextmanager
+def runIndexCache():
+    """
+    Reuse run indexes inside the block: `getRunIndex` builds the index of a paragraph
+    once and the mutators of this module drop it when they change the paragraph.
+    A paragraph changed by other means inside the block needs `invalidateRunIndex`
+    or `paragraphChanged`. Nested blocks share the outermost cache.
+    """
+    if getattr(_runIndexScope, "cache", None) is not None:
+        yield _runIndexScope.cache
+        return
+    _runIndexScope.cache = weakref.WeakKeyDictionary()
+    try:
+        yield _runIndexScope.cache
+    finally:
+        _runIndexScope.cache = None
+
+
+def getRunIndex(para):
+    """
+    Return the `RunIndex` of `para`. Outside a `runIndexCache` block every call builds
+    a fresh index, so changes made through python-docx are always seen.
+    """
+    p = para._p
+    cache = getattr(_runIndexScope, "cache", None)
+    if cache is None:
+        return RunIndex(p)
+    index = cache.get(p)
+    if index is None:
+        index = cache[p] = RunIndex(p)
+    return index
+
+
+def invalidateRunIndex(para):
+    _dropRunIndex(para._p)
+
+
+def _dropRunIndex(p):
+    cache = getattr(_runIndexScope, "cache", None)
+    if cache is not None and p is not None:
+        cache.pop(p, None)
+
+
+def paragraphChanged(para):
+    """
+    Drop every cache that depends on the text of `para`: its run index and, in open
+    views, its text or the text of the table cell holding it.
+    """
+    invalidateRunIndex(para)
+    if para._p is None:
+        return
+    parent = para._p.getparent()
+    if parent is not None and parent.tag == _TC:
+        _cellChanged(parent)
+        return
+    for view in _viewsOf(parent):
+        view._texts.pop(para._p, None)
+        view._outer = None
+
+
+def paragraphsChanged(container):
+    """Drop the cached paragraph lists of all views on `container` (`w:body` or a `w:tc`)."""
+    if container is not None and container.tag == _TC:
+        _cellChanged(container)
+        return
+    for view in _viewsOf(container):
+        view._paragraphs = None
+        view._outer = None
+
+
+def _cellChanged(tc):
+    for view in _viewsOf(next(tc.iterancestors(_BODY), None)):
+        view._cellTexts.pop(tc, None)
+        view._inner = None
+
+
+_viewRegistry = weakref.WeakKeyDictionary()
+
+
+def _viewsOf(container):
+    if container is None:
+        return ()
+    views = _viewRegistry.get(container)
+    return tuple(views) if views else ()
+
+
+class DocumentView:
+    """
+    Document wrapper that materializes `doc.paragraphs` and the table cells once and
+    caches the text of each paragraph and cell as well as the joined document text.
+    The mutators of this module mark only the paragraphs and cells they touch as
+    dirty, so `combineDocText` on a view re-reads just those after an edit. After
+    changing the document by other means call `invalidate`. A view can be passed
+    wherever docx_tools expects a document.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._body = doc.element.body
+        self._paragraphs = None
+        self._texts = weakref.WeakKeyDictionary()
+        self._cells = None
+        self._cellTexts = weakref.WeakKeyDictionary()
+        self._outer = None
+        self._ends = None
+        self._inner = None
+        _viewRegistry.setdefault(self._body, weakref.WeakSet()).add(self)
+
+    @property
+    def paragraphs(self):
+        if self._paragraphs is None:
+            self._paragraphs = self.doc.paragraphs
+            self._outer = None
+        return self._paragraphs
+
+    @property
+    def cells(self):
+        """The physical cells of all (nested) tables in `iter_table_cells` order."""
+        if self._cells is None:
+            self._cells = list(iter_table_cells(self.doc))
+            self._inner = None
+        return self._cells
+
+    @property
+    def tables(self):
+        return self.doc.tables
+
+    def __len__(self):
+        return len(self.paragraphs)
+
+    def text(self, i):
+        return self._paragraphText(self.paragraphs[i])
+
+    def _paragraphText(self, p):
+        text = self._texts.get(p._p)
+        if text is None:
+            # -- same text as `p.text`, read from the lxml element without python-docx' XPath per run --
+            text = self._texts[p._p] = docx_xml.paragraphText(p._p)
+        return text
+
+    def cellText(self, i):
+        return self._cellText(self.cells[i])
+
+    def _cellText(self, cell):
+        text = self._cellTexts.get(cell._tc)
+        if text is None:
+            text = self._cellTexts[cell._tc] = docx_xml.cellText(cell._tc)
+        return text
+
+    def outerText(self):
+        """`extractOuterDocText` of the document, rebuilt only from dirty paragraphs."""
+        paragraphs = self.paragraphs
+        if self._outer is None:
+            texts = [self._paragraphText(p) for p in paragraphs]
+            self._outer = "".join(texts)
+            self._ends = list(itertools.accumulate(map(len, texts)))
+        return self._outer
+
+    @property
+    def ends(self):
+        """Cumulative end offsets of the paragraph texts within `outerText`."""
+        self.outerText()
+        return self._ends
+
+    def locate(self, offset):
+        """Return `(paragraph index, offset in paragraph)` for a global `offset` into `outerText`, or None if out of bounds."""
+        ends = self.ends
+        if offset < 0 or not ends or offset >= ends[-1]:
+            return None
+        i = bisect_right(ends, offset)
+        return i, offset - self.start(i)
+
+    def locateInsert(self, offset):
+        """Like `locate`, but the end of a paragraph (and of the text) belongs to the preceding paragraph."""
+        ends = self.ends
+        i = bisect_left(ends, offset)
+        if offset < 0 or i == len(ends):
+            return None
+        return i, offset - self.start(i)
+
+    def start(self, i):
+        """Global offset of the first character of paragraph `i`."""
+        return self.ends[i - 1] if i > 0 else 0
+
+    def offset(self, paraIdx, pos):
+        """Global offset of position `pos` in paragraph `paraIdx`."""
+        return self.start(paraIdx) + pos
+
+    def innerText(self):
+        """`extractInnerDocText` of the document, rebuilt only from dirty cells."""
+        cells = self.cells
+        if self._inner is None:
+            self._inner = "".join([self._cellText(cell) + "\n" for cell in cells])
+        return self._inner
+
+    def invalidate(self):
+        self._paragraphs = None
+        self._texts.clear()
+        self._cells = None
+        self._cellTexts.clear()
+        self._outer = None
+        self._inner = None
+
+
+def asView(doc):
+    return doc if isinstance(doc, DocumentView) else DocumentView(doc)
+
+
+def findRunIndex(pos, para):
+    location = getRunIndex(para).locate(pos)
+    return None if location is None else location[0]
+
+
+def findPosInRun(pos, para):
+    location = getRunIndex(para).locate(pos)
+    return None if location is None else location[1]
+
+
+def insertStrIntoPara(para, str, pos):
+    if _insertText(para, getRunIndex(para), str, pos):
+        paragraphChanged(para)
     return para
 
 
-def removeTextSegment(para, start, end):
-    if start < 0 or start > len(para.text) or end < 0 or end > len(para.text):
-        return None
+def _insertText(para, index, text, pos):
+    """`insertStrIntoPara` against `index`, without dropping any cache; returns whether `para` changed."""
+    if len(index.runs) == 0:
+        para.text = para.text[:pos] + text + para.text[pos:]
+        return True
 
-    r_start = findRunIndex(start, para)
-    r_finish = findRunIndex(end, para)
+    location = index.locateInsert(pos)
+    if location is None:
+        return False
 
-    if r_start == None or r_finish == None:
-        return None
+    from docx.text.run import Run
 
-    a = -1
-    o = -1
-    arr = []
+    i, insert_position = location
+    r = Run(index.runs[i], para)
+    r.text = r.text[:insert_position] + text + r.text[insert_position:]
+    return True
 
-    for i in range(r_start, r_finish + 1):
-        run = para.runs[i]
 
-        if i == r_start:
-            a = findPosInRun(start, para)
-        if i == r_finish:
-            o = findPosInRun(end, para)
-        if i > r_start and i < r_finish:
-            arr.append(run)
+def removeTextSegment(para, start, end):
+    return deleteTextRange(para, start, end)
 
-    if r_start == r_finish:
-        para.runs[r_start].text = (
-            para.runs[r_start].text[:a] + para.runs[r_finish].text[o + 1 :]
-        )
-    else:
-        para.runs[r_start].text = para.runs[r_start].text[:a]
-        para.runs[r_finish].text = para.runs[r_finish].text[o + 1 :]
-    for run in reversed(arr):
-        deleteTextRun(run, para)
 
+def cloneRunSlices(para, start, end):
+    """
+    Return new `w:r` elements holding the characters `start` to `end` (inclusive) of
+    `para`, one per source run touched, each with a copy of that run's `w:rPr`. The
+    source runs are visited once and only their needed slices are copied.
+    """
+    index = getRunIndex(para)
+    start_location = index.locate(start)
+    end_location = index.locate(end)
+    if start_location is None or end_location is None:
+        return []
+
+    from docx.oxml import OxmlElement
+
+    r_start, a = start_location
+    r_finish, o = end_location
+    clones = []
+    for i in range(r_start, r_finish + 1):
+        r = index.runs[i]
+        if i != r_start and i != r_finish:
+            if index.ends[i] == index.start(i):
+                continue
+            # -- a whole run: copy it and keep only formatting and text content --
+            clone = copy.deepcopy(r)
+            for child in list(clone):
+                if child.tag not in _RUN_CONTENT:
+                    clone.remove(child)
+        else:
+            text = r.text[a if i == r_start else 0 : o + 1 if i == r_finish else None]
+            if not text:
+                continue
+            clone = OxmlElement("w:r")
+            if r.rPr is not None:
+                clone.append(copy.deepcopy(r.rPr))
+            clone.text = text
+        clones.append(clone)
+    return clones
+
+
+def insertRunElements(para, runs, pos=None):
+    """
+    Insert the `w:r` elements `runs` into `para` at text position `pos`, splitting the
+    run at that position if needed; `pos=None` appends them. The runs may come from
+    another paragraph or document. Returns None if `pos` is out of bounds.
+    """
+    if not runs:
+        return para
+    p = para._p
+    index = getRunIndex(para)
+    location = None if pos is None or not index.runs else index.locateInsert(pos)
+
+    if location is None:
+        if pos is not None and pos != index.length:
+            return None
+        anchor = index.runs[-1] if index.runs and pos is not None else None
+        for r in runs:
+            if anchor is None:
+                p.append(r)
+            else:
+                anchor.addnext(r)
+            anchor = r
+    else:
+        i, offset = location
+        target = index.runs[i]
+        if offset == 0:
+            for r in runs:
+                target.addprevious(r)
+        else:
+            text = target.text
+            if offset < len(text):
+                tail = copy.deepcopy(target)
+                tail.text = text[offset:]
+                target.text = text[:offset]
+                target.addnext(tail)
+            anchor = target
+            for r in runs:
+                anchor.addnext(r)
+                anchor = r
+
+    paragraphChanged(para)
     return para
 
 
 def copyTextSegment(srcPara, destPara, start, end, insPos=0):
-    text_to_copy = ""
-    if start < 0 or end > len(srcPara.text):
+    """
+    Copy the characters `start` to `end` (inclusive) of `srcPara` to position `insPos`
+    of `destPara`, keeping the formatting of every source run. `destPara` may be in
+    another document. Linear in the size of both paragraphs.
+    """
+    length = getRunIndex(srcPara).length
+    if start < 0 or end > length:
         return
+    return insertRunElements(destPara, cloneRunSlices(srcPara, start, min(end, length - 1)), insPos)
 
-    for i in range(start, end + 1):
-        if i < len(srcPara.text):
-            text_to_copy += srcPara.text[i]
 
-    insertStrIntoPara(destPara, text_to_copy, insPos)
-
-
-def moveTextSegment(srcPara, destPara, start, end):
-    copyTextSegment(srcPara, destPara, start, end)
+def moveTextSegment(srcPara, destPara, start, end, insPos=0):
+    """
+    Move the characters `start` to `end` (inclusive) of `srcPara` to position `insPos`
+    of `destPara` with their formatting. When both are the same paragraph, `insPos`
+    refers to the text before the move.
+    """
+    length = getRunIndex(srcPara).length
+    if start < 0 or end > length:
+        return
+    end = min(end, length - 1)
+    runs = cloneRunSlices(srcPara, start, end)
     removeTextSegment(srcPara, start, end)
+    if srcPara._p is destPara._p and insPos > start:
+        insPos -= min(insPos, end + 1) - start
+    return insertRunElements(destPara, runs, insPos)
 
 
 def replaceDocTextSegment(doc, startParaIdx, endParaIdx, start, end, txt):
+    replaceParagraphsSegment(asView(doc).paragraphs, startParaIdx, endParaIdx, start, end, txt)
+
+
+def replaceParagraphsSegment(paragraphs, startParaIdx, endParaIdx, start, end, txt):
+    """
+    `replaceDocTextSegment` on an already materialized paragraph list. Paragraphs
+    deleted by the edit stay in `paragraphs` as detached objects, so indices before
+    `endParaIdx` keep referring to the same paragraphs.
+    """
+    para = paragraphs[startParaIdx]
+    index = getRunIndex(para)
     if startParaIdx == endParaIdx:
-        removeTextSegment(doc.paragraphs[startParaIdx], start, end)
+        _replaceInParagraph(para, index, start, end, txt)
     else:
-        p = doc.paragraphs[startParaIdx]
-        removeTextSegment(p, start, len(p.text) - 1)
+        _deleteRange(para, index, start, index.length - 1)
 
-        for _ in range(startParaIdx + 1, endParaIdx):
-            p = doc.paragraphs[startParaIdx + 1]
-            deletePara(p)
+        for i in range(startParaIdx + 1, endParaIdx):
+            deletePara(paragraphs[i])
 
-        p = doc.paragraphs[startParaIdx + 1]
-        removeTextSegment(p, 0, end)
+        removeTextSegment(paragraphs[endParaIdx], 0, end)
+        _insertText(para, index, txt, start)
+    paragraphChanged(para)
 
-    insertStrIntoPara(doc.paragraphs[startParaIdx], txt, start)
+
+def _replaceInParagraph(para, index, start, end, txt):
+    # -- deleting leaves `index` valid up to `start`, where the text is inserted --
+    if _deleteRange(para, index, start, end) is None and end < start:
+        raise ValueError(f"span {start}:{end} ends before it starts or is out of bounds")
+    _insertText(para, index, txt, start)
+
+
+class EditBatch:
+    """
+    Collects many `replaceDocTextSegment` edits and applies them in one right-to-left
+    pass over a single paragraph list, so the offsets of edits further left stay valid.
+    Edits are given in the coordinates of the unedited document and must not overlap.
+    """
+
+    def __init__(self, edits=()):
+        self.edits = []
+        for edit in edits:
+            self.replace(*edit)
+
+    def __len__(self):
+        return len(self.edits)
+
+    def replace(self, startParaIdx, endParaIdx, start, end, txt):
+        if startParaIdx > endParaIdx or (startParaIdx == endParaIdx and start > end + 1):
+            raise ValueError("edit ends before it starts")
+        self.edits.append((startParaIdx, endParaIdx, start, end, txt))
+        return self
+
+    def sorted(self, paragraphCount=None):
+        """Return the edits ordered by position; raises ValueError on overlaps or bad indices."""
+        edits = sorted(self.edits, key=lambda e: (e[0], e[2]))
+        previous = None
+        for edit in edits:
+            startParaIdx, endParaIdx, start, end, _ = edit
+            if startParaIdx < 0 or start < 0 or end < -1:
+                raise ValueError(f"negative position in edit {edit[:4]}")
+            if paragraphCount is not None and endParaIdx >= paragraphCount:
+                raise ValueError(f"paragraph index out of bounds in edit {edit[:4]}")
+            if previous is not None and (previous[1], previous[3]) >= (startParaIdx, start):
+                raise ValueError(f"edit {edit[:4]} overlaps edit {previous[:4]}")
+            previous = edit
+        return edits
+
+    def apply(self, doc):
+        paragraphs = asView(doc).paragraphs
+        para = index = None
+        with runIndexCache():
+            try:
+                for edit in reversed(self.sorted(len(paragraphs))):
+                    startParaIdx, endParaIdx, start, end, txt = edit
+                    if startParaIdx != endParaIdx:
+                        if para is not None:
+                            paragraphChanged(para)
+                            para = None
+                        replaceParagraphsSegment(paragraphs, *edit)
+                        continue
+                    if paragraphs[startParaIdx] is not para:
+                        if para is not None:
+                            paragraphChanged(para)
+                        para = paragraphs[startParaIdx]
+                        index = RunIndex(para._p)
+                    # -- edits run right to left, so one index serves all edits of a paragraph --
+                    _replaceInParagraph(para, index, start, end, txt)
+            finally:
+                if para is not None:
+                    paragraphChanged(para)
+        self.edits = []
+        return doc
 
 
 def extractTextBetween(doc, startParaIdx, endParaIdx, start, end):
-    if startParaIdx < 0 or startParaIdx >= len(doc.paragraphs):
+    view = asView(doc)
+    if startParaIdx < 0 or startParaIdx >= len(view):
         raise ValueError("p_start is out of bounds")
-    if endParaIdx < 0 or endParaIdx >= len(doc.paragraphs):
+    if endParaIdx < 0 or endParaIdx >= len(view):
         raise ValueError("p_end is out of bounds")
 
     if startParaIdx == endParaIdx:
-        return doc.paragraphs[startParaIdx].text[start:end]
+        return view.text(startParaIdx)[start:end]
 
     string_parts = []
     for i in range(startParaIdx, endParaIdx + 1):
-        p_text = doc.paragraphs[i].text
+        p_text = view.text(i)
         if i == startParaIdx:
             string_parts.append(p_text[start:])
         elif i == endParaIdx:
@@ -246,3 +800,112 @@ def extractTextBetween(doc, startParaIdx, endParaIdx, start, end):
             string_parts.append(p_text)
 
     return "".join(string_parts)
+
+
+def extractTextByOffsets(doc, start, end):
+    """The text between the global offsets `start` and `end` (exclusive) of `extractOuterDocText(doc)`."""
+    return asView(doc).outerText()[start:end]
+
+
+def replaceDocTextByOffsets(doc, start, end, txt):
+    """
+    `replaceDocTextSegment` addressed by global offsets into `extractOuterDocText(doc)`:
+    the characters from `start` to `end` (exclusive) are replaced by `txt`; with
+    `start == end` the text is inserted. Pass a `DocumentView` to reuse its offset
+    index across edits; the index updates itself after every edit.
+    """
+    view = asView(doc)
+    if start > end:
+        raise ValueError("range ends before it starts")
+    if start == end:
+        location = view.locateInsert(start)
+        if location is None:
+            raise ValueError(f"offset {start} is out of bounds")
+        insertStrIntoPara(view.paragraphs[location[0]], txt, location[1])
+        return
+    first = view.locate(start)
+    last = view.locate(end - 1)
+    if first is None or last is None:
+        raise ValueError(f"range {start}:{end} is out of bounds")
+    replaceParagraphsSegment(view.paragraphs, first[0], last[0], first[1], last[1], txt)
+
+
+def _mergeKey(r):
+    """Hashable form of the `w:rPr` of `r`, or None if the run holds anything but text content."""
+    key = ()
+    for child in r:
+        tag = child.tag
+        if tag == _RPR:
+            key = tuple((c.tag, etree.tostring(c) if len(c) else tuple(c.items())) for c in child)
+        elif tag not in _MERGEABLE:
+            return None
+    return key
+
+
+def _appendRunContent(target, r):
+    last = target[-1] if len(target) else None
+    for child in list(r):
+        if child.tag == _RPR:
+            continue
+        if child.tag == _T and last is not None and last.tag == _T:
+            last.text = (last.text or "") + (child.text or "")
+            last.set(_XML_SPACE, "preserve")
+        else:
+            target.append(child)
+            last = child
+
+
+def normalize_runs(doc_or_para, strip_rsid=False, strip_proof_errors=False):
+    """
+    Merge adjacent runs with identical formatting in a document, view, cell or
+    paragraph and return the number of runs removed. Only runs holding nothing but
+    text, tabs and breaks are merged. With `strip_rsid` the revision save ids are
+    dropped from all elements, with `strip_proof_errors` the spell-check markers
+    between runs are removed, so more runs become adjacent. Run objects obtained
+    before may refer to removed runs afterwards.
+    """
+    node = doc_or_para.doc if isinstance(doc_or_para, DocumentView) else doc_or_para
+    root = getattr(node, "_element", None)
+    if root is None or root.tag not in (_P, _TC):
+        root = node.element.body
+
+    if strip_proof_errors:
+        for proofErr in list(root.iter(_PROOF_ERR)):
+            proofErr.getparent().remove(proofErr)
+    if strip_rsid:
+        for element in _withRsid(root):
+            for name in [name for name in element.attrib if name.startswith(_RSID)]:
+                del element.attrib[name]
+
+    removed = 0
+    touched = set()
+    lastRun = lastKey = None
+    for r in list(root.iter(_R)):
+        key = _mergeKey(r)
+        prev = r.getprevious()
+        if key is not None and prev is not None and prev is lastRun and lastKey == key:
+            _appendRunContent(prev, r)
+            parent = r.getparent()
+            parent.remove(r)
+            touched.add(parent if parent.tag == _P else next(parent.iterancestors(_P), None))
+            removed += 1
+            continue
+        lastRun, lastKey = r, key
+
+    for p in touched:
+        _dropRunIndex(p)
+    return removed
+
+
+if os.environ.get("DOCX_TOOLS_PROFILE"):
+    import docx_profile
+
+    docx_profile.instrument(__name__)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from docx_extract import main
+
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Long-running worker for many small docx_tools jobs, usable as
+`python -m docx_tools serve [--socket PATH]`.
+
+The worker imports python-docx once and keeps recently used documents parsed in a
+`TemplateCache`, so a job costs only the edit itself instead of interpreter
+start-up, imports and parsing. Jobs are JSON objects, one per line, read from
+stdin or from the connections of a Unix socket; one JSON result line is written
+back per job as soon as it is done:
+
+    {"id": 1, "op": "extract", "path": "a.docx"}
+    {"id": 2, "op": "replace", "path": "a.docx", "out": "b.docx", "edits": [[0, 0, 0, 4, "Dear"]]}
+    {"id": 3, "op": "insert", "path": "a.docx", "out": "b.docx", "para": 2, "pos": 0, "text": "NEW "}
+    {"id": 4, "op": "copy", "path": "a.docx", "out": "b.docx", "src": 0, "dest": 3, "start": 0, "end": 4, "pos": 0}
+
+    {"id": 1, "ok": true, "result": "...", "seconds": 0.000412}
+    {"id": 2, "ok": false, "error": "ValueError: p_end is out of bounds", "seconds": 0.000031}
+
+Editing jobs work on the cached document, save it to `out` with
+`docx_zip.fastSave` and then put back copies of the paragraphs they changed, so
+the next job sees the file as it is on disk. A cached document is reloaded when
+the file's size or modification time changes.
+"""
+
+import copy
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import docx_tools
+from docx_xml import documentPartName
+from docx_zip import fastSave, openDocument
+
+# -- a parsed lxml tree takes a few times the size of its XML --
+TREE_FACTOR = 4
+
+
+class Template:
+    """A parsed document whose edits can be rolled back."""
+
+    def __init__(self, path):
+        self.path = path
+        self.doc = openDocument(path)
+        self.view = docx_tools.DocumentView(self.doc)
+        self.size = estimateSize(path)
+
+    @contextmanager
+    def editing(self, first, last):
+        """
+        Let the enclosed block change paragraphs `first` to `last` (and what lies
+        between them), then put back copies of the original elements. Only the edited
+        region is copied, which is far cheaper than copying or re-parsing the body.
+        """
+        paragraphs = self.view.paragraphs
+        last = min(last, len(paragraphs) - 1)
+        body = self.doc.element.body
+        lo = body.index(paragraphs[first]._p)
+        hi = body.index(paragraphs[last]._p) + 1
+        saved = [copy.deepcopy(e) for e in body[lo:hi]]
+        size = len(body)
+        try:
+            yield self.view
+        finally:
+            body[lo : hi + len(body) - size] = saved
+            docx_tools.paragraphsChanged(body)
+
+
+def estimateSize(path):
+    """Approximate memory taken by the parsed document `path`: its parts plus the main part's tree."""
+    with zipfile.ZipFile(path) as zf:
+        main = zf.getinfo(documentPartName(zf)).file_size
+        return sum(info.file_size for info in zf.infolist()) + TREE_FACTOR * main
+
+
+class TemplateCache:
+    """Parsed documents by path, least recently used evicted first once they take more than `maxBytes`."""
+
+    def __init__(self, maxBytes=256 << 20):
+        self.maxBytes = maxBytes
+        self.size = 0
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return os.path.abspath(path) in self._entries
+
+    def get(self, path):
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            self._discard(key)
+        self.misses += 1
+        template = Template(key)
+        self._entries[key] = (stamp, template)
+        self.size += template.size
+        # -- the newest entry is kept even if it alone exceeds the budget --
+        while self.size > self.maxBytes and len(self._entries) > 1:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+        return template
+
+    def _discard(self, key):
+        _, template = self._entries.pop(key)
+        self.size -= template.size
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self):
+        return {
+            "documents": len(self), "bytes": self.size, "maxBytes": self.maxBytes,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+        }
+
+
+def _extract(view, job):
+    if "start" in job:
+        return docx_tools.extractTextByOffsets(view, job["start"], job["end"])
+    what = job.get("what", "combined")
+    if what == "outer":
+        return view.outerText()
+    if what == "inner":
+        return view.innerText()
+    if what == "combined":
+        return view.outerText() + view.innerText()
+    raise ValueError(f"unknown text {what!r}")
+
+
+def _replace(view, job):
+    docx_tools.EditBatch(job["edits"]).apply(view)
+
+
+def _insert(view, job):
+    docx_tools.insertStrIntoPara(view.paragraphs[job["para"]], job["text"], job["pos"])
+
+
+def _copy(view, job):
+    paragraphs = view.paragraphs
+    docx_tools.copyTextSegment(
+        paragraphs[job["src"]], paragraphs[job["dest"]], job["start"], job["end"], job.get("pos", 0)
+    )
+
+
+OPERATIONS = {"extract": _extract, "replace": _replace, "insert": _insert, "copy": _copy}
+
+# -- paragraph range each edit may change --
+EDITS = {
+    "replace": lambda job: (min(e[0] for e in job["edits"]), max(e[1] for e in job["edits"])),
+    "insert": lambda job: (job["para"], job["para"]),
+    "copy": lambda job: (job["dest"], job["dest"]),
+}
+
+
+class Worker:
+    """Runs jobs against a `TemplateCache`; jobs are executed one at a time."""
+
+    def __init__(self, maxBytes=256 << 20):
+        self.cache = TemplateCache(maxBytes)
+        self._lock = threading.Lock()
+
+    def run(self, job):
+        """Execute one job dict and return its result record; never raises."""
+        start = time.perf_counter()
+        record = {"id": job.get("id") if isinstance(job, dict) else None}
+        try:
+            record["ok"], record["result"] = True, self._run(job)
+        except Exception as e:
+            record["ok"], record["error"] = False, f"{type(e).__name__}: {e}"
+        record["seconds"] = round(time.perf_counter() - start, 6)
+        return record
+
+    def _run(self, job):
+        if not isinstance(job, dict):
+            raise ValueError("a job must be a JSON object")
+        op = job.get("op")
+        if op == "stats":
+            return self.cache.stats()
+        operation = OPERATIONS.get(op)
+        if operation is None:
+            raise ValueError(f"unknown op {op!r}")
+        if op in EDITS and not job.get("out"):
+            raise ValueError(f"{op} needs `out`")
+        with self._lock:
+            template = self.cache.get(job["path"])
+            if op not in EDITS:
+                return operation(template.view, job)
+            with template.editing(*EDITS[op](job)) as view:
+                operation(view, job)
+                fastSave(template.doc, job["out"])
+            return job["out"]
+
+    def serveLines(self, lines, out):
+        """Run a job per JSONL line of `lines` and write the result lines to `out`; returns the job count."""
+        count = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                record = {"id": None, "ok": False, "error": f"invalid JSON: {e}"}
+            else:
+                record = self.run(job)
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            count += 1
+        return count
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        reader = (line.decode("utf-8") for line in self.rfile)
+        writer = _TextWriter(self.wfile)
+        self.server.worker.serveLines(reader, writer)
+
+
+class _TextWriter:
+    def __init__(self, raw):
+        self.raw = raw
+
+    def write(self, text):
+        self.raw.write(text.encode("utf-8"))
+
+    def flush(self):
+        self.raw.flush()
+
+
+class WorkerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server; every connection is a JSONL job stream served by one shared `Worker`."""
+
+    daemon_threads = True
+
+    def __init__(self, path, worker=None):
+        if os.path.exists(path):
+            os.unlink(path)
+        self.worker = worker or Worker()
+        super().__init__(path, _Handler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+def serve(socketPath=None, maxBytes=256 << 20):
+    """Serve jobs from stdin, or from the Unix socket `socketPath` until interrupted."""
+    worker = Worker(maxBytes)
+    if socketPath is None:
+        worker.serveLines(sys.stdin, sys.stdout)
+        return
+    with WorkerServer(socketPath, worker) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    from docx_extract import main
+
+    sys.exit(main(["serve", *sys.argv[1:]]))
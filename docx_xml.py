@@ -0,0 +1,221 @@
+"""
+Text extraction straight from the main document part of a .docx file.
+
+The functions in this module open the zip archive, parse only `word/document.xml`
+with lxml and walk the raw `w:` elements. No python-docx objects are created, but
+the output is identical to `extractOuterDocText`, `extractInnerDocText` and
+`combineDocText` in docx_tools.
+"""
+
+import itertools
+import posixpath
+from collections import namedtuple
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_DOCUMENT = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+DOCUMENT_PART = "word/document.xml"
+
+
+def qn(tag):
+    return "{%s}%s" % (W_NS, tag)
+
+
+_BODY = qn("body")
+_P = qn("p")
+_R = qn("r")
+_T = qn("t")
+_BR = qn("br")
+_HYPERLINK = qn("hyperlink")
+_TBL = qn("tbl")
+_TR = qn("tr")
+_TC = qn("tc")
+_TRPR = qn("trPr")
+_TCPR = qn("tcPr")
+_GRID_BEFORE = qn("gridBefore")
+_GRID_SPAN = qn("gridSpan")
+_VMERGE = qn("vMerge")
+_VAL = qn("val")
+_TYPE = qn("type")
+
+CellPath = namedtuple("CellPath", "table row col depth")
+CellPath.__doc__ = """
+Position of a table cell: `table` numbers the tables of the document in document
+order (nested tables included), `row` is the row index, `col` the grid column the
+cell starts in and `depth` the nesting level, 0 for tables directly in the body.
+"""
+
+# -- run content elements with a fixed text equivalent, as in python-docx --
+_RUN_CHARS = {
+    qn("tab"): "\t",
+    qn("ptab"): "\t",
+    qn("cr"): "\n",
+    qn("noBreakHyphen"): "-",
+}
+
+# -- same settings python-docx uses, so whitespace handling is identical --
+_parser = etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+
+
+def documentPartName(zf):
+    """Name of the main document part, resolved through `_rels/.rels`."""
+    try:
+        rels = etree.fromstring(zf.read("_rels/.rels"), _parser)
+    except KeyError:
+        return DOCUMENT_PART
+    for rel in rels.iterchildren("{%s}Relationship" % REL_NS):
+        if rel.get("Type") == OFFICE_DOCUMENT and rel.get("TargetMode") != "External":
+            return posixpath.normpath(rel.get("Target").lstrip("/"))
+    return DOCUMENT_PART
+
+
+def readDocumentXml(src):
+    """Return the raw bytes of the main document part of `src` (a path or file object)."""
+    import zipfile
+
+    with zipfile.ZipFile(src) as zf:
+        return zf.read(documentPartName(zf))
+
+
+def parseDocumentXml(xml):
+    return etree.fromstring(xml, _parser)
+
+
+def loadBody(src):
+    """
+    Parse the main document part of `src` and return its `w:body` element; an
+    already parsed element is returned as is.
+    """
+    if etree.iselement(src):
+        return src
+    body = parseDocumentXml(readDocumentXml(src)).find(_BODY)
+    if body is None:
+        raise ValueError("document part has no w:body element")
+    return body
+
+
+def runText(r):
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == _T:
+            parts.append(child.text or "")
+        elif tag == _BR:
+            if child.get(_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            char = _RUN_CHARS.get(tag)
+            if char is not None:
+                parts.append(char)
+    return "".join(parts)
+
+
+def paragraphText(p):
+    parts = []
+    for child in p:
+        tag = child.tag
+        if tag == _R:
+            parts.append(runText(child))
+        elif tag == _HYPERLINK:
+            for r in child.iterchildren(_R):
+                parts.append(runText(r))
+    return "".join(parts)
+
+
+def cellText(tc):
+    return "\n".join(paragraphText(p) for p in tc.iterchildren(_P))
+
+
+def _intVal(parent, tag, default):
+    if parent is None:
+        return default
+    child = parent.find(tag)
+    if child is None:
+        return default
+    return int(child.get(_VAL))
+
+
+def gridSpan(tc):
+    return _intVal(tc.find(_TCPR), _GRID_SPAN, 1)
+
+
+def _gridBefore(tr):
+    return _intVal(tr.find(_TRPR), _GRID_BEFORE, 0)
+
+
+def _vMerge(tc):
+    tcPr = tc.find(_TCPR)
+    if tcPr is None:
+        return None
+    vMerge = tcPr.find(_VMERGE)
+    if vMerge is None:
+        return None
+    return vMerge.get(_VAL, "continue")
+
+
+def _tableCells(tbl, index, depth):
+    for row, tr in enumerate(tbl.iterchildren(_TR)):
+        col = _gridBefore(tr)
+        for tc in tr.iterchildren(_TC):
+            if _vMerge(tc) != "continue":
+                yield tc, CellPath(index, row, col, depth)
+            col += gridSpan(tc)
+
+
+def iter_table_cells(node, paths=False):
+    """
+    Yield every physical `w:tc` of the (nested) tables below `node` once, in document
+    order with each cell followed by the tables nested in it. Horizontally merged
+    cells are one element anyway; the continuation cells of a vertical merge are
+    skipped. With `paths` the items are `(tc, CellPath)` pairs. The walk uses an
+    explicit stack, so nesting depth is not limited by the recursion limit.
+    """
+    tables = itertools.count()
+
+    def cellsOf(container, depth):
+        for tbl in container.iterchildren(_TBL):
+            yield from _tableCells(tbl, next(tables), depth)
+
+    stack = [cellsOf(node, 0)]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+        tc, path = item
+        yield item if paths else tc
+        if tc.find(_TBL) is not None:
+            stack.append(cellsOf(tc, path.depth + 1))
+
+
+def iter_outer_doc_text(src):
+    for p in loadBody(src).iterchildren(_P):
+        yield paragraphText(p)
+
+
+def iter_table_texts(node):
+    for tc in iter_table_cells(node):
+        yield cellText(tc)
+        yield "\n"
+
+
+def iter_doc_text(src):
+    body = loadBody(src)
+    yield from iter_outer_doc_text(body)
+    yield from iter_table_texts(body)
+
+
+def extractOuterDocText(src):
+    return "".join(iter_outer_doc_text(src))
+
+
+def extractInnerDocText(src):
+    return "".join(iter_table_texts(loadBody(src)))
+
+
+def combineDocText(src):
+    return "".join(iter_doc_text(src))
@@ -0,0 +1,303 @@
+"""
+Zip level helpers for .docx packages.
+
+`readRawEntries` returns the still compressed bytes of every zip entry and
+`RawZipWriter` writes such entries back verbatim, so unchanged parts (images,
+fonts, styles) are never inflated or recompressed. Only parts that really
+changed are compressed again; `openDocument` / `fastSave` apply this to
+python-docx documents.
+"""
+
+import fnmatch
+import struct
+import time
+import weakref
+import zipfile
+import zlib
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_DIR = struct.Struct("<4s4B4HL2L5H2L")
+_END_OF_CENTRAL_DIR = struct.Struct("<4s4H2LH")
+_LOCAL_SIGNATURE = b"PK\003\004"
+_CENTRAL_SIGNATURE = b"PK\001\002"
+_END_SIGNATURE = b"PK\005\006"
+_UTF8_FLAG = 0x800
+_ENCRYPTED_FLAG = 0x1
+_VERSION = 20
+_LIMIT = 0xFFFFFFFF
+
+
+class RawEntry:
+    """A zip entry with its compressed data exactly as stored in the archive."""
+
+    __slots__ = ("name", "compressType", "crc", "compressSize", "fileSize", "dateTime", "externalAttr", "data")
+
+    def __init__(self, name, compressType, crc, compressSize, fileSize, dateTime, externalAttr, data):
+        self.name = name
+        self.compressType = compressType
+        self.crc = crc
+        self.compressSize = compressSize
+        self.fileSize = fileSize
+        self.dateTime = dateTime
+        self.externalAttr = externalAttr
+        self.data = data
+
+    @classmethod
+    def fromBytes(cls, name, data, level=6, dateTime=None, externalAttr=0o600 << 16):
+        """Compress `data` with deflate at `level`; level 0 stores it uncompressed."""
+        if level == 0:
+            compressType, compressed = zipfile.ZIP_STORED, data
+        else:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+            compressType, compressed = zipfile.ZIP_DEFLATED, compressor.compress(data) + compressor.flush()
+        return cls(
+            name,
+            compressType,
+            zlib.crc32(data),
+            len(compressed),
+            len(data),
+            dateTime or time.localtime()[:6],
+            externalAttr,
+            compressed,
+        )
+
+    def inflate(self):
+        """Return the uncompressed content."""
+        if self.compressType == zipfile.ZIP_STORED:
+            return self.data
+        if self.compressType == zipfile.ZIP_DEFLATED:
+            return zlib.decompress(self.data, -15)
+        raise ValueError(f"unsupported compression method {self.compressType} for {self.name}")
+
+
+def iterRawEntries(src, names=None):
+    """Yield a `RawEntry` for every entry of the zip `src` (or only for `names`), in archive order."""
+    with zipfile.ZipFile(src) as zf:
+        fp = zf.fp
+        for info in zf.infolist():
+            if names is not None and info.filename not in names:
+                continue
+            if info.flag_bits & _ENCRYPTED_FLAG:
+                raise ValueError(f"encrypted zip entry {info.filename}")
+            fp.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+            if header[0] != _LOCAL_SIGNATURE:
+                raise zipfile.BadZipFile(f"bad local file header for {info.filename}")
+            fp.seek(header[10] + header[11], 1)
+            yield RawEntry(
+                info.filename,
+                info.compress_type,
+                info.CRC,
+                info.compress_size,
+                info.file_size,
+                info.date_time,
+                info.external_attr,
+                fp.read(info.compress_size),
+            )
+
+
+def readRawEntries(src, names=None):
+    return list(iterRawEntries(src, names))
+
+
+def readDirectory(src):
+    """
+    `{name: (crc, compressSize, fileSize)}` for the entries of the zip `src`, read
+    straight from the central directory with two reads and no zipfile objects.
+    Zip64 archives and archives with data in front fall back to zipfile.
+    """
+    if not hasattr(src, "read"):
+        with open(src, "rb") as fp:
+            return readDirectory(fp)
+    end = src.seek(0, 2)
+    # -- the end record is usually the last 22 bytes; only a long archive comment needs the slow search --
+    for tail in (min(end, 1024), min(end, _END_OF_CENTRAL_DIR.size + 0xFFFF)):
+        src.seek(end - tail)
+        data = src.read(tail)
+        pos = data.rfind(_END_SIGNATURE)
+        if pos >= 0 and pos + _END_OF_CENTRAL_DIR.size <= len(data):
+            break
+    else:
+        raise zipfile.BadZipFile("end of central directory not found")
+    _, _, _, _, count, size, offset, _ = _END_OF_CENTRAL_DIR.unpack_from(data, pos)
+    src.seek(offset)
+    directory = src.read(size) if offset + size <= end else b""
+    if count == 0xFFFF or offset == _LIMIT or not directory.startswith(_CENTRAL_SIGNATURE):
+        src.seek(0)
+        with zipfile.ZipFile(src) as zf:
+            return {info.filename: (info.CRC, info.compress_size, info.file_size) for info in zf.infolist()}
+
+    entries = {}
+    pos = 0
+    for _ in range(count):
+        record = _CENTRAL_DIR.unpack_from(directory, pos)
+        if record[0] != _CENTRAL_SIGNATURE:
+            raise zipfile.BadZipFile("bad central directory record")
+        start = pos + _CENTRAL_DIR.size
+        name = directory[start : start + record[12]]
+        name = name.decode("utf-8" if record[5] & _UTF8_FLAG else "cp437")
+        entries[name] = (record[9], record[10], record[11])
+        pos = start + record[12] + record[13] + record[14]
+    return entries
+
+
+def _dosDateTime(dt):
+    return (dt[0] - 1980) << 9 | dt[1] << 5 | dt[2], dt[3] << 11 | dt[4] << 5 | (dt[5] // 2)
+
+
+class RawZipWriter:
+    """Write `RawEntry` objects to `fp` (a path or binary file object) without recompressing them."""
+
+    def __init__(self, fp):
+        self._own = isinstance(fp, (str, bytes)) or hasattr(fp, "__fspath__")
+        self.fp = open(fp, "wb") if self._own else fp
+        self.start = self.fp.tell()
+        self.central = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, entry):
+        if entry.compressSize > _LIMIT or entry.fileSize > _LIMIT:
+            raise ValueError(f"zip entry {entry.name} needs zip64, which is not supported")
+        try:
+            name = entry.name.encode("ascii")
+            flags = 0
+        except UnicodeEncodeError:
+            name = entry.name.encode("utf-8")
+            flags = _UTF8_FLAG
+        date, dostime = _dosDateTime(entry.dateTime)
+        offset = self.fp.tell() - self.start
+
+        self.fp.write(
+            _LOCAL_HEADER.pack(
+                _LOCAL_SIGNATURE, _VERSION, 0, flags, entry.compressType, dostime, date,
+                entry.crc, entry.compressSize, entry.fileSize, len(name), 0,
+            )
+        )
+        self.fp.write(name)
+        self.fp.write(entry.data)
+        self.central.append(
+            _CENTRAL_DIR.pack(
+                _CENTRAL_SIGNATURE, _VERSION, 0, _VERSION, 0, flags, entry.compressType, dostime, date,
+                entry.crc, entry.compressSize, entry.fileSize, len(name), 0, 0, 0, 0,
+                entry.externalAttr, offset,
+            )
+            + name
+        )
+
+    def close(self):
+        if self.fp is None:
+            return
+        offset = self.fp.tell() - self.start
+        size = 0
+        for record in self.central:
+            self.fp.write(record)
+            size += len(record)
+        count = len(self.central)
+        self.fp.write(_END_OF_CENTRAL_DIR.pack(_END_SIGNATURE, 0, 0, count, count, size, offset, 0))
+        if self._own:
+            self.fp.close()
+        self.fp = None
+
+
+# -- fast save of python-docx documents ---------------------------------------------------
+
+_snapshots = weakref.WeakKeyDictionary()
+
+
+class _Snapshot:
+    """Raw entries of the source package plus what python-docx would have written for each at load time."""
+
+    def __init__(self, entries):
+        self.entries = {entry.name: entry for entry in entries}
+        self.written = {}
+        self.blobs = {}
+
+
+def _packageItems(package):
+    """Yield `(member name, part or None, bytes factory)` exactly as python-docx' PackageWriter writes them."""
+    from docx.opc.packuri import PACKAGE_URI
+    from docx.opc.pkgwriter import _ContentTypesItem
+
+    parts = package.parts
+    yield "[Content_Types].xml", None, lambda: _ContentTypesItem.from_parts(parts).blob
+    yield PACKAGE_URI.rels_uri.membername, None, lambda: package.rels.xml
+    for part in parts:
+        yield part.partname.membername, part, lambda part=part: part.blob
+        if len(part.rels):
+            yield part.partname.rels_uri.membername, None, lambda part=part: part.rels.xml
+
+
+def _isBinary(part):
+    from docx.opc.part import XmlPart
+
+    return part is not None and not isinstance(part, XmlPart)
+
+
+def openDocument(src):
+    """
+    Open `src` with python-docx and remember its raw zip entries, so `fastSave` can
+    copy every part that was not changed without inflating or recompressing it.
+    """
+    from docx import Document
+
+    if hasattr(src, "seek"):
+        src.seek(0)
+    entries = readRawEntries(src)
+    if hasattr(src, "seek"):
+        src.seek(0)
+    doc = Document(src)
+
+    snapshot = _Snapshot(entries)
+    for name, part, blob in _packageItems(doc.part.package):
+        if _isBinary(part):
+            snapshot.blobs[name] = part.blob
+        else:
+            data = blob()
+            snapshot.written[name] = (zlib.crc32(data), len(data))
+    _snapshots[doc.part.package] = snapshot
+    return doc
+
+
+def _levelFor(name, levels, defaultLevel):
+    for pattern, level in (levels or {}).items():
+        if fnmatch.fnmatchcase(name, pattern):
+            return level
+    return defaultLevel
+
+
+def fastSave(doc, out, levels=None, defaultLevel=6, source=None):
+    """
+    Save `doc` to `out` like `doc.save`, but copy the compressed bytes of every part
+    that did not change since `openDocument` (or that equals its entry in `source`).
+    `levels` maps glob patterns of member names to deflate levels, e.g.
+    `{"word/media/*": 0}`; other changed parts use `defaultLevel`. Returns the names
+    of the parts that were written anew.
+    """
+    package = doc.part.package
+    snapshot = _snapshots.get(package)
+    if snapshot is None:
+        snapshot = _Snapshot(readRawEntries(source) if source is not None else ())
+
+    for part in package.parts:
+        part.before_marshal()
+
+    changed = []
+    with RawZipWriter(out) as writer:
+        for name, part, blob in _packageItems(package):
+            entry = snapshot.entries.get(name)
+            if entry is not None and _isBinary(part) and snapshot.blobs.get(name) is part.blob:
+                writer.write(entry)
+                continue
+            data = blob()
+            key = (zlib.crc32(data), len(data))
+            if entry is not None and (key == (entry.crc, entry.fileSize) or key == snapshot.written.get(name)):
+                writer.write(entry)
+                continue
+            writer.write(RawEntry.fromBytes(name, data, _levelFor(name, levels, defaultLevel)))
+            changed.append(name)
+    return changed
@@ -0,0 +1,59 @@
+from benchmarks import bench_import, suite
+from benchmarks.synthetic import build_document
+
+
+def test_synthetic_documents_are_deterministic():
+    doc = build_document(paragraphs=4, runs=3, tables=2, table_depth=3, table_width=2, long_runs=7)
+    assert len(doc.paragraphs) == 5
+    assert len(doc.paragraphs[0].runs) == 3
+    assert len(doc.paragraphs[-1].runs) == 7
+    assert len(doc.tables) == 2
+    assert len(doc.tables[0].cell(0, 0).tables[0].cell(0, 0).tables) == 1
+    texts = [p.text for p in build_document(paragraphs=4, seed=5).paragraphs]
+    assert texts == [p.text for p in build_document(paragraphs=4, seed=5).paragraphs]
+
+
+def test_every_public_function_has_a_case(monkeypatch):
+    assert suite.missing_cases() == []
+    monkeypatch.setattr(suite, "missing_cases", lambda: ["docx_tools.uncovered"])
+    assert suite.main(["--sizes", "1", "--repeat", "1", "-q"]) == 1
+
+
+def test_run_and_compare():
+    results = suite.run([10, 20], repeat=1, pattern="docx_tools.findRunIndex")
+    points = results["cases"]["docx_tools.findRunIndex"]
+    assert [p["n"] for p in points] == [10, 20]
+    assert all(p["seconds"] > 0 and p["peak_bytes"] > 0 for p in points)
+    assert results["fixtures"]["nested_tables.docx"] == {}
+
+    slower = {"cases": {"docx_tools.findRunIndex": [{"n": 10, "seconds": 1.0}]}}
+    faster = {"cases": {"docx_tools.findRunIndex": [{"n": 10, "seconds": 0.5}]}}
+    assert suite.compare(slower, faster, threshold=0.25, min_seconds=0) != []
+    assert suite.compare(faster, slower, threshold=0.25, min_seconds=0) == []
+    assert suite.compare(slower, faster, threshold=0.25, min_seconds=2) == []
+
+
+def test_fixture_cases():
+    results = suite.run([], repeat=1, pattern="docx_tools.combineDocText")
+    assert "docx_tools.combineDocText" in results["fixtures"]["nested_tables.docx"]
+
+
+def test_text_modules_do_not_import_python_docx():
+    for module in bench_import.BUDGETS:
+        times = bench_import.importTimes(module)
+        assert times[module][1] > 0
+        assert not [name for name in times if name.split(".")[0] == "docx"]
+
+
+def test_import_times_stay_near_their_budgets():
+    # -- three times the budget, so only a real regression (say python-docx creeping back) fails a busy machine --
+    for module, budget in bench_import.BUDGETS.items():
+        seconds, _ = bench_import.measure(module, repeat=2)
+        assert seconds <= 3 * budget, f"{module}: {seconds * 1000:.1f} ms above lxml.etree"
+
+
+def test_import_budgets_exclude_the_baseline():
+    times = {"lxml": (0.001, 0.001), "lxml.etree": (0.05, 0.06), "docx_xml": (0.002, 0.065)}
+    assert abs(bench_import.ownTime(times, "docx_xml") - 0.004) < 1e-9
+    assert bench_import.ownTime(times, "docx_xml", baseline=None) == 0.065
+    assert bench_import.ownTime({"zipfile": (0.01, 0.01)}, "zipfile") == 0.01
@@ -0,0 +1,75 @@
+from docx import Document
+
+import docx_tools
+
+
+def formatted_paragraph(doc):
+    p = doc.add_paragraph()
+    p.add_run("abc").bold = True
+    p.add_run("defg").underline = True
+    p.add_run("hijkl").italic = True
+    return p
+
+
+def runs(para):
+    return [(r.text, bool(r.bold), bool(r.underline), bool(r.italic)) for r in para.runs]
+
+
+def test_copy_keeps_run_formatting():
+    doc = Document()
+    src = formatted_paragraph(doc)
+    dest = doc.add_paragraph()
+    docx_tools.copyTextSegment(src, dest, 2, 7)
+    assert runs(dest) == [("c", True, False, False), ("defg", False, True, False), ("h", False, False, True)]
+    assert src.text == "abcdefghijkl"
+
+
+def test_copy_into_the_middle_of_a_run():
+    doc = Document()
+    src = formatted_paragraph(doc)
+    dest = doc.add_paragraph("0123")
+    docx_tools.copyTextSegment(src, dest, 3, 4, 2)
+    assert runs(dest) == [
+        ("01", False, False, False),
+        ("de", False, True, False),
+        ("23", False, False, False),
+    ]
+    docx_tools.copyTextSegment(src, dest, 0, 0, 0)
+    docx_tools.copyTextSegment(src, dest, 11, 11, len(dest.text))
+    assert dest.text == "a01de23l"
+    assert docx_tools.copyTextSegment(src, dest, 0, 1, 99) is None
+    assert dest.text == "a01de23l"
+
+
+def test_copy_into_another_document():
+    src = formatted_paragraph(Document())
+    other = Document()
+    dest = other.add_paragraph()
+    docx_tools.copyTextSegment(src, dest, 0, 11)
+    assert runs(dest) == runs(src)
+    assert dest.runs[0]._r.getroottree().getroot() is other.element
+
+
+def test_move_within_one_paragraph():
+    doc = Document()
+    p = formatted_paragraph(doc)
+    docx_tools.moveTextSegment(p, p, 3, 6, 12)
+    assert p.text == "abchijkldefg"
+    assert runs(p)[-1] == ("defg", False, True, False)
+
+    docx_tools.moveTextSegment(p, p, 8, 11)
+    assert p.text == "defgabchijkl"
+
+
+def test_whole_runs_keep_only_text_content():
+    doc = Document()
+    src = doc.add_paragraph("a")
+    middle = src.add_run("b\tc")
+    middle.add_break()
+    middle._r.append(middle._r.makeelement(middle._r.tag.replace("}r", "}lastRenderedPageBreak")))
+    middle._r.append(middle._r.makeelement(middle._r.tag.replace("}r", "}fldChar")))
+    src.add_run("d")
+    dest = doc.add_paragraph()
+    docx_tools.copyTextSegment(src, dest, 0, 5)
+    assert dest.text == "ab\tc\nd"
+    assert [child.tag.split("}")[1] for child in dest.runs[1]._r] == ["t", "tab", "t", "br"]
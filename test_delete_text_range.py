@@ -0,0 +1,49 @@
+import random
+
+from docx_tools import deleteTextRange, deleteTextRun
+from docx import Document
+
+
+def make_para(parts):
+    document = Document()
+    p = document.add_paragraph("")
+    for part in parts:
+        p.add_run(part)
+    return p
+
+
+def test_matches_string_slicing():
+    rng = random.Random(7)
+    parts = ["".join(rng.choice("abcdef") for _ in range(rng.randint(0, 5))) for _ in range(40)]
+    text = "".join(parts)
+    for _ in range(50):
+        start = rng.randrange(len(text))
+        end = rng.randrange(start, len(text))
+        p = make_para(parts)
+        assert deleteTextRange(p, start, end) is p
+        assert p.text == text[:start] + text[end + 1 :]
+
+
+def test_interior_runs_are_detached():
+    p = make_para(["ab", "cd", "ef", "gh"])
+    deleteTextRange(p, 1, 6)
+    assert p.text == "ah"
+    assert len(p.runs) == 2
+    assert p.runs[0].text == "a"
+    assert p.runs[1].text == "h"
+
+
+def test_out_of_bounds():
+    p = make_para(["ab", "cd"])
+    assert deleteTextRange(p, 1, 4) is None
+    assert deleteTextRange(p, -1, 2) is None
+    assert p.text == "abcd"
+
+
+def test_delete_text_run_of_other_paragraph():
+    p = make_para(["ab"])
+    q = make_para(["cd"])
+    assert deleteTextRun(q.runs[0], p) is None
+    run = p.runs[0]
+    assert deleteTextRun(run, p) is run
+    assert p.text == ""
@@ -0,0 +1,99 @@
+from docx import Document
+
+import docx_tools
+from docx_tools import DocumentView
+
+
+def make_doc(*texts):
+    doc = Document()
+    for text in texts:
+        doc.add_paragraph(text)
+    return doc
+
+
+def test_paragraph_list_is_cached():
+    view = DocumentView(make_doc("a", "b"))
+    assert view.paragraphs is view.paragraphs
+    assert len(view) == 2
+    assert view.text(1) == "b"
+
+
+def test_index_based_functions_accept_views():
+    doc = make_doc("FOO", "BAR", "BAZ")
+    view = DocumentView(doc)
+    assert docx_tools.extractTextBetween(view, 0, 2, 1, 2) == "OOBARBA"
+    docx_tools.replaceDocTextSegment(view, 0, 2, 1, 1, "-")
+    assert [p.text for p in doc.paragraphs] == ["F-", "Z"]
+    assert docx_tools.extractTextBetween(view, 0, 1, 0, 1) == "F-Z"
+    assert docx_tools.extractOuterDocText(view) == "F-Z"
+
+
+def test_mutators_invalidate_the_view():
+    doc = make_doc("one", "two")
+    view = DocumentView(doc)
+    first = view.paragraphs[0]
+    assert view.text(0) == "one"
+
+    docx_tools.insertStrIntoPara(first, "X", 0)
+    assert view.text(0) == "Xone"
+
+    docx_tools.appendPara(first, "new")
+    assert [view.text(i) for i in range(len(view))] == ["Xone", "new", "two"]
+
+    docx_tools.duplicatePara(view.paragraphs[2])
+    assert len(view) == 4
+
+    docx_tools.deletePara(view.paragraphs[0])
+    assert [view.text(i) for i in range(len(view))] == ["new", "two", "two"]
+
+
+def test_external_changes():
+    doc = make_doc("one")
+    view = DocumentView(doc)
+    assert view.text(0) == "one"
+    doc.add_paragraph("two")
+    view.paragraphs[0].runs[0].text = "uno"
+    assert len(view) == 1
+    assert view.text(0) == "one"
+    view.invalidate()
+    assert len(view) == 2
+    assert view.text(0) == "uno"
+
+
+def table_doc():
+    doc = make_doc("one", "two")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "a"
+    table.cell(0, 1).add_table(rows=1, cols=1).cell(0, 0).text = "deep"
+    return doc
+
+
+def test_combined_text_is_cached_and_matches_document():
+    doc = table_doc()
+    view = DocumentView(doc)
+    assert docx_tools.combineDocText(view) == docx_tools.combineDocText(doc)
+    assert docx_tools.extractInnerDocText(view) == "a\n\n\ndeep\n"
+    assert docx_tools.extractOuterDocText(view) is docx_tools.extractOuterDocText(view)
+
+
+def test_edits_rebuild_only_dirty_segments():
+    doc = table_doc()
+    view = DocumentView(doc)
+    docx_tools.combineDocText(view)
+
+    # -- unnotified changes stay invisible, which shows untouched segments are not re-read --
+    doc.paragraphs[1].runs[0].text = "stale"
+    doc.tables[0].cell(0, 0).paragraphs[0].runs[0].text = "stale"
+
+    docx_tools.insertStrIntoPara(view.paragraphs[0], "X", 0)
+    deep = doc.tables[0].cell(0, 1).tables[0].cell(0, 0).paragraphs[0]
+    docx_tools.insertStrIntoPara(deep, "er", 4)
+    assert docx_tools.combineDocText(view) == "Xonetwoa\n\n\ndeeper\n"
+
+    docx_tools.appendPara(deep, "more")
+    assert docx_tools.extractInnerDocText(view) == "a\n\n\ndeeper\nmore\n"
+    docx_tools.deletePara(view.paragraphs[1])
+    assert docx_tools.extractOuterDocText(view) == "Xone"
+
+    view.invalidate()
+    assert docx_tools.combineDocText(view) == docx_tools.combineDocText(doc)
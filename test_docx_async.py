@@ -0,0 +1,96 @@
+import asyncio
+import io
+import threading
+
+import pytest
+from docx import Document
+
+import docx_tools
+from docx_async import DocxRunner, async_apply_edits, async_extract, async_save
+
+
+def saved(*texts):
+    doc = Document()
+    for text in texts:
+        doc.add_paragraph(text)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def test_extract_edit_and_save():
+    async def main():
+        data = saved("Hello world", "second")
+        assert await async_extract(data) == "Hello worldsecond"
+        doc = Document(io.BytesIO(data))
+        assert await async_extract(doc) == "Hello worldsecond"
+
+        await async_apply_edits(doc, [(0, 0, 0, 4, "Bye")])
+        out = io.BytesIO()
+        await async_save(doc, out, fast=True)
+        return out
+
+    out = asyncio.run(main())
+    assert docx_tools.combineDocText(Document(out)) == "Bye worldsecond"
+
+
+def test_edit_paths_in_a_process_pool(tmp_path):
+    src = tmp_path / "in.docx"
+    src.write_bytes(saved("abc", "def"))
+    out = tmp_path / "out.docx"
+
+    async def main():
+        async with DocxRunner(maxConcurrency=2, processes=True, workers=1) as runner:
+            texts = await asyncio.gather(*(runner.extract(str(src), engine) for engine in ("xml", "docx")))
+            result = await runner.apply_edits(str(src), [(0, 1, 1, 0, "-")], out=str(out))
+            return texts, result
+
+    texts, result = asyncio.run(main())
+    assert texts == ["abcdef", "abcdef"]
+    assert result == str(out)
+    assert [p.text for p in Document(out).paragraphs] == ["a-", "ef"]
+
+
+def test_edits_written_to_a_file_object_stay_in_this_process():
+    out = io.BytesIO()
+
+    async def main():
+        async with DocxRunner(processes=True, workers=1) as runner:
+            return await runner.apply_edits(saved("abc"), [(0, 0, 0, 0, "X")], out=out)
+
+    assert asyncio.run(main()) is out
+    assert docx_tools.combineDocText(Document(io.BytesIO(out.getvalue()))) == "Xbc"
+
+
+def test_concurrency_limit_timeout_and_cancellation():
+    release = threading.Event()
+    state = {"running": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def block():
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        release.wait(5)
+        with lock:
+            state["running"] -= 1
+        return "done"
+
+    async def main():
+        runner = DocxRunner(maxConcurrency=2)
+        with pytest.raises(asyncio.TimeoutError):
+            await runner.run(block, timeout=0.05)
+        # -- the timed out job still holds its slot, so only one more job starts --
+        second = asyncio.ensure_future(runner.run(block))
+        third = asyncio.ensure_future(runner.run(block))
+        await asyncio.sleep(0.1)
+        assert state["running"] == 2
+        third.cancel()
+        release.set()
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await third
+        runner.close(wait=True)
+
+    asyncio.run(main())
+    assert state["peak"] == 2
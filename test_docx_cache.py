@@ -0,0 +1,134 @@
+import io
+import multiprocessing
+import sqlite3
+import time
+import zipfile
+
+from docx import Document
+
+import docx_extract
+import docx_tools
+from docx_cache import ExtractionCache, fingerprint
+from docx_zip import readDirectory
+
+
+def save(path, text, cell="cell"):
+    doc = Document()
+    doc.add_paragraph(text)
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = cell
+    doc.save(path)
+    return str(path)
+
+
+def test_fingerprint_reads_the_central_directory(tmp_path):
+    path = save(tmp_path / "a.docx", "hello")
+    with zipfile.ZipFile(path) as zf:
+        info = zf.getinfo("word/document.xml")
+        expected = {i.filename: (i.CRC, i.compress_size, i.file_size) for i in zf.infolist()}
+    assert readDirectory(path) == expected
+    assert fingerprint(path) == (info.CRC, info.file_size)
+
+    # -- a second copy and a re-saved file with the same body share the key --
+    assert fingerprint(save(tmp_path / "b.docx", "hello")) == fingerprint(path)
+    assert fingerprint(save(tmp_path / "c.docx", "hellO")) != fingerprint(path)
+
+
+def test_hits_misses_and_texts(tmp_path):
+    path = save(tmp_path / "a.docx", "hello")
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        assert cache.combineDocText(path) == docx_tools.combineDocText(Document(path))
+        assert cache.extractOuterDocText(path) == "hello"
+        with open(path, "rb") as fp:
+            assert cache.extractInnerDocText(fp) == "cell\n"
+        stats = cache.stats()
+        assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 2, 1)
+        assert stats["bytes"] == len("hello") + len("cell\n")
+
+    # -- the counters are stored in the database, the session counters are not --
+    with ExtractionCache(tmp_path / "cache.db") as cache:
+        assert cache.combineDocText(save(tmp_path / "b.docx", "hello")) == "hellocell\n"
+        stats = cache.stats()
+        assert (stats["hits"], stats["sessionHits"], stats["sessionMisses"]) == (3, 1, 0)
+        cache.clear()
+        assert cache.stats()["entries"] == 0 and cache.stats()["misses"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    paths = [save(tmp_path / f"{i}.docx", f"text {i}", "") for i in range(4)]
+    with ExtractionCache(tmp_path / "cache.db", maxBytes=14, touchAfter=0) as cache:
+        cache.texts(paths[0])
+        cache.texts(paths[1])
+        cache.texts(paths[0])
+        cache.texts(paths[2])
+        stats = cache.stats()
+        assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 14, 1)
+        assert cache.lookup(fingerprint(paths[1])) is None
+        assert cache.lookup(fingerprint(paths[0])) is not None
+
+
+def test_lookups_do_not_write(tmp_path):
+    path = save(tmp_path / "a.docx", "hello")
+    db = str(tmp_path / "cache.db")
+    with ExtractionCache(db) as cache:
+        cache.texts(path)
+    with ExtractionCache(db, timeout=0.1, flushAfter=3600) as cache:
+        writer = sqlite3.connect(db, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        # -- another process holds the write lock; hits are still answered and counted in memory --
+        assert cache.combineDocText(path) == "hellocell\n"
+        assert cache.combineDocText(path) == "hellocell\n"
+        writer.execute("ROLLBACK")
+        counters = dict(writer.execute("SELECT name, value FROM counters"))
+        assert (counters["hits"], counters["misses"]) == (0, 1)
+        assert cache.stats()["hits"] == 2
+        writer.close()
+
+
+def test_a_busy_database_keeps_updates_pending(tmp_path):
+    path = save(tmp_path / "a.docx", "hello")
+    db = str(tmp_path / "cache.db")
+    with ExtractionCache(db) as cache:
+        cache.texts(path)
+    with ExtractionCache(db, timeout=5, touchAfter=0, flushAfter=0) as cache:
+        cache.stats()
+        writer = sqlite3.connect(db, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        start = time.monotonic()
+        # -- the flush due with each hit gives up at once instead of failing or waiting for the lock --
+        assert cache.combineDocText(path) == "hellocell\n"
+        assert cache.combineDocText(path) == "hellocell\n"
+        assert time.monotonic() - start < 1
+        writer.execute("ROLLBACK")
+        writer.close()
+        assert cache.stats()["hits"] == 2
+
+
+def _extract(args):
+    db, path = args
+    with ExtractionCache(db) as cache:
+        return cache.combineDocText(path)
+
+
+def test_concurrent_processes(tmp_path):
+    db = str(tmp_path / "cache.db")
+    paths = [save(tmp_path / f"{i}.docx", f"doc {i % 3}") for i in range(12)]
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        texts = pool.map(_extract, [(db, path) for path in paths])
+    assert texts == [f"doc {i % 3}cell\n" for i in range(12)]
+    stats = ExtractionCache(db).stats()
+    assert stats["entries"] == 3 and stats["hits"] + stats["misses"] == 12
+
+
+def test_extract_command_uses_the_cache(tmp_path):
+    save(tmp_path / "a.docx", "alpha")
+    db = str(tmp_path / "cache.db")
+    for cached in (False, True):
+        out, counts = io.StringIO(), {}
+        assert docx_extract.extract([str(tmp_path / "a.docx")], out, workers=0, cache=db, counts=counts) == (1, 0)
+        assert f'"cached": {str(cached).lower()}' in out.getvalue()
+        assert counts == {"hits": int(cached), "misses": int(not cached)}
+
+    # -- worker processes write their pending counts when they exit --
+    hits = ExtractionCache(db).stats()["hits"]
+    assert docx_extract.extract([str(tmp_path / "a.docx")], io.StringIO(), workers=1, cache=db) == (1, 0)
+    assert ExtractionCache(db).stats()["hits"] == hits + 1
@@ -0,0 +1,117 @@
+import random
+
+import pytest
+from docx import Document
+
+import docx_tools
+from docx_diff import DiffOp, apply_patch, diff_documents, diff_sequences
+
+
+def make_doc(*texts, cells=()):
+    doc = Document()
+    for text in texts:
+        doc.add_paragraph(text)
+    if cells:
+        table = doc.add_table(rows=1, cols=len(cells))
+        for i, text in enumerate(cells):
+            table.cell(0, i).text = text
+    return doc
+
+
+def rebuild(a, b, opcodes):
+    out = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (tag == "equal") == (a[i1:i2] == b[j1:j2] and i2 - i1 > 0)
+        out += b[j1:j2]
+    return "".join(out)
+
+
+def test_diff_sequences_is_minimal_and_complete():
+    rng = random.Random(7)
+    for _ in range(300):
+        a = "".join(rng.choice("abc") for _ in range(rng.randrange(12)))
+        b = "".join(rng.choice("abc") for _ in range(rng.randrange(12)))
+        opcodes = diff_sequences(a, b)
+        assert rebuild(a, b, opcodes) == b
+        assert [o[1] for o in opcodes] == sorted(o[1] for o in opcodes)
+        edits = sum(i2 - i1 + j2 - j1 for tag, i1, i2, j1, j2 in opcodes if tag != "equal")
+        common = sum(i2 - i1 for tag, i1, i2, j1, j2 in opcodes if tag == "equal")
+        assert edits == len(a) + len(b) - 2 * common
+        assert common == lcs(a, b)
+
+
+def lcs(a, b):
+    row = [0] * (len(b) + 1)
+    for x in a:
+        prev = 0
+        for j, y in enumerate(b):
+            prev, row[j + 1] = row[j + 1], prev + 1 if x == y else max(row[j + 1], row[j])
+    return row[-1]
+
+
+def test_ops_use_replace_doc_text_segment_coordinates():
+    a = make_doc("same", "The quick fox", "gone", "same too")
+    b = make_doc("same", "The slow fox", "same too", "new")
+    ops = diff_documents(a, b)
+    assert ops == [
+        DiffOp("replace", 1, 1, 4, 8, "slow"),
+        DiffOp("delete", 2, 2, 0, 3, ""),
+        DiffOp("insert", 4, 4, 0, -1, "new"),
+    ]
+    docx_tools.replaceDocTextSegment(a, 1, 1, 4, 8, "slow")
+    assert a.paragraphs[1].text == "The slow fox"
+    assert diff_documents(b, b) == []
+
+
+def test_apply_patch_reproduces_the_other_document():
+    rng = random.Random(3)
+    words = ["alpha", "beta", "gamma", "delta", ""]
+    for _ in range(30):
+        texts = [" ".join(rng.choices(words, k=rng.randrange(4))) for _ in range(rng.randrange(1, 8))]
+        changed = list(texts)
+        for _ in range(rng.randrange(4)):
+            action = rng.randrange(3)
+            i = rng.randrange(len(changed) + 1)
+            if action == 0:
+                changed.insert(i, rng.choice(words) + " new")
+            elif action == 1 and len(changed) > 1 and i < len(changed):
+                del changed[i]
+            elif i < len(changed):
+                changed[i] = changed[i].replace("a", "A", 1) + rng.choice(words)
+        cells = ["x\ny", "cell"]
+        a = make_doc(*texts, cells=cells)
+        b = make_doc(*changed, cells=[cells[0].replace("y", "z\nw"), "cell"])
+        apply_patch(a, diff_documents(a, b))
+        assert docx_tools.combineDocText(a) == docx_tools.combineDocText(b)
+
+
+def test_cell_changes():
+    a = make_doc("p", cells=["one", "two"])
+    b = make_doc("p", cells=["one", "too"])
+    assert diff_documents(a, b) == [DiffOp("replace", 0, 0, 1, 1, "o", 1)]
+    b = make_doc("p", cells=["one", "two", "three"])
+    ops = diff_documents(a, b)
+    assert ops == [DiffOp("insert_cell", 2, 2, 0, -1, "three", 2)]
+    with pytest.raises(ValueError):
+        apply_patch(a, ops)
+
+
+def test_views_are_accepted():
+    a = docx_tools.DocumentView(make_doc("one", "two"))
+    b = make_doc("one", "three")
+    apply_patch(a, diff_documents(a, b))
+    assert docx_tools.extractOuterDocText(a) == "onethree"
+
+
+def test_text_ops_replay_through_replace_doc_text_segment():
+    for new in ("abXcd", "Xabcd", "abcdX", "aXbYcd", "bc", ""):
+        doc = Document()
+        p = doc.add_paragraph("ab")
+        p.add_run("cd").bold = True
+        ops = diff_documents(doc, make_doc(new))
+        for op in reversed(ops):
+            docx_tools.replaceDocTextSegment(doc, op.startParaIdx, op.endParaIdx, op.start, op.end, op.txt)
+        assert doc.paragraphs[0].text == new
+        if new == "abXcd":
+            assert ops == [DiffOp("replace", 0, 0, 2, 1, "X")]
+            assert [r.text for r in doc.paragraphs[0].runs] == ["abX", "cd"]
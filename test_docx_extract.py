@@ -0,0 +1,83 @@
+import io
+import json
+import os
+import subprocess
+import sys
+
+from docx import Document
+
+import docx_extract
+
+
+def make_corpus(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    for name, text in [("a.docx", "alpha"), ("sub/b.docx", "beta")]:
+        doc = Document()
+        doc.add_paragraph(text)
+        doc.add_table(rows=1, cols=1).cell(0, 0).text = text.upper()
+        doc.save(tmp_path / name)
+    (tmp_path / "broken.docx").write_bytes(b"not a zip")
+    (tmp_path / "notes.txt").write_text("ignored")
+    return tmp_path
+
+
+def records(output):
+    return {r["path"].rsplit("/", 1)[-1]: r for r in map(json.loads, output.splitlines())}
+
+
+def test_iter_paths(tmp_path):
+    root = make_corpus(tmp_path)
+    paths = list(docx_extract.iterPaths([str(root)]))
+    assert [p.rsplit("/", 1)[-1] for p in paths] == ["a.docx", "broken.docx", "b.docx"]
+    assert list(docx_extract.iterPaths([str(root / "*.docx")])) == [str(root / "a.docx"), str(root / "broken.docx")]
+
+
+def test_extract_in_process(tmp_path):
+    root = make_corpus(tmp_path)
+    out = io.StringIO()
+    assert docx_extract.extract([str(root)], out, workers=0) == (3, 1)
+    result = records(out.getvalue())
+    assert result["a.docx"]["outer"] == "alpha"
+    assert result["a.docx"]["inner"] == "ALPHA\n"
+    assert result["a.docx"]["error"] is None
+    assert result["broken.docx"]["error"].startswith("BadZipFile")
+    assert result["broken.docx"]["seconds"] is not None
+
+
+def test_extract_with_pool_and_docx_engine(tmp_path):
+    root = make_corpus(tmp_path)
+    out = io.StringIO()
+    assert docx_extract.extract([str(root)], out, engine="docx", workers=2, maxInFlight=1) == (3, 1)
+    assert records(out.getvalue())["b.docx"]["outer"] == "beta"
+
+
+_extractFile = docx_extract.extractFile
+
+
+def crashOnBeta(path, engine, cache):
+    if path.endswith("b.docx"):
+        os._exit(1)
+    return _extractFile(path, engine, cache)
+
+
+def test_a_crashed_worker_is_recorded_and_the_run_goes_on(tmp_path, monkeypatch):
+    root = make_corpus(tmp_path)
+    # -- forked workers see the patched function --
+    monkeypatch.setattr(docx_extract, "extractFile", crashOnBeta)
+    paths = [str(root / "sub" / "b.docx")] + [str(root / "a.docx")] * 3
+    result = list(docx_extract.iterRecords(paths, workers=1, maxInFlight=1))
+    assert len(result) == 4
+    assert result[0]["path"].endswith("b.docx") and result[0]["error"].startswith("BrokenProcessPool")
+    assert [r["outer"] for r in result[1:]] == ["alpha"] * 3
+
+
+def test_module_entry_point(tmp_path):
+    root = make_corpus(tmp_path)
+    output = tmp_path / "out.jsonl"
+    subprocess.run(
+        [sys.executable, "-m", "docx_tools", "extract", str(root), "-j", "1", "-o", str(output)],
+        check=True,
+        capture_output=True,
+    )
+    assert records(output.read_text(encoding="utf-8"))["b.docx"]["inner"] == "BETA\n"
@@ -0,0 +1,54 @@
+import io
+
+import docx.document
+import pytest
+from docx import Document
+
+import docx_tools
+from benchmarks.synthetic import build_bytes
+from docx_lazy import checkDocumentInternals, openLazy
+
+
+def source():
+    return build_bytes(paragraphs=20, tables=2, images=2)
+
+
+def test_text_functions_match_full_open():
+    data = source()
+    full = Document(io.BytesIO(data))
+    with openLazy(io.BytesIO(data)) as lazy:
+        assert docx_tools.extractOuterDocText(lazy) == docx_tools.extractOuterDocText(full)
+        assert docx_tools.concatTableTexts(lazy) == docx_tools.concatTableTexts(full)
+        assert docx_tools.extractTextBetween(lazy, 2, 5, 1, 4) == docx_tools.extractTextBetween(full, 2, 5, 1, 4)
+
+
+def test_only_main_part_is_read():
+    with openLazy(io.BytesIO(source())) as doc:
+        assert doc.loaded == set()
+        assert any(name.startswith("word/media/") for name in doc.index)
+        docx_tools.extractInnerDocText(doc)
+        assert doc.loaded == {"word/document.xml"}
+
+
+def test_package_accessors_load_on_demand_and_keep_edits():
+    doc = openLazy(io.BytesIO(source()))
+    docx_tools.insertStrIntoPara(doc.paragraphs[0], "Edited ", 0)
+    assert doc.paragraphs[0].style.name == "Normal"
+    assert "word/styles.xml" in doc.loaded
+
+    out = io.BytesIO()
+    doc.save(out)
+    assert Document(out).paragraphs[0].text.startswith("Edited ")
+
+
+def test_changed_document_internals_are_detected(monkeypatch):
+    checkDocumentInternals()
+    init = docx.document.Document.__init__
+
+    def changedInit(self, element, part):
+        init(self, element, part)
+        self._sections = None
+
+    monkeypatch.setattr(docx.document.Document, "__init__", changedInit)
+    with pytest.raises(ImportError):
+        checkDocumentInternals()
@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+
+from docx import Document
+
+import docx_profile
+import docx_tools
+import docxTools
+from docx_profile import profiling
+
+
+def sample():
+    doc = Document()
+    for i in range(3):
+        doc.add_paragraph(f"paragraph {i}").add_run(" more")
+    doc.add_table(rows=2, cols=2).cell(0, 0).text = "cell"
+    return doc
+
+
+def test_counts_calls_and_hot_paths():
+    doc = sample()
+    original = docx_tools.combineDocText
+    with profiling() as profile:
+        assert docx_tools.combineDocText is not original
+        docx_tools.combineDocText(doc)
+        docx_tools.insertStrIntoPara(doc.paragraphs[0], "x", 0)
+        docxTools.rm(0, 1, doc.paragraphs[1])
+        view = docx_tools.DocumentView(doc)
+        view.text(0)
+    assert docx_tools.combineDocText is original
+
+    data = profile.snapshot()
+    functions = data["functions"]
+    assert functions["docx_tools.combineDocText"]["calls"] == 1
+    assert functions["docx_tools.iter_table_cells"]["calls"] == 1
+    assert functions["docx_tools.deleteTextRange"]["calls"] == 1
+    assert functions["docxTools.rm"]["calls"] == 1
+    assert functions["docx_tools.DocumentView"]["calls"] == 1
+    assert functions["docx_tools.DocumentView.paragraphs"]["calls"] == 1
+    assert functions["docx_tools.combineDocText"]["seconds"] > 0
+
+    counters = data["counters"]
+    # -- doc.paragraphs three times, cell.paragraphs once per cell --
+    assert counters["paragraph_lists"] == 8
+    assert counters["paragraphs_materialized"] == 16
+    # -- the view reads its text straight from the XML, without `Paragraph.text` --
+    assert counters["paragraph_text_builds"] == 7
+    assert counters["run_index_builds"] == 2
+    assert counters["runs_scanned"] == 4
+    assert counters["table_cells"] == 4
+
+
+def test_disabled_profiling_leaves_nothing_behind():
+    with profiling() as profile:
+        with profiling() as nested:
+            assert nested is profile
+        assert docx_profile.current() is profile
+    assert docx_profile.current() is None
+    docx_tools.combineDocText(sample())
+    assert profile.snapshot()["functions"] == {}
+
+
+def test_exports():
+    with profiling() as profile:
+        docx_tools.extractOuterDocText(sample())
+    data = json.loads(profile.toJson())
+    assert data["functions"]["docx_tools.extractOuterDocText"]["calls"] == 1
+    text = profile.toPrometheus()
+    assert 'docx_tools_calls_total{function="docx_tools.extractOuterDocText"} 1' in text
+    assert "# TYPE docx_tools_paragraph_lists_total counter" in text
+    assert "docx_tools_paragraph_lists_total 1" in text
+
+
+def test_environment_variable(tmp_path):
+    target = tmp_path / "stats.prom"
+    code = "import docx, docx_tools; docx_tools.combineDocText(docx.Document())"
+    env = dict(os.environ, DOCX_TOOLS_PROFILE=str(target))
+    subprocess.run([sys.executable, "-c", code], check=True, env=env, cwd=os.path.dirname(docx_tools.__file__))
+    assert 'docx_tools_calls_total{function="docx_tools.combineDocText"} 1' in target.read_text()
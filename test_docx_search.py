@@ -0,0 +1,78 @@
+import re
+
+from docx import Document
+
+import docx_tools
+from docx_search import find_all, replace_all
+
+
+def make_doc():
+    doc = Document()
+    p = doc.add_paragraph("")
+    p.add_run("The qu").bold = True
+    p.add_run("ick brown ").italic = True
+    p.add_run("fox")
+    doc.add_paragraph("quick quick")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "quick cell"
+    table.cell(0, 1).add_table(rows=1, cols=1).cell(0, 0).text = "nested quick"
+    return doc
+
+
+def test_find_all_across_runs_and_tables():
+    hits = find_all(make_doc(), "quick")
+    assert [(h.paraIdx, h.start, h.end) for h in hits] == [
+        (0, 4, 9),
+        (1, 0, 5),
+        (1, 6, 11),
+        (None, 0, 5),
+        (None, 7, 12),
+    ]
+    assert all(h.text == "quick" for h in hits)
+
+
+def test_replace_keeps_formatting_of_first_run():
+    doc = make_doc()
+    assert replace_all(doc, "quick brown", "slow") == 1
+    p = doc.paragraphs[0]
+    assert p.text == "The slow fox"
+    assert [r.text for r in p.runs] == ["The slow", " ", "fox"]
+    assert p.runs[0].bold
+
+
+def test_replace_all_everywhere():
+    doc = make_doc()
+    assert replace_all(doc, "quick", "fast") == 5
+    assert docx_tools.combineDocText(doc) == "The fast brown foxfast fastfast cell\n\n\nnested fast\n"
+
+
+def test_backreferences_callables_and_count():
+    doc = make_doc()
+    assert replace_all(doc, r"(qu)(ick)", r"\2\1", count=2) == 2
+    assert docx_tools.extractOuterDocText(doc) == "The ickqu brown foxickqu quick"
+    assert replace_all(doc, re.compile("o"), lambda m: m.group().upper()) == 2
+    assert doc.paragraphs[0].text == "The ickqu brOwn fOx"
+
+
+def test_replace_empties_and_removes_interior_runs():
+    doc = Document()
+    p = doc.add_paragraph("")
+    for part in ["ab", "cd", "ef"]:
+        p.add_run(part)
+    assert replace_all(doc, "bcde", "") == 1
+    assert [r.text for r in p.runs] == ["a", "f"]
+
+
+def test_view_text_is_refreshed():
+    doc = make_doc()
+    view = docx_tools.DocumentView(doc)
+    assert view.text(1) == "quick quick"
+    replace_all(view, "quick", "q")
+    assert view.text(1) == "q q"
+
+
+def test_many_matches():
+    doc = Document()
+    doc.add_paragraph("ab " * 20000)
+    assert replace_all(doc, "b", "c") == 20000
+    assert doc.paragraphs[0].text == "ac " * 20000
@@ -0,0 +1,80 @@
+import io
+
+import pytest
+from docx import Document
+
+from docx_table_export import CellBatch, export_tables, iter_cell_batches
+from docx_tools import DocumentView
+
+
+def table_document(prefix):
+    doc = Document()
+    table = doc.add_table(rows=2, cols=2)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"{prefix}{r}{c}"
+    table.cell(1, 0).merge(table.cell(1, 1))
+    table.cell(0, 1).add_table(rows=1, cols=1).cell(0, 0).text = "ä"
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = f"{prefix}last"
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf
+
+
+def test_records_with_table_paths():
+    (batch,) = iter_cell_batches([("a", table_document("a"))])
+    assert list(batch.records()) == [
+        ("a", "0", 0, 0, 0, "a00"),
+        ("a", "0", 0, 1, 0, "a01\n"),
+        ("a", "0/0:1/1", 0, 0, 1, "ä"),
+        ("a", "0", 1, 0, 0, "a10\na11"),
+        ("a", "2", 0, 0, 0, "alast"),
+    ]
+
+
+def test_batches_span_documents():
+    sources = [("a", table_document("a")), ("b", table_document("b")), Document()]
+    batches = list(iter_cell_batches(sources, batchSize=3))
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    assert batches[1].docs == ["a", "b"]
+    records = [record for batch in batches for record in batch.records()]
+    assert [record[0] for record in records] == ["a"] * 5 + ["b"] * 5
+    assert [record[1:5] for record in records[5:]] == [record[1:5] for record in records[:5]]
+    assert [record[5] for record in records[5:]] == ["b00", "b01\n", "ä", "b10\nb11", "blast"]
+
+
+def test_documents_and_views_are_sources():
+    expected = list(next(iter_cell_batches([("a", table_document("a"))])).records())
+    doc = Document(table_document("a"))
+    for source in (doc, DocumentView(doc), ("a", DocumentView(doc))):
+        (batch,) = iter_cell_batches([source])
+        assert [record[1:] for record in batch.records()] == [record[1:] for record in expected]
+
+
+def test_text_is_stored_in_one_buffer():
+    (batch,) = iter_cell_batches([table_document("a")])
+    assert isinstance(batch, CellBatch)
+    assert batch.docs == [None]
+    assert batch.data.decode("utf-8") == "a00a01\näa10\na11alast"
+    assert list(batch.offsets) == [0, 3, 7, 9, 16, 21]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        list(export_tables([], format="csv"))
+
+
+def test_numpy_buffers():
+    np = pytest.importorskip("numpy")
+    (arrays,) = export_tables([table_document("a")], format="numpy")
+    assert arrays["depth"].tolist() == [0, 0, 1, 0, 0]
+    assert arrays["data"][arrays["offsets"][2] : arrays["offsets"][3]].tobytes().decode() == "ä"
+    assert arrays["doc"].dtype == np.int64
+
+
+def test_arrow_record_batch():
+    pytest.importorskip("pyarrow")
+    (batch,) = export_tables([("a", table_document("a"))], format="arrow")
+    assert batch.schema.names == ["doc_id", "table_path", "row", "col", "depth", "text"]
+    assert batch.column("text").to_pylist() == ["a00", "a01\n", "ä", "a10\na11", "alast"]
+    assert batch.column("table_path").to_pylist() == ["0", "0", "0/0:1/1", "0", "2"]
@@ -0,0 +1,140 @@
+import io
+import random
+import zipfile
+
+import pytest
+from docx import Document
+
+import docx_tools
+from docx_template import Automaton, PlaceholderSet, compileTemplate, fill_placeholders
+from docx_zip import iterRawEntries
+
+
+def test_automaton_matches_naive_search():
+    rng = random.Random(3)
+    patterns = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(12)]
+    patterns = list(dict.fromkeys(patterns))
+    text = "".join(rng.choice("ab") for _ in range(300))
+    automaton = Automaton(patterns)
+    expected = sorted(
+        (i, i + len(p), k) for k, p in enumerate(patterns) for i in range(len(text)) if text.startswith(p, i)
+    )
+    assert sorted(automaton.iter_all(text)) == expected
+
+
+def test_leftmost_longest():
+    automaton = Automaton(["ab", "abcd", "cde"])
+    assert list(automaton.finditer("xabcde")) == [(1, 5, 1)]
+
+
+def test_fill_placeholders_split_across_runs_and_tables():
+    doc = Document()
+    p = doc.add_paragraph("Dear ")
+    p.add_run("{{na").bold = True
+    p.add_run("me}}, your order {{order}} {{missing}}.")
+    cell = doc.add_table(rows=1, cols=1).cell(0, 0)
+    cell.text = "Total: {{total}}"
+    cell.add_table(rows=1, cols=1).cell(0, 0).text = "{{name}}"
+
+    result = fill_placeholders(doc, {"name": "Ada", "order": 42, "total": "9 EUR", "unused": "x"})
+    assert result.replaced == 4
+    assert result.unresolved == ["missing"]
+    assert result.unused == ["unused"]
+    assert doc.paragraphs[0].text == "Dear Ada, your order 42 {{missing}}."
+    assert doc.paragraphs[0].runs[1].bold
+    assert docx_tools.extractInnerDocText(doc) == "Total: 9 EUR\n\nAda\n"
+
+
+def test_precompiled_placeholders_and_delimiters():
+    placeholders = PlaceholderSet(["a", "b"], open="<", close=">")
+    for value in ("1", "2"):
+        doc = Document()
+        doc.add_paragraph("<a><b><c>")
+        result = fill_placeholders(doc, {"a": value, "b": "B"}, placeholders=placeholders)
+        assert doc.paragraphs[0].text == value + "B<c>"
+        assert result.unresolved == ["c"]
+
+
+def test_stray_open_delimiter_is_not_part_of_a_name():
+    doc = Document()
+    doc.add_paragraph("{{x {{name}} {{y}} }}")
+    result = fill_placeholders(doc, {"name": "N"})
+    assert doc.paragraphs[0].text == "{{x N {{y}} }}"
+    assert result.unresolved == ["y"]
+
+
+def test_many_keys():
+    mapping = {f"key{i}": f"v{i}" for i in range(3000)}
+    doc = Document()
+    doc.add_paragraph("".join(f"{{{{key{i}}}}}" for i in range(0, 3000, 7)))
+    result = fill_placeholders(doc, mapping)
+    assert result.replaced == len(range(0, 3000, 7))
+    assert doc.paragraphs[0].text == "".join(f"v{i}" for i in range(0, 3000, 7))
+
+
+def letter_template():
+    doc = Document()
+    p = doc.add_paragraph("Dear ")
+    p.add_run("{{na").bold = True
+    p.add_run("me}},")
+    doc.add_paragraph("your order {{order}} ships on {{date}}. {{unknown}}")
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "Total: {{total}}"
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf
+
+
+def test_compiled_template_matches_fill_placeholders():
+    template = letter_template()
+    compiled = compileTemplate(template)
+    assert compiled.keys == ["date", "name", "order", "total", "unknown"]
+
+    mapping = {"name": "Ada & Bob", "order": "<42>", "date": "1.\t2.", "total": " 9 EUR "}
+    rendered = Document(io.BytesIO(compiled.renderBytes(mapping)))
+
+    template.seek(0)
+    expected = Document(template)
+    fill_placeholders(expected, mapping)
+    assert docx_tools.combineDocText(rendered) == docx_tools.combineDocText(expected)
+    assert rendered.paragraphs[1].text == "your order <42> ships on 1.\t2.. {{unknown}}"
+    assert rendered.paragraphs[0].runs[1].bold
+
+
+def test_compiled_template_copies_other_parts_raw():
+    template = letter_template()
+    compiled = compileTemplate(template, level=1)
+    out = io.BytesIO(compiled.renderBytes({"name": "x"}))
+    template.seek(0)
+    before = {e.name: e.data for e in iterRawEntries(template)}
+    after = {e.name: e.data for e in iterRawEntries(out)}
+    assert before.keys() == after.keys()
+    changed = [name for name in before if before[name] != after[name]]
+    assert changed == ["word/document.xml"]
+    out.seek(0)
+    with zipfile.ZipFile(out) as zf:
+        assert zf.testzip() is None
+
+
+def test_render_to_path(tmp_path):
+    compiled = compileTemplate(letter_template())
+    path = tmp_path / "out.docx"
+    compiled.render({"name": "Grace"}, path)
+    assert Document(path).paragraphs[0].text == "Dear Grace,"
+
+
+def test_compiled_values_are_checked_and_line_breaks_mapped():
+    template = letter_template()
+    compiled = compileTemplate(template)
+    with pytest.raises(ValueError):
+        compiled.renderBytes({"name": "a\x0bb"})
+    template.seek(0)
+    expected = Document(template)
+    with pytest.raises(ValueError):
+        fill_placeholders(expected, {"name": "a\x0bb"})
+
+    mapping = {"name": "a\rb\r\nc"}
+    rendered = Document(io.BytesIO(compiled.renderBytes(mapping)))
+    template.seek(0)
+    expected = Document(template)
+    fill_placeholders(expected, mapping)
+    assert rendered.paragraphs[0].text == expected.paragraphs[0].text == "Dear a\nb\n\nc,"
@@ -0,0 +1,90 @@
+import io
+import json
+import os
+import socket
+import threading
+
+from docx import Document
+
+import docx_tools
+from docx_worker import TemplateCache, Worker, WorkerServer
+
+
+def save(path, *texts):
+    doc = Document()
+    for text in texts:
+        doc.add_paragraph(text)
+    doc.save(path)
+    return str(path)
+
+
+def serve(worker, *jobs):
+    out = io.StringIO()
+    worker.serveLines([json.dumps(job) + "\n" for job in jobs] + ["not json\n"], out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def paragraphs(path):
+    return [p.text for p in Document(path).paragraphs]
+
+
+def test_jobs_edit_a_cached_document_without_changing_it(tmp_path):
+    src = save(tmp_path / "a.docx", "Hello world", "second", "third")
+    worker = Worker()
+    results = serve(
+        worker,
+        {"id": 1, "op": "extract", "path": src},
+        {"id": 2, "op": "replace", "path": src, "out": str(tmp_path / "r.docx"), "edits": [[0, 0, 0, 4, "Bye"], [0, 2, 6, 1, "-"]]},
+        {"id": 3, "op": "insert", "path": src, "out": str(tmp_path / "i.docx"), "para": 1, "pos": 0, "text": "a "},
+        {"id": 4, "op": "copy", "path": src, "out": str(tmp_path / "c.docx"), "src": 0, "dest": 1, "start": 0, "end": 4},
+        {"id": 5, "op": "extract", "path": src, "start": 6, "end": 11},
+        {"id": 6, "op": "replace", "path": src, "out": str(tmp_path / "x.docx"), "edits": [[0, 5, 0, 0, ""]]},
+        {"id": 7, "op": "insert", "path": src},
+        {"id": 8, "op": "stats"},
+    )
+    assert [r["id"] for r in results] == [1, 2, 3, 4, 5, 6, 7, 8, None]
+    assert results[0]["result"] == "Hello worldsecondthird"
+    assert results[4]["result"] == "world"
+    assert not results[5]["ok"] and "out of bounds" in results[5]["error"]
+    assert results[6]["error"] == "ValueError: insert needs `out`"
+    assert results[7]["result"]["misses"] == 1 and results[7]["result"]["hits"] == 5
+    assert not results[8]["ok"] and results[8]["error"].startswith("invalid JSON")
+
+    assert paragraphs(tmp_path / "r.docx") == ["Bye -", "ird"]
+    assert paragraphs(tmp_path / "i.docx") == ["Hello world", "a second", "third"]
+    assert paragraphs(tmp_path / "c.docx") == ["Hello world", "Hellosecond", "third"]
+    assert worker.run({"op": "extract", "path": src})["result"] == "Hello worldsecondthird"
+
+
+def test_changed_files_are_reloaded_and_old_ones_evicted(tmp_path):
+    a = save(tmp_path / "a.docx", "a")
+    b = save(tmp_path / "b.docx", "b")
+    cache = TemplateCache()
+    first = cache.get(a)
+    cache.maxBytes = first.size
+    assert cache.get(a) is first
+
+    save(a, "changed")
+    os.utime(a, ns=(0, 0))
+    assert docx_tools.combineDocText(cache.get(a).doc) == "changed"
+
+    cache.get(b)
+    assert b in cache and a not in cache
+    assert cache.stats()["evictions"] == 1 and cache.size == cache.get(b).size
+
+
+def test_unix_socket(tmp_path):
+    src = save(tmp_path / "a.docx", "over the socket")
+    path = str(tmp_path / "worker.sock")
+    with WorkerServer(path) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(path)
+            stream = client.makefile("rwb")
+            for i in range(2):
+                stream.write(json.dumps({"id": i, "op": "extract", "path": src}).encode() + b"\n")
+                stream.flush()
+                assert json.loads(stream.readline())["result"] == "over the socket"
+        server.shutdown()
+    assert not os.path.exists(path)
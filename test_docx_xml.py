@@ -0,0 +1,91 @@
+import io
+import zipfile
+
+import pytest
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+import docx_tools
+import docx_xml
+
+
+def saved(doc):
+    buf = io.BytesIO()
+    doc.save(buf)
+    buf.seek(0)
+    return buf
+
+
+def assert_same_text(path_or_buf):
+    if hasattr(path_or_buf, "seek"):
+        path_or_buf.seek(0)
+    doc = Document(path_or_buf)
+    if hasattr(path_or_buf, "seek"):
+        path_or_buf.seek(0)
+    body = docx_xml.loadBody(path_or_buf)
+    assert docx_xml.extractOuterDocText(body) == docx_tools.extractOuterDocText(doc)
+    assert docx_xml.extractInnerDocText(body) == docx_tools.extractInnerDocText(doc)
+    assert docx_xml.combineDocText(body) == docx_tools.combineDocText(doc)
+
+
+def test_nested_tables_fixture():
+    assert_same_text("nested_tables.docx")
+
+
+def test_run_content_and_hyperlinks():
+    doc = Document()
+    p = doc.add_paragraph("plain")
+    run = p.add_run("a\tb\nc")
+    run.add_break()
+    p._p.append(
+        parse_xml(
+            "<w:hyperlink %s><w:r><w:t>link</w:t></w:r></w:hyperlink>" % nsdecls("w")
+        )
+    )
+    p._p.append(
+        parse_xml(
+            '<w:r %s><w:t xml:space="preserve">  x </w:t><w:br w:type="page"/>'
+            "<w:noBreakHyphen/><w:cr/><w:ptab/></w:r>" % nsdecls("w")
+        )
+    )
+    doc.add_paragraph("")
+    assert_same_text(saved(doc))
+
+
+def test_merged_and_nested_cells():
+    doc = Document()
+    table = doc.add_table(rows=3, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"{r}{c}"
+    table.cell(0, 0).merge(table.cell(1, 1))
+    table.cell(2, 1).merge(table.cell(2, 2))
+    nested = table.cell(2, 0).add_table(rows=2, cols=2)
+    nested.cell(0, 0).merge(nested.cell(1, 0))
+    nested.cell(0, 1).text = "inner"
+    assert_same_text(saved(doc))
+
+
+def test_file_object_and_path_sources(tmp_path):
+    doc = Document()
+    doc.add_paragraph("hello")
+    path = tmp_path / "hello.docx"
+    doc.save(path)
+    assert docx_xml.combineDocText(path) == "hello"
+    with open(path, "rb") as fp:
+        assert docx_xml.extractOuterDocText(fp) == "hello"
+
+    # -- docx_tools hands paths and file objects to docx_xml --
+    assert docx_tools.combineDocText(str(path)) == "hello"
+    with open(path, "rb") as fp:
+        assert docx_tools.extractOuterDocText(fp) == "hello"
+    assert docx_tools.extractInnerDocText(path) == ""
+
+
+def test_missing_body():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("word/document.xml", "<w:document %s/>" % nsdecls("w"))
+    with pytest.raises(ValueError):
+        docx_xml.loadBody(buf)
@@ -0,0 +1,89 @@
+import io
+import struct
+import zipfile
+import zlib
+
+from docx import Document
+
+import docx_tools
+from docx_zip import RawEntry, RawZipWriter, fastSave, openDocument, readRawEntries
+
+
+def png(width=64, height=64):
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    raw = b"".join(b"\0" + bytes((x * 7 + y * 3) % 256 for x in range(width * 3)) for y in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+def image_document():
+    doc = Document()
+    doc.add_paragraph("Hello world")
+    doc.add_picture(io.BytesIO(png()))
+    buf = io.BytesIO()
+    doc.save(buf)
+    buf.seek(0)
+    return buf
+
+
+def test_raw_round_trip():
+    src = image_document()
+    entries = readRawEntries(src)
+    out = io.BytesIO()
+    with RawZipWriter(out) as writer:
+        for entry in entries:
+            writer.write(entry)
+        writer.write(RawEntry.fromBytes("extra/ümlaut.txt", b"x" * 1000, level=9))
+    out.seek(0)
+    src.seek(0)
+    with zipfile.ZipFile(out) as copied, zipfile.ZipFile(src) as original:
+        assert copied.testzip() is None
+        for info in original.infolist():
+            assert copied.read(info.filename) == original.read(info.filename)
+        assert copied.read("extra/ümlaut.txt") == b"x" * 1000
+
+
+def test_fast_save_copies_unchanged_parts():
+    src = image_document()
+    doc = openDocument(src)
+    docx_tools.insertStrIntoPara(doc.paragraphs[0], "Oh, ", 0)
+
+    out = io.BytesIO()
+    assert fastSave(doc, out) == ["word/document.xml"]
+
+    before = {e.name: e.data for e in readRawEntries(src)}
+    after = {e.name: e.data for e in readRawEntries(out)}
+    media = [name for name in after if name.startswith("word/media/")]
+    assert media and all(after[name] == before[name] for name in media)
+    out.seek(0)
+    assert Document(out).paragraphs[0].text == "Oh, Hello world"
+
+
+def test_fast_save_without_changes_and_with_levels():
+    doc = openDocument(image_document())
+    assert fastSave(doc, io.BytesIO()) == []
+
+    doc.add_paragraph("more")
+    out = io.BytesIO()
+    assert fastSave(doc, out, levels={"word/*.xml": 0}) == ["word/document.xml"]
+    out.seek(0)
+    with zipfile.ZipFile(out) as zf:
+        assert zf.getinfo("word/document.xml").compress_type == zipfile.ZIP_STORED
+
+
+def test_fast_save_with_source(tmp_path):
+    path = tmp_path / "in.docx"
+    path.write_bytes(image_document().getvalue())
+    doc = Document(path)
+    doc.paragraphs[0].runs[0].text = "Changed"
+    out = tmp_path / "out.docx"
+    changed = fastSave(doc, out, source=path)
+    assert "word/document.xml" in changed
+    assert not any(name.startswith("word/media/") for name in changed)
+    assert Document(out).paragraphs[0].text == "Changed"
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+from docx import Document
+
+import docx_tools
+from docx_tools import EditBatch
+
+
+def make_doc(*texts):
+    doc = Document()
+    for text in texts:
+        doc.add_paragraph(text)
+    return doc
+
+
+def test_batch_matches_sequential_right_to_left_edits():
+    edits = [(0, 0, 0, 1, "X"), (0, 0, 4, 4, "Y"), (1, 3, 2, 0, "Z"), (4, 4, 1, 2, "")]
+    texts = ("abcdef", "ghijkl", "mnop", "qrst", "uvwx")
+
+    expected = make_doc(*texts)
+    for edit in sorted(edits, reverse=True):
+        docx_tools.replaceDocTextSegment(expected, *edit)
+
+    doc = make_doc(*texts)
+    EditBatch(edits).apply(doc)
+    assert [p.text for p in doc.paragraphs] == [p.text for p in expected.paragraphs]
+    assert [p.text for p in doc.paragraphs] == ["XcdYf", "ghZ", "rst", "ux"]
+
+
+def test_edits_are_sorted_before_applying():
+    doc = make_doc("abcdef")
+    batch = EditBatch()
+    batch.replace(0, 0, 0, 0, "1").replace(0, 0, 5, 5, "3").replace(0, 0, 2, 3, "2")
+    assert len(batch) == 3
+    batch.apply(doc)
+    assert doc.paragraphs[0].text == "1b2e3"
+    assert len(batch) == 0
+
+
+def test_overlapping_edits_are_rejected():
+    batch = EditBatch([(0, 0, 0, 2, "a"), (0, 0, 2, 3, "b")])
+    with pytest.raises(ValueError):
+        batch.apply(make_doc("abcdef"))
+
+    batch = EditBatch([(0, 1, 3, 1, "a"), (1, 1, 0, 0, "b")])
+    with pytest.raises(ValueError):
+        batch.apply(make_doc("abcdef", "ghi"))
+
+
+def test_invalid_edits_are_rejected():
+    with pytest.raises(ValueError):
+        EditBatch().replace(1, 0, 0, 0, "")
+    with pytest.raises(ValueError):
+        EditBatch().replace(0, 0, 3, 1, "")
+    with pytest.raises(ValueError):
+        EditBatch([(0, 1, 0, 0, "")]).apply(make_doc("abc"))
+
+
+def test_empty_ranges_insert():
+    doc = make_doc("abc", "def")
+    EditBatch([(0, 0, 0, -1, "<"), (0, 0, 3, 2, ">"), (1, 1, 1, 0, "-")]).apply(doc)
+    assert [p.text for p in doc.paragraphs] == ["<abc>", "d-ef"]
+
+
+def test_reversed_and_out_of_bounds_ranges_are_rejected():
+    p = make_doc("abcdef").paragraphs[0]
+    assert docx_tools.deleteTextRange(p, 8, 5) is None
+    assert docx_tools.deleteTextRange(p, 4, -1) is None
+    assert docx_tools.deleteTextRange(p, 8, 7) is None
+    assert docx_tools.removeTextSegment(p, 0, -1) is p
+    assert docx_tools.removeTextSegment(p, 6, 5) is p
+    assert p.text == "abcdef"
+
+    doc = make_doc("abcdef")
+    with pytest.raises(ValueError):
+        docx_tools.replaceDocTextSegment(doc, 0, 0, 5, 2, "XY")
+    assert doc.paragraphs[0].text == "abcdef"
+
+
+def runs_doc(pieces):
+    doc = Document()
+    p = doc.add_paragraph()
+    for i, piece in enumerate(pieces):
+        p.add_run(piece).bold = i % 2 == 0
+    doc.add_paragraph("tail")
+    return doc
+
+
+def test_edits_of_one_paragraph_share_one_run_index(monkeypatch):
+    rng = random.Random(3)
+    pieces = ["".join(rng.choice("abcdefgh") for _ in range(rng.randrange(1, 5))) for _ in range(40)]
+    length = sum(map(len, pieces))
+    cuts = sorted(rng.sample(range(length + 1), 30))
+    edits = []
+    for lo, hi in zip(cuts[::2], cuts[1::2]):
+        end = lo - 1 if rng.random() < 0.3 else min(hi, length) - 1
+        edits.append((0, 0, lo, end, rng.choice(["", "X", "YZ"])))
+
+    expected = runs_doc(pieces)
+    for edit in sorted(edits, reverse=True):
+        docx_tools.replaceDocTextSegment(expected, *edit)
+
+    builds = []
+    init = docx_tools.RunIndex.__init__
+
+    def countingInit(self, p):
+        builds.append(p)
+        init(self, p)
+
+    monkeypatch.setattr(docx_tools.RunIndex, "__init__", countingInit)
+    doc = runs_doc(pieces)
+    EditBatch(edits).apply(doc)
+    assert len(builds) == 1
+    assert [r.text for r in doc.paragraphs[0].runs] == [r.text for r in expected.paragraphs[0].runs]
@@ -0,0 +1,41 @@
+import io
+
+from docx import Document
+from docx_tools import combineDocText, iter_doc_text, iter_table_texts, write_doc_text
+
+
+def make_doc():
+    doc = Document()
+    doc.add_paragraph("Paragraph 1")
+    doc.add_paragraph("Paragraph 2")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Cell 1"
+    table.cell(0, 1).text = "Cell 2"
+    nested = table.cell(0, 1).add_table(rows=1, cols=1)
+    nested.cell(0, 0).text = "Nested"
+    return doc
+
+
+def test_iter_doc_text_is_lazy():
+    chunks = iter_doc_text(make_doc())
+    assert next(chunks) == "Paragraph 1"
+
+
+def test_join_equals_combineDocText():
+    doc = make_doc()
+    assert "".join(iter_doc_text(doc)) == combineDocText(doc)
+    assert combineDocText(doc) == "Paragraph 1Paragraph 2Cell 1\nCell 2\n\nNested\n"
+
+
+def test_cell_hook():
+    doc = make_doc()
+    text = "".join(iter_table_texts(doc, lambda cell: cell.text.upper()))
+    assert text == "CELL 1\nCELL 2\n\nNESTED\n"
+
+
+def test_write_doc_text():
+    doc = make_doc()
+    fp = io.StringIO()
+    written = write_doc_text(doc, fp)
+    assert fp.getvalue() == combineDocText(doc)
+    assert written == len(fp.getvalue())
@@ -0,0 +1,58 @@
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+import docx_tools
+from docx_tools import DocumentView
+
+
+def word_paragraph(doc):
+    p = parse_xml(
+        "<w:p %s w:rsidR='00A1' w:rsidRDefault='00A1'>"
+        "<w:r w:rsidR='00A1'><w:rPr><w:b/></w:rPr><w:t>Ver</w:t></w:r>"
+        "<w:proofErr w:type='spellStart'/>"
+        "<w:r w:rsidR='00B2'><w:rPr><w:b/></w:rPr><w:t xml:space='preserve'>trag </w:t></w:r>"
+        "<w:r w:rsidR='00B2'><w:rPr><w:b/></w:rPr><w:t>über</w:t><w:tab/></w:r>"
+        "<w:proofErr w:type='spellEnd'/>"
+        "<w:r><w:rPr><w:b/></w:rPr><w:t>x</w:t></w:r>"
+        "<w:r><w:rPr><w:i/></w:rPr><w:t>kursiv</w:t></w:r>"
+        "<w:r><w:rPr><w:i/></w:rPr><w:fldChar w:fldCharType='begin'/></w:r>"
+        "<w:r><w:rPr><w:i/></w:rPr><w:t>!</w:t></w:r>"
+        "</w:p>" % nsdecls("w")
+    )
+    doc.element.body.insert(0, p)
+    return doc.paragraphs[0]
+
+
+def test_merges_adjacent_runs_with_equal_formatting():
+    doc = Document()
+    para = word_paragraph(doc)
+    text = para.text
+    assert docx_tools.normalize_runs(para) == 1
+    assert [r.text for r in para.runs] == ["Ver", "trag über\t", "x", "kursiv", "", "!"]
+    assert para.text == text
+
+
+def test_stripping_noise_merges_across_markup():
+    doc = Document()
+    para = word_paragraph(doc)
+    text = para.text
+    view = DocumentView(doc)
+    assert view.text(0) == text
+    assert docx_tools.normalize_runs(view, strip_rsid=True, strip_proof_errors=True) == 3
+    assert [r.text for r in para.runs] == ["Vertrag über\tx", "kursiv", "", "!"]
+    assert para.text == text
+    assert docx_tools.extractOuterDocText(view) == text
+    assert "rsid" not in para._p.xml and "proofErr" not in para._p.xml
+    assert docx_tools.findRunIndex(13, para) == 0
+
+
+def test_cells_and_nothing_to_do():
+    doc = Document()
+    cell = doc.add_table(rows=1, cols=1).cell(0, 0)
+    cell.paragraphs[0].add_run("a")
+    cell.paragraphs[0].add_run("b")
+    doc.add_paragraph("plain")
+    assert docx_tools.normalize_runs(cell) == 1
+    assert cell.text == "ab"
+    assert docx_tools.normalize_runs(doc) == 0
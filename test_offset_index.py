@@ -0,0 +1,57 @@
+import pytest
+from docx import Document
+
+import docx_tools
+from docx_tools import DocumentView
+
+
+def make_view(*texts):
+    doc = Document()
+    for text in texts:
+        doc.add_paragraph(text)
+    return DocumentView(doc)
+
+
+def test_mapping_in_both_directions():
+    view = make_view("abc", "", "de", "fghi")
+    assert view.ends == [3, 3, 5, 9]
+    assert view.locate(0) == (0, 0)
+    assert view.locate(3) == (2, 0)
+    assert view.locate(8) == (3, 3)
+    assert view.locate(9) is None
+    assert view.locateInsert(3) == (0, 3)
+    assert view.locateInsert(9) == (3, 4)
+    for offset in range(9):
+        paraIdx, pos = view.locate(offset)
+        assert view.offset(paraIdx, pos) == offset
+        assert view.text(paraIdx)[pos] == view.outerText()[offset]
+
+
+def test_extract_by_offsets_matches_extract_between():
+    view = make_view("FOO", "BAR", "BAZ")
+    assert docx_tools.extractTextByOffsets(view, 1, 8) == docx_tools.extractTextBetween(view, 0, 2, 1, 2)
+    assert docx_tools.extractTextByOffsets(view.doc, 4, 5) == "A"
+
+
+def test_replace_by_offsets_updates_the_index():
+    view = make_view("FOO", "BAR", "BAZ")
+    docx_tools.replaceDocTextByOffsets(view, 1, 8, "-")
+    assert [p.text for p in view.doc.paragraphs] == ["F-", "Z"]
+    assert view.ends == [2, 3]
+
+    docx_tools.replaceDocTextByOffsets(view, 2, 2, "!")
+    assert docx_tools.extractOuterDocText(view) == "F-!Z"
+    assert view.locate(3) == (1, 0)
+
+    docx_tools.replaceDocTextByOffsets(view, 0, 1, "ff")
+    assert docx_tools.extractTextByOffsets(view, 0, 5) == "ff-!Z"
+
+
+def test_replace_by_offsets_bounds():
+    view = make_view("abc")
+    with pytest.raises(ValueError):
+        docx_tools.replaceDocTextByOffsets(view, 2, 4, "x")
+    with pytest.raises(ValueError):
+        docx_tools.replaceDocTextByOffsets(view, 2, 1, "x")
+    docx_tools.replaceDocTextByOffsets(view, 3, 3, "d")
+    assert view.text(0) == "abcd"
@@ -0,0 +1,74 @@
+from docx_tools import (
+    getRunIndex, invalidateRunIndex, runIndexCache, findRunIndex, findPosInRun, insertStrIntoPara, removeTextSegment,
+)
+from docx import Document
+
+
+def make_para():
+    document = Document()
+    p = document.add_paragraph("")
+    p.add_run("abc").bold = True
+    p.add_run("defg").underline = True
+    p.add_run("hijkl").italic = True
+    return p
+
+
+def test_index_offsets():
+    p = make_para()
+    index = getRunIndex(p)
+    assert index.ends == [3, 7, 12]
+    assert index.locate(0) == (0, 0)
+    assert index.locate(7) == (2, 0)
+    assert index.locate(12) is None
+    assert index.locateInsert(7) == (1, 4)
+
+
+def test_index_is_reused_inside_a_cache_block():
+    p = make_para()
+    assert getRunIndex(p) is not getRunIndex(p)
+    with runIndexCache():
+        assert getRunIndex(p) is getRunIndex(p)
+        assert findRunIndex(5, p) == 1
+        with runIndexCache():
+            assert getRunIndex(p) is getRunIndex(p)
+    assert getRunIndex(p) is not getRunIndex(p)
+
+
+def test_index_is_invalidated_by_mutators():
+    p = make_para()
+    with runIndexCache():
+        index = getRunIndex(p)
+        insertStrIntoPara(p, "XY", 1)
+        assert getRunIndex(p) is not index
+        assert findPosInRun(6, p) == 1
+        assert findRunIndex(5, p) == 1
+
+        removeTextSegment(p, 0, 4)
+        assert p.text == "defghijkl"
+        assert findRunIndex(0, p) == 1
+
+
+def test_index_detects_added_runs():
+    p = make_para()
+    getRunIndex(p)
+    p.add_run("mn")
+    assert findRunIndex(12, p) == 3
+
+
+def test_edits_through_python_docx_are_seen():
+    document = Document()
+    p = document.add_paragraph("ab")
+    p.add_run("cd")
+    assert findRunIndex(0, p) == 0
+    p.runs[0].text = "abXYZ"
+    removeTextSegment(p, 2, 3)
+    assert p.text == "abZcd"
+
+
+def test_explicit_invalidation():
+    p = make_para()
+    with runIndexCache():
+        getRunIndex(p)
+        p.runs[0].text = "abcabc"
+        invalidateRunIndex(p)
+        assert findRunIndex(5, p) == 0
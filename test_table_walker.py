@@ -0,0 +1,60 @@
+import sys
+
+from docx import Document
+
+import docx_tools
+import docx_xml
+from docx_xml import CellPath
+
+
+def merged_document():
+    doc = Document()
+    table = doc.add_table(rows=3, cols=3)
+    for r, row in enumerate(table.rows):
+        for c, cell in enumerate(row.cells):
+            cell.text = f"{r}{c}"
+    table.cell(0, 0).merge(table.cell(0, 2))
+    table.cell(1, 0).merge(table.cell(2, 0))
+    table.cell(1, 1).add_table(rows=1, cols=2).cell(0, 1).text = "inner"
+    return doc
+
+
+def test_merged_cells_are_visited_once():
+    doc = merged_document()
+    cells = list(docx_tools.iter_table_cells(doc, paths=True))
+    assert [(cell.text, path) for cell, path in cells] == [
+        ("00\n01\n02", CellPath(0, 0, 0, 0)),
+        ("10\n20", CellPath(0, 1, 0, 0)),
+        ("11\n", CellPath(0, 1, 1, 0)),
+        ("", CellPath(1, 0, 0, 1)),
+        ("inner", CellPath(1, 0, 1, 1)),
+        ("12", CellPath(0, 1, 2, 0)),
+        ("21", CellPath(0, 2, 1, 0)),
+        ("22", CellPath(0, 2, 2, 0)),
+    ]
+    assert docx_tools.concatTableTexts(doc) == "00\n01\n02\n10\n20\n11\n\n\ninner\n12\n21\n22\n"
+
+    body = doc.element.body
+    assert [path for _, path in docx_xml.iter_table_cells(body, paths=True)] == [path for _, path in cells]
+    assert docx_xml.extractInnerDocText(body) == docx_tools.extractInnerDocText(doc)
+
+
+def test_row_functions_skip_merged_duplicates():
+    doc = merged_document()
+    table = doc.tables[0]
+    assert docx_tools.concatCellTexts(table.rows[0]) == "00\n01\n02\n"
+    assert docx_tools.concatCellTexts(table.rows[2]) == "21\n22\n"
+
+
+def test_deep_nesting_does_not_recurse():
+    doc = Document()
+    cell = doc.add_table(rows=1, cols=1).cell(0, 0)
+    depth = sys.getrecursionlimit() + 100
+    for level in range(depth):
+        cell.text = str(level)
+        cell = cell.add_table(rows=1, cols=1).cell(0, 0)
+
+    paths = [path for _, path in docx_tools.iter_table_cells(doc, paths=True)]
+    assert len(paths) == depth + 1
+    assert paths[-1] == CellPath(depth, 0, 0, depth)
+    assert sum(1 for _ in docx_xml.iter_table_cells(doc.element.body)) == depth + 1